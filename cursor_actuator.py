@@ -0,0 +1,197 @@
+"""
+Cursor Actuator Module
+Moves the cursor at a fixed rate, independent of the camera frame rate.
+
+The vision loop only produces a new cursor target per camera frame (30 Hz
+on most webcams), so moving the cursor there makes it step visibly on a
+faster monitor. CursorActuator runs its own thread at e.g. 120 or 240 Hz:
+each tick it places the cursor between the last two smoothed targets, or a
+little beyond the newest one along their velocity, and issues the move
+itself. Targets are placed on their capture timeline, so uneven arrival
+times from the render thread do not make the cursor speed jitter.
+
+Extrapolation is capped (max_extrapolation) so the cursor settles when
+targets stop; hold() stops all moves until the next target, e.g. while no
+cursor gesture is active.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class CursorActuator:
+    """
+    A fixed-rate thread that interpolates cursor targets and issues the moves.
+    """
+
+    def __init__(self, move_function, rate_hz=120, interpolation_delay=0.0,
+                 max_extrapolation=0.05, max_sample_gap=0.25, min_step=0.5):
+        """
+        Initialize the CursorActuator.
+
+        Args:
+            move_function (function): Called as move_function(x, y) to move the cursor
+                (e.g. a coalescing submit to the output queue).
+            rate_hz (float): Number of cursor updates per second.
+            interpolation_delay (float): Seconds the cursor trails the newest target.
+                0 extrapolates from the newest target for the lowest latency; about
+                one frame interval only interpolates, at the cost of that much lag.
+            max_extrapolation (float): Maximum seconds to extrapolate past the newest target.
+            max_sample_gap (float): Targets further apart than this (seconds) are not
+                interpolated between; the cursor jumps to the newest one.
+            min_step (float): Smallest change in pixels worth issuing a move for.
+        """
+        self.move_function = move_function
+        self.rate_hz = rate_hz
+        self.interpolation_delay = interpolation_delay
+        self.max_extrapolation = max_extrapolation
+        self.max_sample_gap = max_sample_gap
+        self.min_step = min_step
+
+        self.samples = deque(maxlen=2)  # (capture time, x, y)
+        self.clock_offset = 0.0         # Arrival time - capture time of the newest target
+        self.last_position = None       # Last position issued
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+        # Statistics
+        self.updates = 0
+        self.ticks = 0
+        self.moves = 0
+        self.extrapolated_moves = 0
+        self.late_ticks = 0
+        self.start_time = None
+
+    def start(self):
+        """
+        Start the actuator thread.
+        """
+        self.running = True
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, name="cursor-actuator", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=1):
+        """
+        Stop the actuator thread.
+
+        Args:
+            timeout (float): Maximum time to wait for the thread.
+        """
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+
+    def update(self, x, y, timestamp=None):
+        """
+        Set a new smoothed cursor target (called once per vision frame).
+
+        Args:
+            x (float): Target x in screen pixels.
+            y (float): Target y in screen pixels.
+            timestamp (float): Capture time of the frame the target comes from;
+                defaults to now.
+        """
+        now = time.perf_counter()
+        if timestamp is None:
+            timestamp = now
+        with self.lock:
+            if self.samples and timestamp <= self.samples[-1][0]:
+                # Same or older frame (e.g. a repeated timestamp): replace the newest target
+                self.samples.pop()
+            self.samples.append((timestamp, float(x), float(y)))
+            self.clock_offset = now - timestamp
+            self.updates += 1
+
+    def hold(self):
+        """
+        Stop moving the cursor until the next target arrives.
+        """
+        with self.lock:
+            self.samples.clear()
+            self.last_position = None
+
+    def _position(self, now):
+        """
+        Get the cursor position for a moment in time.
+
+        Returns:
+            tuple: (x, y, extrapolated) or None if there is no target.
+        """
+        with self.lock:
+            if not self.samples:
+                return None
+            t1, x1, y1 = self.samples[-1]
+            if len(self.samples) < 2:
+                return x1, y1, False
+            t0, x0, y0 = self.samples[0]
+            capture_time = now - self.clock_offset - self.interpolation_delay
+
+        interval = t1 - t0
+        if interval <= 0 or interval > self.max_sample_gap:
+            return x1, y1, False
+
+        if capture_time <= t1:
+            # Between the two targets
+            alpha = max(0.0, (capture_time - t0) / interval)
+            return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha, False
+
+        # Past the newest target: continue along its velocity for a short while
+        ahead = min(capture_time - t1, self.max_extrapolation) / interval
+        return x1 + (x1 - x0) * ahead, y1 + (y1 - y0) * ahead, True
+
+    def _run(self):
+        """
+        Actuator loop: one cursor update per tick at rate_hz.
+        """
+        period = 1.0 / self.rate_hz
+        next_tick = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                now = time.perf_counter()
+            next_tick += period
+            if now - next_tick > period:
+                # Fell more than a tick behind: skip the missed ticks instead of bursting
+                self.late_ticks += 1
+                next_tick = now + period
+            self.ticks += 1
+
+            position = self._position(now)
+            if position is None:
+                continue
+            x, y, extrapolated = position
+            last = self.last_position
+            if last is not None and abs(x - last[0]) < self.min_step and abs(y - last[1]) < self.min_step:
+                continue
+
+            self.last_position = (x, y)
+            self.moves += 1
+            if extrapolated:
+                self.extrapolated_moves += 1
+            try:
+                self.move_function(x, y)
+            except Exception as e:
+                print(f"⚠ Cursor move failed: {e}")
+
+    def get_stats(self):
+        """
+        Get actuator statistics.
+
+        Returns:
+            dict: Target updates, ticks, moves issued (and how many were extrapolated),
+                late ticks and the achieved tick rate.
+        """
+        elapsed = time.perf_counter() - self.start_time if self.start_time is not None else 0.0
+        return {
+            'rate_hz': self.rate_hz,
+            'updates': self.updates,
+            'ticks': self.ticks,
+            'moves': self.moves,
+            'extrapolated_moves': self.extrapolated_moves,
+            'late_ticks': self.late_ticks,
+            'achieved_hz': self.ticks / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,154 @@
+"""
+Cursor Predictor Module
+Latency compensation: moves the cursor target ahead of the hand by the
+measured pipeline latency.
+
+By the time a cursor target reaches the mouse, the finger has moved on for
+the capture interval plus inference and queueing time. LatencyCompensator
+measures that latency at runtime (now minus the frame's capture time,
+averaged) and extrapolates the smoothed target along its velocity by the
+same amount.
+
+Prediction is damped by speed: the lead fades in with speed (so a resting
+hand's jitter is not amplified) and follows a slowing hand immediately,
+using the smaller of the filtered and the latest speed, so the cursor
+does not overshoot when the hand stops. The lead is also capped in pixels.
+"""
+
+import numpy as np
+
+
+class LatencyCompensator:
+    """
+    Extrapolates cursor targets forward by the measured pipeline latency.
+    """
+
+    def __init__(self, full_speed=250.0, max_lead=150.0, velocity_smoothing=0.5,
+                 latency_smoothing=0.1, max_latency=0.2, max_gap=0.25):
+        """
+        Initialize the LatencyCompensator.
+
+        Args:
+            full_speed (float): Speed in pixels/second at which the lead reaches half
+                of the latency; slower movement is predicted less.
+            max_lead (float): Largest distance in pixels the target is moved ahead.
+            velocity_smoothing (float): Weight of the new velocity measurement (0-1).
+            latency_smoothing (float): Weight of each new latency measurement (0-1).
+            max_latency (float): Latency measurements are clamped to this (seconds).
+            max_gap (float): Targets further apart than this (seconds) restart the
+                velocity estimate.
+        """
+        self.full_speed = full_speed
+        self.max_lead = max_lead
+        self.velocity_smoothing = velocity_smoothing
+        self.latency_smoothing = latency_smoothing
+        self.max_latency = max_latency
+        self.max_gap = max_gap
+
+        self.latency = None     # Averaged pipeline latency in seconds
+        self.position = None    # Last target, (..., 2)
+        self.velocity = None    # Filtered velocity, (..., 2) pixels/second
+        self.last_time = None
+
+        # Statistics
+        self.samples = 0
+        self.total_lead = 0.0
+        self.max_lead_seen = 0.0
+
+    def reset(self):
+        """
+        Forget the motion estimate (the latency estimate is kept).
+        """
+        self.position = None
+        self.last_time = None
+
+    def measure_latency(self, capture_time, now):
+        """
+        Add a latency measurement for a frame.
+
+        Args:
+            capture_time (float): Capture time of the frame.
+            now (float): Current time on the same clock.
+        """
+        latency = min(max(0.0, now - capture_time), self.max_latency)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.latency_smoothing * (latency - self.latency)
+
+    def predict(self, x, y, timestamp):
+        """
+        Move one target ahead by the current latency.
+
+        Args:
+            x (float): Smoothed target x.
+            y (float): Smoothed target y.
+            timestamp (float): Capture time of the frame the target comes from.
+
+        Returns:
+            tuple: Predicted (x, y).
+        """
+        predicted = self.predict_points(np.array((x, y), dtype=np.float64), timestamp)
+        return float(predicted[0]), float(predicted[1])
+
+    def predict_points(self, points, timestamp, latency=None):
+        """
+        Move a batch of targets taken at the same time ahead by the latency.
+
+        Args:
+            points (numpy.ndarray): (..., 2) smoothed targets.
+            timestamp (float): Capture time of the targets.
+            latency (float): Lead time in seconds; defaults to the measured latency.
+
+        Returns:
+            numpy.ndarray: (..., 2) predicted targets.
+        """
+        target = np.asarray(points, dtype=np.float64)
+        if latency is None:
+            latency = self.latency or 0.0
+
+        if (self.position is None or self.position.shape != target.shape or
+                timestamp - self.last_time > self.max_gap):
+            self.position = target.copy()
+            self.velocity = np.zeros_like(target)
+            self.last_time = timestamp
+            return target.copy()
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            return target.copy()
+
+        measured = (target - self.position) / dt
+        self.velocity += self.velocity_smoothing * (measured - self.velocity)
+        self.position = target.copy()
+        self.last_time = timestamp
+
+        # Damping: no lead at rest, full lead when fast, and never more than the
+        # latest speed supports (a stopping hand stops the prediction at once)
+        filtered_speed = np.hypot(self.velocity[..., 0], self.velocity[..., 1])
+        measured_speed = np.hypot(measured[..., 0], measured[..., 1])
+        speed = np.minimum(filtered_speed, measured_speed)
+        gain = speed ** 2 / (speed ** 2 + self.full_speed ** 2)
+
+        lead = self.velocity * (latency * gain / np.maximum(filtered_speed, 1e-9) * speed)[..., None]
+        length = np.hypot(lead[..., 0], lead[..., 1])
+        lead *= (np.minimum(length, self.max_lead) / np.maximum(length, 1e-9))[..., None]
+
+        length = np.minimum(length, self.max_lead)
+        self.samples += 1
+        self.total_lead += float(np.mean(length))
+        self.max_lead_seen = max(self.max_lead_seen, float(np.max(length)))
+        return target + lead
+
+    def get_stats(self):
+        """
+        Get prediction statistics.
+
+        Returns:
+            dict: Measured latency and the average and largest lead in pixels.
+        """
+        return {
+            'latency_ms': (self.latency or 0.0) * 1000.0,
+            'avg_lead_px': self.total_lead / self.samples if self.samples else 0.0,
+            'max_lead_px': self.max_lead_seen,
+        }
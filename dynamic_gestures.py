@@ -0,0 +1,313 @@
+"""
+Dynamic Gestures Module
+Recognizes movements over time (swipes, circles, flicks) and maps them to
+keyboard shortcuts.
+
+The static gestures only look at one frame. DynamicGestureRecognizer keeps
+the recent landmarks of a hand in a fixed-size ring buffer and turns them
+into a motion feature per frame: the velocity of the palm centre in hand
+sizes per second, which does not depend on where the hand is, how far it
+is from the camera or the frame rate. Its length is squashed into 0-1 at
+reference_speed, so a gesture matches whether it is made at a moderate or
+a fast pace.
+
+Templates are matched with streaming subsequence DTW (SPRING, Sakurai et al.
+2007): every template keeps one column of accumulated costs that is updated
+once per frame, so a match can start at any frame without storing or
+re-scanning the history. All templates are updated together as one padded
+array. A template's budget is a fraction of what it costs against a resting
+hand, so holding still never matches. Partial alignments whose cost already
+exceeds the budget are abandoned (costs only grow along a path) and the
+update stops at the furthest alignment still alive, so a resting or idly
+moving hand only updates the first few template frames.
+
+The built-in templates are synthesized swipes, circles and flicks at
+nominal_fps; add_template() takes recorded feature sequences as well.
+"""
+
+import numpy as np
+
+
+# Palm centre: wrist and the finger base joints; hand size: wrist to middle finger base
+PALM_LANDMARKS = [0, 5, 9, 13, 17]
+WRIST = 0
+MIDDLE_MCP = 9
+
+# Recognized gesture -> keys pressed together (pyautogui key names)
+DYNAMIC_ACTIONS = {
+    'swipe_left': ('alt', 'left'),          # Back
+    'swipe_right': ('alt', 'right'),        # Forward
+    'circle_cw': ('alt', 'tab'),            # Switch to the previous app
+    'circle_ccw': ('alt', 'shift', 'tab'),  # Switch back
+    'flick_up': ('pageup',),
+    'flick_down': ('pagedown',),
+}
+
+
+def _bell(frames):
+    """
+    Smooth 0 -> 1 -> 0 speed profile over a movement.
+    """
+    return np.sin(np.linspace(0.0, np.pi, frames)) ** 2
+
+
+def default_templates(nominal_fps=30.0):
+    """
+    Synthesize the built-in gesture templates.
+
+    Args:
+        nominal_fps (float): Frame rate the templates are sampled at.
+
+    Returns:
+        dict: Gesture name -> (frames, 2) feature sequence (x right, y down).
+    """
+    scale = 30.0 / nominal_fps
+    templates = {}
+
+    # Swipes: a sideways movement over about 0.4s
+    frames = max(4, int(round(12 / scale)))
+    profile = _bell(frames) ** 0.5
+    templates['swipe_left'] = np.stack([-profile, np.zeros(frames)], axis=1)
+    templates['swipe_right'] = np.stack([profile, np.zeros(frames)], axis=1)
+
+    # Flicks: a short vertical jerk
+    frames = max(3, int(round(6 / scale)))
+    profile = _bell(frames) ** 0.5
+    templates['flick_up'] = np.stack([np.zeros(frames), -profile], axis=1)
+    templates['flick_down'] = np.stack([np.zeros(frames), profile], axis=1)
+
+    # Circles: one turn in about 0.8s at constant speed (y points down, so an
+    # increasing angle turns clockwise on screen)
+    frames = max(8, int(round(24 / scale)))
+    angle = np.linspace(0.0, 2.0 * np.pi, frames)
+    speed = 0.9
+    templates['circle_cw'] = speed * np.stack([-np.sin(angle), np.cos(angle)], axis=1)
+    templates['circle_ccw'] = speed * np.stack([-np.sin(angle), -np.cos(angle)], axis=1)
+    return templates
+
+
+class DynamicGestureRecognizer:
+    """
+    Streaming DTW recognizer for movement gestures of one hand.
+    """
+
+    def __init__(self, templates=None, threshold=0.4, reference_speed=4.0, history_size=64,
+                 cooldown=0.6, max_gap=0.25, nominal_fps=30.0, rest_level=0.2):
+        """
+        Initialize the DynamicGestureRecognizer.
+
+        Args:
+            templates (dict): Gesture name -> (frames, 2) feature sequence; the
+                built-in swipes, circles and flicks if None.
+            threshold (float): Largest match cost relative to the template's cost
+                against a resting hand (0-1).
+            reference_speed (float): Palm speed in hand sizes per second that maps to
+                a feature length of 1.
+            history_size (int): Frames kept in the landmark ring buffer.
+            cooldown (float): Seconds after a match during which nothing is recognized.
+            max_gap (float): A pause between frames longer than this (seconds)
+                restarts the matching.
+            nominal_fps (float): Frame rate of the templates; matches must take at
+                least half of a template's nominal duration.
+            rest_level (float): Feature length below which the hand counts as resting;
+                after a match nothing is recognized until the hand rests.
+        """
+        self.threshold = threshold
+        self.reference_speed = reference_speed
+        self.cooldown = cooldown
+        self.max_gap = max_gap
+        self.nominal_fps = nominal_fps
+        self.rest_level = rest_level
+
+        # Ring buffer of recent landmarks and their capture times
+        self.history = np.zeros((history_size, 21, 2), dtype=np.float32)
+        self.times = np.zeros(history_size, dtype=np.float64)
+        self.index = -1
+        self.count = 0
+
+        self.names = []
+        self.templates = np.zeros((0, 0, 2))
+        self.lengths = np.zeros(0, dtype=np.int64)
+        for name, features in (templates if templates is not None else default_templates(nominal_fps)).items():
+            self.add_template(name, features)
+
+        self.last_match_time = -np.inf
+
+        # Statistics
+        self.frames = 0
+        self.cells = 0
+        self.matches = 0
+
+    def add_template(self, name, features):
+        """
+        Add a gesture template.
+
+        Args:
+            name (str): Gesture name (see DYNAMIC_ACTIONS for the mapped ones).
+            features (numpy.ndarray): (frames, 2) feature sequence, e.g. from features().
+        """
+        features = np.asarray(features, dtype=np.float64)
+        width = max(self.templates.shape[1], len(features))
+        templates = np.full((len(self.names) + 1, width, 2), np.inf)
+        templates[:-1, :self.templates.shape[1]] = self.templates
+        templates[-1, :len(features)] = features
+
+        self.names.append(name)
+        self.templates = templates
+        self.lengths = np.append(self.lengths, len(features))
+        # A match may cost at most threshold times the cost of standing still,
+        # so a resting hand never matches however long it rests
+        energy = np.array([np.linalg.norm(self.templates[k, :length], axis=-1).sum()
+                           for k, length in enumerate(self.lengths)])
+        self.budget = self.threshold * energy
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the landmark history and all partial matches.
+        """
+        self.count = 0
+        # Costs of the partial alignments (column 0 is the free start) and their start times
+        self.costs = np.full((len(self.names), self.templates.shape[1] + 1), np.inf)
+        self.costs[:, 0] = 0.0
+        self.starts = np.zeros_like(self.costs)
+        self.reach = 0
+        self.armed = True
+
+    def push(self, landmarks, timestamp):
+        """
+        Add a frame of landmarks to the ring buffer.
+
+        Args:
+            landmarks (numpy.ndarray): (21, 2) pixel landmarks (or (21, 3) with id first).
+            timestamp (float): Capture time of the frame.
+        """
+        self.index = (self.index + 1) % len(self.history)
+        self.history[self.index] = np.asarray(landmarks)[:, -2:]
+        self.times[self.index] = timestamp
+        self.count = min(self.count + 1, len(self.history))
+
+    def recent(self, frames):
+        """
+        Get the newest landmarks in chronological order.
+
+        Args:
+            frames (int): Number of frames (at most the number stored).
+
+        Returns:
+            tuple: ((frames, 21, 2) landmarks, (frames,) capture times).
+        """
+        frames = min(frames, self.count)
+        order = (self.index - np.arange(frames)[::-1]) % len(self.history)
+        return self.history[order], self.times[order]
+
+    def features(self, landmarks, timestamps):
+        """
+        Motion features of a landmark sequence.
+
+        Args:
+            landmarks (numpy.ndarray): (T, 21, 2) pixel landmarks.
+            timestamps (numpy.ndarray): (T,) capture times.
+
+        Returns:
+            numpy.ndarray: (T - 1, 2) palm velocity, its length squashed into 0-1.
+        """
+        centre = landmarks[:, PALM_LANDMARKS].mean(axis=1)
+        size = np.linalg.norm(landmarks[:, MIDDLE_MCP] - landmarks[:, WRIST], axis=-1)
+        dt = np.maximum(np.diff(timestamps), 1e-3)
+        velocity = np.diff(centre, axis=0) / (dt * np.maximum(size[1:], 1.0) * self.reference_speed)[:, None]
+        speed = np.linalg.norm(velocity, axis=-1, keepdims=True)
+        return velocity * (np.tanh(speed) / np.maximum(speed, 1e-9))
+
+    def update(self, landmarks, timestamp):
+        """
+        Add a frame and advance the matching.
+
+        Args:
+            landmarks (numpy.ndarray): (21, 2) pixel landmarks of the hand.
+            timestamp (float): Capture time of the frame.
+
+        Returns:
+            str: Name of the gesture completed on this frame, or None.
+        """
+        if self.count and timestamp - self.times[self.index] > self.max_gap:
+            self.reset()
+        self.push(landmarks, timestamp)
+        self.frames += 1
+        if self.count < 3:
+            return None
+
+        # Velocity over the last two frame intervals (less landmark noise)
+        recent, times = self.recent(3)
+        feature = self.features(recent[[0, 2]], times[[0, 2]])[0]
+        # After a match the hand has to come to rest before the next gesture,
+        # so the return movement of a swipe is not read as the opposite swipe
+        if not self.armed:
+            self.armed = np.linalg.norm(feature) < self.rest_level
+            return None
+        self._advance(feature, timestamp)
+
+        if timestamp - self.last_match_time < self.cooldown:
+            return None
+        final = self.costs[np.arange(len(self.names)), self.lengths]
+        durations = timestamp - self.starts[np.arange(len(self.names)), self.lengths]
+        matched = (final <= self.budget) & (durations >= 0.5 * self.lengths / self.nominal_fps)
+        if not matched.any():
+            return None
+
+        best = np.flatnonzero(matched)[np.argmin((final / self.lengths)[matched])]
+        self.last_match_time = timestamp
+        self.matches += 1
+        # Start over so the same movement is not matched twice
+        self.costs[:, 1:] = np.inf
+        self.reach = 0
+        self.armed = False
+        return self.names[best]
+
+    def _advance(self, feature, timestamp):
+        """
+        One SPRING step for all templates.
+        """
+        distance = np.linalg.norm(self.templates - feature, axis=-1)  # (K, width), inf on padding
+        previous, previous_starts = self.costs, self.starts
+        costs = np.full_like(previous, np.inf)
+        starts = np.zeros_like(previous)
+        costs[:, 0] = 0.0
+        starts[:, 0] = timestamp
+
+        # Cells further than one past the old reach only become reachable through
+        # cells of this frame, so stop at the first position nothing reaches
+        reach = 0
+        for position in range(1, self.templates.shape[1] + 1):
+            if position > self.reach + 1 and not np.isfinite(costs[:, position - 1]).any():
+                break
+            # Best predecessor: same frame one template step back, previous frame
+            # same step, or previous frame one step back (ties keep the later start)
+            left, up, diagonal = costs[:, position - 1], previous[:, position], previous[:, position - 1]
+            best = np.minimum(np.minimum(left, up), diagonal)
+            starts[:, position] = np.where(best == left, starts[:, position - 1],
+                                           np.where(best == up, previous_starts[:, position],
+                                                    previous_starts[:, position - 1]))
+            cost = distance[:, position - 1] + best
+            # Early abandoning: a path over budget can only get more expensive
+            alive = cost <= self.budget
+            costs[:, position] = np.where(alive, cost, np.inf)
+            if alive.any():
+                reach = position
+            self.cells += len(self.names)
+
+        self.costs, self.starts, self.reach = costs, starts, reach
+
+    def get_stats(self):
+        """
+        Get recognizer statistics.
+
+        Returns:
+            dict: Frames processed, gestures recognized and the average number of
+                DTW cells updated per frame.
+        """
+        return {
+            'frames': self.frames,
+            'matches': self.matches,
+            'avg_cells': self.cells / self.frames if self.frames else 0.0,
+        }
@@ -0,0 +1,104 @@
+"""
+Frame Pool Module
+Reusable full-size frame buffers for the capture, inference and render path.
+
+At higher resolutions every full-frame allocation and copy is a noticeable
+share of the frame time. Stages that need a frame-sized scratch buffer take
+one from a FramePool and give it back when they are done, so once the
+pipeline has warmed up no new frame arrays are allocated. The pool counts
+every allocation (including arrays OpenCV had to allocate on its own), and
+mark_steady_state() lets the app report how many happened after warm-up,
+which should be zero.
+"""
+
+import numpy as np
+import threading
+
+
+class FramePool:
+    """
+    A thread-safe pool of numpy frame buffers keyed by shape and dtype.
+    """
+
+    def __init__(self):
+        """
+        Initialize the FramePool.
+        """
+        self.lock = threading.Lock()
+        self.free_buffers = {}
+
+        # Allocation counters
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.steady_state_mark = None
+
+    def acquire(self, shape, dtype=np.uint8):
+        """
+        Get a buffer, reusing a released one when possible.
+        The contents of a reused buffer are undefined.
+
+        Args:
+            shape (tuple): Array shape, e.g. (480, 640, 3).
+            dtype: Array dtype.
+
+        Returns:
+            numpy.ndarray: A buffer of the requested shape and dtype.
+        """
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self.lock:
+            buffers = self.free_buffers.get(key)
+            if buffers:
+                return buffers.pop()
+
+        buffer = np.empty(shape, dtype=dtype)
+        self.count_allocation(buffer)
+        return buffer
+
+    def release(self, buffer):
+        """
+        Return a buffer to the pool.
+
+        Args:
+            buffer (numpy.ndarray): A buffer previously returned by acquire().
+        """
+        key = (buffer.shape, buffer.dtype.str)
+        with self.lock:
+            self.free_buffers.setdefault(key, []).append(buffer)
+
+    def count_allocation(self, buffer):
+        """
+        Record a frame-sized allocation, e.g. one OpenCV made instead of
+        writing into a provided buffer.
+
+        Args:
+            buffer (numpy.ndarray): The newly allocated array.
+        """
+        with self.lock:
+            self.allocations += 1
+            self.allocated_bytes += buffer.nbytes
+
+    def mark_steady_state(self):
+        """
+        Remember the current allocation count; later allocations are reported
+        as steady-state allocations.
+        """
+        with self.lock:
+            self.steady_state_mark = self.allocations
+
+    def get_stats(self):
+        """
+        Get allocation statistics.
+
+        Returns:
+            dict: Total allocations, megabytes allocated and allocations since
+                mark_steady_state() (None if it was never called).
+        """
+        with self.lock:
+            steady = None
+            if self.steady_state_mark is not None:
+                steady = self.allocations - self.steady_state_mark
+            return {
+                'allocations': self.allocations,
+                'allocated_mb': self.allocated_bytes / (1024.0 * 1024.0),
+                'steady_state_allocations': steady,
+            }
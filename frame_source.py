@@ -0,0 +1,631 @@
+"""
+Frame Source Module
+Pluggable frame sources for the main loop: a live webcam or an offline replay.
+
+OpenCV's VideoCapture keeps a small internal queue of frames. When hand
+tracking is slower than the camera, reading synchronously means the loop
+works on frames that are several captures old. ThreadedCapture drains the
+camera on its own thread into a ring of preallocated buffers and only ever
+returns the most recent one.
+
+VideoFileSource and NpyFrameSource replay a recorded .mp4 (or any file
+OpenCV can decode) or a .npy frame stack through the same code path, either
+at the recorded frame rate or as fast as possible. They never drop frames,
+which makes runs reproducible for benchmarking.
+
+All sources share the same interface: open(), read(), frame_id,
+frame_timestamp, frame_size, get_stats() and release(). read() hands out a
+buffer that stays valid until the next read(). Pipelines that keep several
+frames in flight use acquire() / release_frame() instead, which lease a
+buffer until it is explicitly given back - frames are never copied.
+"""
+
+import cv2
+import numpy as np
+import os
+import threading
+import time
+from collections import deque
+
+
+class ThreadedCapture:
+    """
+    A webcam reader that runs on a background thread and keeps only the latest frame.
+    """
+
+    # Live sources produce frames whether or not anyone keeps up
+    is_live = True
+
+    def __init__(self, camera_indices=(0, 1), width=640, height=480, num_buffers=3, pool=None):
+        """
+        Initialize the ThreadedCapture.
+
+        Args:
+            camera_indices (tuple): Camera indices to try, in order.
+            width (int): Requested capture width.
+            height (int): Requested capture height.
+            num_buffers (int): Number of preallocated frame buffers in the ring.
+                Needs at least 3: one being written, one published, one in use.
+            pool (FramePool): Optional pool to allocate the ring from (for allocation counting).
+        """
+        self.camera_indices = camera_indices
+        self.width = width
+        self.height = height
+        self.num_buffers = max(3, num_buffers)
+        self.pool = pool
+
+        self.capture = None
+        self.camera_index = None
+
+        # Ring of preallocated frame buffers (created once the real frame size is known)
+        self.buffers = []
+        self.timestamps = []
+        self.frame_ids = []
+
+        # Slot bookkeeping (guarded by self.condition)
+        self.condition = threading.Condition()
+        self.latest_slot = None      # Newest published frame
+        self.latest_consumed = True  # Whether the newest frame has been read
+        self.leased_slots = set()    # Slots currently held by consumers
+        self.read_slot = None        # Slot leased by the last read() call
+
+        # Statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0      # Captured but overwritten before anyone read them
+        self.frames_read = 0
+        self.last_frame_age = 0.0    # Seconds between capture and read for the last frame
+        self.avg_frame_age = 0.0     # Exponential moving average of frame age
+
+        # Last frame handed out by read()
+        self.frame_id = -1
+        self.frame_timestamp = 0.0
+
+        # Thread state
+        self.thread = None
+        self.stop_flag = threading.Event()
+
+    def open(self):
+        """
+        Open the first working camera, read one frame to size the buffers and
+        start the capture thread.
+
+        Returns:
+            bool: True if a camera was opened and produced a frame, False otherwise.
+        """
+        for position, index in enumerate(self.camera_indices):
+            if position > 0:
+                print(f"⚠ Camera {self.camera_indices[position - 1]} not available, trying camera {index}...")
+
+            capture = cv2.VideoCapture(index)
+            if capture.isOpened():
+                self.capture = capture
+                self.camera_index = index
+                break
+            capture.release()
+
+        if self.capture is None:
+            return False
+
+        # Set webcam properties
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+
+        # Read one frame synchronously to learn the real frame size
+        ret, first_frame = self.capture.read()
+        if not ret or first_frame is None:
+            self.capture.release()
+            self.capture = None
+            return False
+
+        if self.pool is not None:
+            self.buffers = [self.pool.acquire(first_frame.shape, first_frame.dtype)
+                            for _ in range(self.num_buffers)]
+        else:
+            self.buffers = [np.empty_like(first_frame) for _ in range(self.num_buffers)]
+        self.timestamps = [0.0] * self.num_buffers
+        self.frame_ids = [-1] * self.num_buffers
+
+        # Publish the first frame so read() has something immediately
+        np.copyto(self.buffers[0], first_frame)
+        self._publish(0, time.time())
+
+        self.stop_flag.clear()
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def isOpened(self):
+        """
+        Check if the capture is running (mirrors cv2.VideoCapture.isOpened).
+
+        Returns:
+            bool: True if the camera is open, False otherwise.
+        """
+        return self.capture is not None and self.capture.isOpened()
+
+    @property
+    def frame_size(self):
+        """
+        Get the actual capture size.
+
+        Returns:
+            tuple: (width, height) of captured frames, or the requested size before open().
+        """
+        if self.buffers:
+            height, width = self.buffers[0].shape[:2]
+            return width, height
+        return self.width, self.height
+
+    def _free_slot(self):
+        """
+        Find a buffer that is neither the published frame nor leased by a consumer.
+        Must be called with self.condition held.
+
+        Returns:
+            int or None: A free slot index, or None if every buffer is busy.
+        """
+        for offset in range(1, self.num_buffers + 1):
+            slot = ((self.latest_slot or 0) + offset) % self.num_buffers
+            if slot != self.latest_slot and slot not in self.leased_slots:
+                return slot
+        return None
+
+    def _publish(self, slot, timestamp):
+        """
+        Make a freshly written slot the newest frame.
+        Must be called with self.condition held (or before the thread starts).
+
+        Args:
+            slot (int): The slot that was just written.
+            timestamp (float): Capture time of the frame.
+        """
+        if not self.latest_consumed:
+            # The previous frame was never read - it is now stale
+            self.frames_dropped += 1
+
+        self.timestamps[slot] = timestamp
+        self.frame_ids[slot] = self.frames_captured
+        self.frames_captured += 1
+        self.latest_slot = slot
+        self.latest_consumed = False
+
+    def _capture_loop(self):
+        """
+        Background loop that keeps pulling frames from the camera.
+        """
+        while not self.stop_flag.is_set():
+            with self.condition:
+                slot = self._free_slot()
+
+            if slot is None:
+                # All buffers are busy - still drain the driver so it never goes stale
+                if self.capture.grab():
+                    with self.condition:
+                        self.frames_captured += 1
+                        self.frames_dropped += 1
+                continue
+
+            # Decode directly into the preallocated buffer
+            ret, frame = self.capture.read(self.buffers[slot])
+            timestamp = time.time()
+
+            if not ret or frame is None:
+                time.sleep(0.005)
+                continue
+
+            with self.condition:
+                if frame is not self.buffers[slot]:
+                    # Frame size changed - OpenCV allocated a new array, adopt it
+                    self.buffers[slot] = frame
+                    if self.pool is not None:
+                        self.pool.count_allocation(frame)
+                self._publish(slot, timestamp)
+                self.condition.notify_all()
+
+    def acquire(self, timeout=1.0):
+        """
+        Lease the newest frame that has not been handed out before, waiting for one if needed.
+        The buffer is not reused by the capture thread until release_frame() is called.
+
+        Args:
+            timeout (float): Maximum time to wait for a new frame in seconds.
+
+        Returns:
+            tuple: (frame, lease), or (None, None) if no new frame arrived in time.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: not self.latest_consumed or self.stop_flag.is_set(),
+                                           timeout=timeout):
+                return None, None
+            if self.latest_slot is None or self.latest_consumed:
+                return None, None
+
+            slot = self.latest_slot
+            self.latest_consumed = True
+            self.leased_slots.add(slot)
+
+            self.frame_id = self.frame_ids[slot]
+            self.frame_timestamp = self.timestamps[slot]
+            self.frames_read += 1
+
+        # Track how old the frame is by the time the consumer gets it
+        self.last_frame_age = time.time() - self.frame_timestamp
+        self.avg_frame_age = 0.9 * self.avg_frame_age + 0.1 * self.last_frame_age
+
+        return self.buffers[slot], slot
+
+    def release_frame(self, lease):
+        """
+        Give a leased buffer back to the capture thread.
+
+        Args:
+            lease (int): The lease returned by acquire().
+        """
+        with self.condition:
+            self.leased_slots.discard(lease)
+
+    def read(self, timeout=1.0):
+        """
+        Get the newest frame, waiting for one that has not been returned before.
+        The returned array stays valid until the next call to read().
+
+        Args:
+            timeout (float): Maximum time to wait for a new frame in seconds.
+
+        Returns:
+            tuple: (success, frame) like cv2.VideoCapture.read().
+        """
+        # Give back the buffer from the previous read
+        if self.read_slot is not None:
+            self.release_frame(self.read_slot)
+            self.read_slot = None
+
+        frame, lease = self.acquire(timeout)
+        if frame is None:
+            return False, None
+
+        self.read_slot = lease
+        return True, frame
+
+    def get_stats(self):
+        """
+        Get capture statistics.
+
+        Returns:
+            dict: Frames captured/read/dropped and frame age in milliseconds.
+        """
+        return {
+            'captured': self.frames_captured,
+            'read': self.frames_read,
+            'dropped': self.frames_dropped,
+            'last_age_ms': self.last_frame_age * 1000.0,
+            'avg_age_ms': self.avg_frame_age * 1000.0,
+        }
+
+    def release(self):
+        """
+        Stop the capture thread and release the camera.
+        """
+        self.stop_flag.set()
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+        if self.capture:
+            self.capture.release()
+            self.capture = None
+
+
+class ReplaySource:
+    """
+    Base class for offline sources that replay recorded frames in order.
+    Subclasses implement _open() and _read_frame(buffer).
+
+    Frames are decoded into a small ring of buffers. A leased buffer is not
+    reused until release_frame() is called, so several frames can be in
+    flight through a pipeline without being copied.
+    """
+
+    # Offline sources deliver every frame, so downstream queues should block
+    # instead of dropping frames
+    is_live = False
+
+    def __init__(self, path, realtime=True, fps=None, num_buffers=4, pool=None):
+        """
+        Initialize the ReplaySource.
+
+        Args:
+            path (str): Path to the recording.
+            realtime (bool): Pace frames at the recorded frame rate if True,
+                otherwise deliver them as fast as they are consumed.
+            fps (float): Frame rate to assume when the recording does not store one.
+            num_buffers (int): Number of frame buffers that can be leased at once.
+            pool (FramePool): Optional pool to allocate the buffers from.
+        """
+        self.path = path
+        self.realtime = realtime
+        self.fps = fps
+        self.num_buffers = max(2, num_buffers)
+        self.pool = pool
+        self.buffer = None  # Template frame set by _open(), becomes the first ring buffer
+
+        # Ring of frame buffers and the slots not currently leased
+        self.buffers = []
+        self.free_slots = deque()
+        self.condition = threading.Condition()
+        self.read_slot = None
+
+        self.frame_id = -1
+        self.frame_timestamp = 0.0
+        self.frame_count = 0
+        self.finished = False
+
+        self.start_time = None
+        self.start_wall_time = None
+        self.end_time = None
+
+    def open(self):
+        """
+        Open the recording and read its first frame to size the buffer.
+
+        Returns:
+            bool: True if the recording can be replayed, False otherwise.
+        """
+        if not os.path.exists(self.path):
+            print(f"✗ Error: Recording not found: {self.path}")
+            return False
+        if not self._open():
+            return False
+        if not self.fps or self.fps <= 0:
+            self.fps = 30.0
+        if self.buffer is None:
+            return False
+
+        self.buffers = [self.buffer]
+        for _ in range(self.num_buffers - 1):
+            if self.pool is not None:
+                self.buffers.append(self.pool.acquire(self.buffer.shape, self.buffer.dtype))
+            else:
+                self.buffers.append(np.empty_like(self.buffer))
+        self.free_slots = deque(range(self.num_buffers))
+        return True
+
+    def isOpened(self):
+        """
+        Check if the recording is open and has frames left.
+
+        Returns:
+            bool: True while frames remain.
+        """
+        return self.buffer is not None and not self.finished
+
+    @property
+    def frame_size(self):
+        """
+        Get the recorded frame size.
+
+        Returns:
+            tuple: (width, height) of the frames.
+        """
+        height, width = self.buffer.shape[:2]
+        return width, height
+
+    def acquire(self, timeout=1.0):
+        """
+        Lease a buffer holding the next recorded frame. Waits for a free buffer
+        if every one is leased, so a slow consumer throttles the replay instead
+        of losing frames.
+
+        Args:
+            timeout (float): Maximum time to wait for a free buffer in seconds.
+
+        Returns:
+            tuple: (frame, lease), or (None, None) at the end of the recording
+                or if no buffer was released in time.
+        """
+        if self.finished:
+            return None, None
+
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.free_slots, timeout=timeout):
+                return None, None
+            slot = self.free_slots.popleft()
+
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+            self.start_wall_time = time.time()
+
+        next_id = self.frame_id + 1
+
+        # Wait until this frame is due at the recorded frame rate
+        if self.realtime:
+            due_time = self.start_time + next_id / self.fps
+            if due_time > now:
+                time.sleep(due_time - now)
+
+        frame = self._read_frame(self.buffers[slot])
+        if frame is None:
+            self.finished = True
+            self.end_time = time.perf_counter()
+            self.release_frame(slot)
+            return None, None
+        if frame is not self.buffers[slot]:
+            # OpenCV could not decode into the buffer (size changed) - adopt its array
+            self.buffers[slot] = frame
+            if self.pool is not None:
+                self.pool.count_allocation(frame)
+
+        self.frame_id = next_id
+        self.frame_count += 1
+        # Timestamps follow the recording so gesture timing replays faithfully
+        self.frame_timestamp = self.start_wall_time + self.frame_id / self.fps
+        self.end_time = time.perf_counter()
+        return frame, slot
+
+    def release_frame(self, lease):
+        """
+        Give a leased buffer back so it can hold a later frame.
+
+        Args:
+            lease (int): The lease returned by acquire().
+        """
+        with self.condition:
+            if lease not in self.free_slots:
+                self.free_slots.append(lease)
+                self.condition.notify()
+
+    def read(self, timeout=None):
+        """
+        Get the next recorded frame. The returned array is reused by a later call.
+
+        Args:
+            timeout (float): Unused, accepted for interface compatibility.
+
+        Returns:
+            tuple: (success, frame). success is False at the end of the recording.
+        """
+        if self.read_slot is not None:
+            self.release_frame(self.read_slot)
+            self.read_slot = None
+
+        frame, lease = self.acquire()
+        if frame is None:
+            return False, None
+
+        self.read_slot = lease
+        return True, frame
+
+    def get_stats(self):
+        """
+        Get replay statistics.
+
+        Returns:
+            dict: Frames read, elapsed time and achieved frames per second.
+        """
+        elapsed = (self.end_time - self.start_time) if self.start_time and self.end_time else 0.0
+        return {
+            'captured': self.frame_count,
+            'read': self.frame_count,
+            'dropped': 0,
+            'elapsed_s': elapsed,
+            'fps': self.frame_count / elapsed if elapsed > 0 else 0.0,
+            'last_age_ms': 0.0,
+            'avg_age_ms': 0.0,
+        }
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _read_frame(self, buffer):
+        """
+        Decode the next frame, into buffer if possible.
+
+        Returns:
+            numpy.ndarray: The frame (buffer itself, unless it had to be reallocated),
+                or None at the end of the recording.
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """
+        Release the recording.
+        """
+        self.finished = True
+        with self.condition:
+            self.condition.notify_all()
+
+
+class VideoFileSource(ReplaySource):
+    """
+    Replays a video file (e.g. .mp4) decoded by OpenCV.
+    """
+
+    def _open(self):
+        self.capture = cv2.VideoCapture(self.path)
+        if not self.capture.isOpened():
+            print(f"✗ Error: Could not open video: {self.path}")
+            return False
+
+        if self.fps is None:
+            self.fps = self.capture.get(cv2.CAP_PROP_FPS)
+
+        # Size the reusable buffer from the first frame, then rewind
+        ret, first_frame = self.capture.read()
+        if not ret or first_frame is None:
+            print(f"✗ Error: Video has no readable frames: {self.path}")
+            return False
+        self.buffer = first_frame
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return True
+
+    def _read_frame(self, buffer):
+        ret, frame = self.capture.read(buffer)
+        if not ret or frame is None:
+            return None
+        return frame
+
+    def release(self):
+        super().release()
+        if getattr(self, 'capture', None) is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class NpyFrameSource(ReplaySource):
+    """
+    Replays a memory-mapped .npy stack of BGR frames with shape (N, H, W, 3).
+    """
+
+    def _open(self):
+        try:
+            self.frames = np.load(self.path, mmap_mode='r')
+        except Exception as e:
+            print(f"✗ Error: Could not load frame stack {self.path}: {e}")
+            return False
+
+        if self.frames.ndim != 4 or self.frames.shape[3] != 3 or len(self.frames) == 0:
+            print(f"✗ Error: Expected an (N, H, W, 3) frame stack, got {self.frames.shape}")
+            return False
+
+        self.buffer = np.empty(self.frames.shape[1:], dtype=np.uint8)
+        return True
+
+    def _read_frame(self, buffer):
+        index = self.frame_id + 1
+        if index >= len(self.frames):
+            return None
+        # Copy out of the memory map so downstream code gets a writable frame
+        np.copyto(buffer, self.frames[index], casting='unsafe')
+        return buffer
+
+    def release(self):
+        super().release()
+        self.frames = None
+
+
+def open_frame_source(source=None, realtime=True, width=640, height=480, pool=None):
+    """
+    Create a frame source from a command-line style specification.
+
+    Args:
+        source (str): Camera index ("0"), path to a video file, path to a .npy
+            frame stack, or None for the default camera (0, falling back to 1).
+        realtime (bool): For recordings, replay at the recorded frame rate.
+        width (int): Requested camera width (cameras only).
+        height (int): Requested camera height (cameras only).
+        pool (FramePool): Optional pool the source allocates its frame buffers from.
+
+    Returns:
+        ThreadedCapture or ReplaySource: The (unopened) frame source.
+    """
+    # Buffers for: capture thread, published frame, inference, two queued packets, render
+    if source is None:
+        return ThreadedCapture(camera_indices=(0, 1), width=width, height=height, num_buffers=6, pool=pool)
+    if str(source).isdigit():
+        return ThreadedCapture(camera_indices=(int(source),), width=width, height=height,
+                               num_buffers=6, pool=pool)
+    if str(source).lower().endswith('.npy'):
+        return NpyFrameSource(source, realtime=realtime, num_buffers=5, pool=pool)
+    return VideoFileSource(source, realtime=realtime, num_buffers=5, pool=pool)
@@ -0,0 +1,442 @@
+"""
+Gesture Classifier Module
+A user-trainable classifier for static hand poses.
+
+The built-in rules (fingers_up() and the pixel thresholds in main.py) cannot
+learn a hand that does not fit them. GestureClassifier instead labels a hand
+with the nearest recorded examples. Every sample is normalized first:
+
+- translation: the wrist is moved to the origin
+- rotation: the hand is turned so the wrist to middle finger base points up
+- scale: lengths are divided by the wrist to middle finger base distance
+- handedness: left hands are mirrored so the thumb is always on the same side
+
+The normalized landmarks (42 numbers) are projected onto their main
+principal components and classified by distance-weighted k-nearest
+neighbours. For the few thousand samples a user records, one matrix product
+against all of them takes tens of microseconds, less than walking a KD-tree
+from Python, and it classifies every hand of a frame at once. A pose far
+from every sample is reported as unknown (-1).
+
+Labels that name a built-in gesture (BUILTIN_GESTURES) carry its finger
+states, so a model can stand in for fingers_up() in front of GestureEngine.
+The built-in gestures are the default training set: synthetic hand poses
+labelled by the built-in rules (default_training_set()). Recorded samples
+(main.py --record-gestures) can add to them or replace them.
+
+Usage:
+    python main.py --record-gestures my_hand.npz --gesture-label point
+    python gesture_classifier.py my_model.npz my_hand.npz
+    python main.py --gesture-model my_model.npz
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from gesture_engine import fingers_up, WRIST
+
+
+MIDDLE_MCP = 9
+INDEX_MCP = 5
+PINKY_MCP = 17
+NUM_LANDMARKS = 21
+
+UNKNOWN = -1
+
+# Built-in gesture label -> finger states (thumb to pinky), as fingers_up() reports them
+BUILTIN_GESTURES = {
+    'fist': (0, 0, 0, 0, 0),
+    'thumb': (1, 0, 0, 0, 0),
+    'point': (0, 1, 0, 0, 0),           # Move cursor
+    'point_thumb': (1, 1, 0, 0, 0),     # Move cursor (thumb out)
+    'two': (0, 1, 1, 0, 0),             # Right click mode
+    'two_thumb': (1, 1, 1, 0, 0),       # Right click mode (thumb out)
+    'pinky': (0, 0, 0, 0, 1),           # Scroll
+    'palm': (1, 1, 1, 1, 1),            # Scroll (open palm)
+}
+
+
+def normalize_landmarks(landmarks):
+    """
+    Normalize hands for translation, rotation, scale and handedness.
+
+    Args:
+        landmarks (numpy.ndarray): (..., 21, 2) pixel landmarks (or (..., 21, 3) with id first).
+
+    Returns:
+        numpy.ndarray: (..., 42) float32 features.
+    """
+    xy = np.asarray(landmarks, dtype=np.float32)[..., -2:]
+    xy = xy - xy[..., WRIST:WRIST + 1, :]
+
+    # Unit vector from the wrist to the middle finger base, and the hand size
+    axis = xy[..., MIDDLE_MCP, :]
+    size = np.maximum(np.linalg.norm(axis, axis=-1), 1e-6)[..., None]
+    unit = axis / size
+
+    # Rotate that vector onto "up" (negative y in image coordinates)
+    x = xy[..., 0] * -unit[..., 1:2] + xy[..., 1] * unit[..., 0:1]
+    y = -(xy[..., 0] * unit[..., 0:1] + xy[..., 1] * unit[..., 1:2])
+
+    # Mirror hands whose index finger base is right of the pinky base
+    x = np.where(x[..., INDEX_MCP:INDEX_MCP + 1] > x[..., PINKY_MCP:PINKY_MCP + 1], -x, x)
+
+    features = np.stack([x, y], axis=-1) / size[..., None]
+    return features.reshape(features.shape[:-2] + (2 * NUM_LANDMARKS,))
+
+
+# Synthetic hand: finger base joints (wrist at the origin, middle finger base
+# one unit above it), segment lengths and pointing angles (radians from up)
+_FINGER_BASES = np.array([[-0.36, -0.95], [0.0, -1.0], [0.3, -0.93], [0.55, -0.8]])
+_FINGER_SEGMENTS = np.array([[0.45, 0.27, 0.22], [0.5, 0.3, 0.23], [0.47, 0.28, 0.22], [0.37, 0.21, 0.19]])
+_FINGER_ANGLES = np.array([-0.15, 0.0, 0.12, 0.25])
+_THUMB_BASE = np.array([-0.25, -0.2])
+_THUMB_SEGMENTS = np.array([0.35, 0.3, 0.25])
+
+
+def synthesize_hands(finger_states, rng, pinch=0.0):
+    """
+    Synthesize pixel landmarks of random hands with the given fingers up.
+
+    Fingers are chains of segments bent towards the camera, which in the image
+    shortens them; a folded finger bends so far that its tip comes back below
+    its middle joint. Bend angles, finger spread, hand rotation, size,
+    position, tilt and landmark noise are random.
+
+    Args:
+        finger_states (numpy.ndarray): (N, 5) intended finger states, thumb to pinky.
+        rng (numpy.random.Generator): Random number generator.
+        pinch (float): Fraction of hands whose thumb tip is moved onto the index tip.
+
+    Returns:
+        numpy.ndarray: (N, 21, 2) float32 pixel landmarks.
+    """
+    finger_states = np.asarray(finger_states, dtype=bool)
+    count = len(finger_states)
+    hands = np.zeros((count, NUM_LANDMARKS, 2))
+
+    # Fingers: bend per joint, small when up and large when folded
+    up = finger_states[:, 1:, None]
+    bend = np.where(up, rng.uniform(0.0, 0.3, (count, 4, 3)),
+                    rng.uniform([0.8, 1.2, 0.5], [1.4, 1.8, 1.1], (count, 4, 3)))
+    total_bend = np.cumsum(bend, axis=-1)
+    along = np.cumsum(_FINGER_SEGMENTS * np.cos(total_bend), axis=-1)  # (N, 4, 3)
+    angles = _FINGER_ANGLES + rng.normal(0.0, 0.06, (count, 4))
+    direction = np.stack([np.sin(angles), -np.cos(angles)], axis=-1)  # (N, 4, 2)
+    bases = _FINGER_BASES + rng.normal(0.0, 0.03, (count, 4, 2))
+    joints = bases[:, :, None, :] + along[..., None] * direction[:, :, None, :]
+    for finger in range(4):
+        first = 5 + 4 * finger
+        hands[:, first] = bases[:, finger]
+        hands[:, first + 1:first + 4] = joints[:, finger]
+
+    # Thumb: out to the side when up, across the palm when folded
+    thumb_up = finger_states[:, 0, None]
+    start = np.where(thumb_up, rng.uniform(-1.3, -0.8, (count, 1)), rng.uniform(-0.6, -0.2, (count, 1)))
+    turn = np.where(thumb_up, rng.uniform(0.0, 0.2, (count, 3)), rng.uniform(0.7, 1.1, (count, 3)))
+    thumb_angles = start + np.cumsum(turn, axis=-1) - turn[:, :1]
+    steps = _THUMB_SEGMENTS[:, None] * np.stack([np.sin(thumb_angles), -np.cos(thumb_angles)], axis=-1)
+    hands[:, 1] = _THUMB_BASE + rng.normal(0.0, 0.03, (count, 2))
+    hands[:, 2:5] = hands[:, 1:2] + np.cumsum(steps, axis=1)
+
+    pinching = rng.random(count) < pinch
+    hands[pinching, 4] = hands[pinching, 8] + rng.normal(0.0, 0.05, (np.count_nonzero(pinching), 2))
+    hands[pinching, 3] = (hands[pinching, 2] + hands[pinching, 4]) / 2
+
+    # Tilt, mirror, rotate, scale and place the hand in a 640x480 frame
+    hands[..., 1] *= rng.uniform(0.75, 1.0, (count, 1))
+    hands[..., 0] *= np.where(rng.random((count, 1)) < 0.5, -1.0, 1.0)
+    rotation = rng.uniform(-0.5, 0.5, count)
+    cos, sin = np.cos(rotation)[:, None], np.sin(rotation)[:, None]
+    hands = np.stack([cos * hands[..., 0] - sin * hands[..., 1],
+                      sin * hands[..., 0] + cos * hands[..., 1]], axis=-1)
+    hands = hands * rng.uniform(60.0, 160.0, (count, 1, 1)) + rng.uniform([200, 300], [440, 400], (count, 1, 2))
+    hands += rng.normal(0.0, 1.0, hands.shape)
+    return np.round(hands).astype(np.float32)
+
+
+def default_training_set(samples_per_gesture=300, seed=0):
+    """
+    The built-in gestures as a training set: synthetic hands labelled by the built-in rules.
+
+    Hands are synthesized for every BUILTIN_GESTURES pose and labelled with
+    the gesture whose finger states fingers_up() finds; hands whose finger
+    states match no built-in gesture are left out.
+
+    Args:
+        samples_per_gesture (int): Hands synthesized per built-in gesture.
+        seed (int): Random seed, so the default model is always the same.
+
+    Returns:
+        tuple: ((N, 21, 2) pixel landmarks, (N,) labels).
+    """
+    rng = np.random.default_rng(seed)
+    names = list(BUILTIN_GESTURES)
+    states = np.repeat(np.array([BUILTIN_GESTURES[name] for name in names]), samples_per_gesture, axis=0)
+    hands = synthesize_hands(states, rng, pinch=0.3)
+
+    # Let the rules name each hand (pattern as a 5-bit number -> gesture)
+    codes = fingers_up(hands).astype(np.int64) @ (1 << np.arange(5))
+    pattern_names = np.full(32, '', dtype=object)
+    for name, pattern in BUILTIN_GESTURES.items():
+        pattern_names[np.dot(pattern, 1 << np.arange(5))] = name
+    labels = pattern_names[codes]
+    known = labels != ''
+    return hands[known], labels[known].astype(str)
+
+
+def load_samples(path):
+    """
+    Load labelled samples saved by SampleRecorder.
+
+    Returns:
+        tuple: ((N, 21, 2) pixel landmarks, (N,) labels).
+    """
+    with np.load(path) as data:
+        return data['landmarks'].astype(np.float32), data['labels'].astype(str)
+
+
+class SampleRecorder:
+    """
+    Collects labelled landmark samples and adds them to a sample file.
+    """
+
+    def __init__(self, path, label):
+        """
+        Initialize the SampleRecorder.
+
+        Args:
+            path (str): Sample file (.npz); samples already in it are kept.
+            label (str): Label of the samples recorded now.
+        """
+        self.path = path
+        self.label = label
+        self.samples = []
+
+    def record(self, landmarks):
+        """
+        Add one hand.
+
+        Args:
+            landmarks (numpy.ndarray): (21, 2) pixel landmarks (or (21, 3) with id first).
+        """
+        self.samples.append(np.asarray(landmarks, dtype=np.float32)[:, -2:])
+
+    def save(self):
+        """
+        Append the recorded samples to the sample file.
+
+        Returns:
+            int: Number of samples in the file.
+        """
+        landmarks = np.array(self.samples, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 2)
+        labels = np.full(len(landmarks), self.label)
+        if os.path.exists(self.path):
+            old_landmarks, old_labels = load_samples(self.path)
+            landmarks = np.concatenate([old_landmarks, landmarks])
+            labels = np.concatenate([old_labels, labels])
+        np.savez_compressed(self.path, landmarks=landmarks, labels=labels)
+        self.samples = []
+        return len(landmarks)
+
+
+class GestureClassifier:
+    """
+    k-nearest-neighbour classifier over normalized, PCA-projected hand landmarks.
+    """
+
+    def __init__(self, names, finger_states, mean, basis, points, classes, k=5, reject_distance=np.inf):
+        """
+        Initialize the GestureClassifier (use train() or load() to make one).
+
+        Args:
+            names (list): Class labels.
+            finger_states (numpy.ndarray): (C, 5) finger states per class, -1 for
+                labels that are not built-in gestures.
+            mean (numpy.ndarray): (42,) mean of the normalized training features.
+            basis (numpy.ndarray): (42, D) principal components.
+            points (numpy.ndarray): (N, D) projected training samples.
+            classes (numpy.ndarray): (N,) class index of each sample.
+            k (int): Neighbours that vote.
+            reject_distance (float): Nearest-sample distance above which a hand is unknown.
+        """
+        self.names = list(names)
+        self.finger_states = np.asarray(finger_states, dtype=np.int8)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.basis = np.asarray(basis, dtype=np.float32)
+        self.points = np.asarray(points, dtype=np.float32)
+        self.classes = np.asarray(classes, dtype=np.int64)
+        self.k = min(int(k), len(self.points))
+        self.reject_distance = float(reject_distance)
+        self.point_norms = (self.points ** 2).sum(axis=1)
+
+        # Statistics
+        self.hands = 0
+        self.calls = 0
+        self.total_time = 0.0
+
+    @classmethod
+    def train(cls, landmarks, labels, k=5, components=12):
+        """
+        Build a classifier from labelled samples.
+
+        Args:
+            landmarks (numpy.ndarray): (N, 21, 2) pixel landmarks.
+            labels (numpy.ndarray): (N,) labels.
+            k (int): Neighbours that vote.
+            components (int): Principal components kept.
+
+        Returns:
+            GestureClassifier: The trained classifier.
+        """
+        names, classes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+        finger_states = np.array([BUILTIN_GESTURES.get(name, (-1,) * 5) for name in names])
+
+        features = normalize_landmarks(landmarks)
+        mean = features.mean(axis=0)
+        _, _, vt = np.linalg.svd(features - mean, full_matrices=False)
+        basis = vt[:components].T
+        points = (features - mean) @ basis
+
+        # Unknown beyond twice the distance within which nearly all samples
+        # have another sample
+        nearest = np.empty(len(points), dtype=np.float32)
+        norms = (points ** 2).sum(axis=1)
+        for start in range(0, len(points), 1024):
+            chunk = points[start:start + 1024]
+            squared = norms[start:start + 1024, None] - 2 * chunk @ points.T + norms[None]
+            squared[np.arange(len(chunk)), np.arange(start, start + len(chunk))] = np.inf
+            nearest[start:start + 1024] = np.sqrt(np.maximum(squared.min(axis=1), 0.0))
+        reject_distance = 2.0 * np.percentile(nearest, 99) if len(points) > 1 else np.inf
+
+        return cls(names, finger_states, mean, basis, points, classes, k, reject_distance)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a classifier saved with save().
+        """
+        with np.load(path) as data:
+            return cls(data['names'].astype(str), data['finger_states'], data['mean'], data['basis'],
+                       data['points'], data['classes'], int(data['k']), float(data['reject_distance']))
+
+    def save(self, path):
+        """
+        Save the classifier to a .npz file.
+        """
+        np.savez_compressed(path, names=np.array(self.names), finger_states=self.finger_states,
+                            mean=self.mean, basis=self.basis, points=self.points,
+                            classes=self.classes, k=self.k, reject_distance=self.reject_distance)
+
+    def predict(self, landmarks):
+        """
+        Classify hands.
+
+        Args:
+            landmarks (numpy.ndarray): (H, 21, 2) or (21, 2) pixel landmarks
+                (or with an id column first).
+
+        Returns:
+            numpy.ndarray: (H,) class indices (UNKNOWN for poses unlike any sample),
+                or a single index for one hand.
+        """
+        start = time.perf_counter()
+        landmarks = np.asarray(landmarks)
+        single = landmarks.ndim == 2
+        if single:
+            landmarks = landmarks[None]
+
+        projected = (normalize_landmarks(landmarks) - self.mean) @ self.basis
+        squared = self.point_norms[None] - 2 * projected @ self.points.T + (projected ** 2).sum(axis=1)[:, None]
+        squared = np.maximum(squared, 0.0)
+
+        # Distance-weighted vote of the k nearest samples
+        neighbours = np.argpartition(squared, self.k - 1, axis=1)[:, :self.k]
+        distances = np.sqrt(np.take_along_axis(squared, neighbours, axis=1))
+        votes = np.zeros((len(projected), len(self.names)))
+        np.add.at(votes, (np.arange(len(projected))[:, None], self.classes[neighbours]), 1.0 / (distances + 1e-3))
+        classes = np.where(distances.min(axis=1) <= self.reject_distance, votes.argmax(axis=1), UNKNOWN)
+
+        self.hands += len(projected)
+        self.calls += 1
+        self.total_time += time.perf_counter() - start
+        return classes[0] if single else classes
+
+    def label(self, index):
+        """
+        Get the label of a class index ('?' for UNKNOWN).
+        """
+        return self.names[index] if index != UNKNOWN else '?'
+
+    def fingers(self, classes, fallback):
+        """
+        Finger states of predicted classes, for GestureEngine.
+
+        Args:
+            classes (numpy.ndarray): (H,) class indices from predict().
+            fallback (numpy.ndarray): (H, 5) finger states used for unknown poses and
+                labels that are not built-in gestures (e.g. from fingers_up()).
+
+        Returns:
+            numpy.ndarray: (H, 5) uint8 finger states.
+        """
+        classes = np.asarray(classes)
+        states = self.finger_states[np.maximum(classes, 0)]
+        known = (classes != UNKNOWN)[:, None] & (states >= 0)
+        return np.where(known, states, fallback).astype(np.uint8)
+
+    def get_stats(self):
+        """
+        Get classifier statistics.
+
+        Returns:
+            dict: Hands classified and the average time per call in microseconds.
+        """
+        return {
+            'hands': self.hands,
+            'avg_us': self.total_time / self.calls * 1e6 if self.calls else 0.0,
+        }
+
+
+def default_classifier():
+    """
+    Train a classifier on the built-in gestures (default_training_set()).
+    """
+    return GestureClassifier.train(*default_training_set())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python gesture_classifier.py MODEL [SAMPLES ...] [--no-defaults]")
+        sys.exit(1)
+
+    model_path = sys.argv[1]
+    sample_paths = [path for path in sys.argv[2:] if path != '--no-defaults']
+    parts = [] if '--no-defaults' in sys.argv else [default_training_set()]
+    parts += [load_samples(path) for path in sample_paths]
+    if not parts:
+        print("✗ No training samples")
+        sys.exit(1)
+    landmarks = np.concatenate([part[0] for part in parts])
+    labels = np.concatenate([part[1] for part in parts])
+
+    # Hold out every fifth sample to report the accuracy, then train on all
+    held_out = np.arange(len(labels)) % 5 == 0
+    classifier = GestureClassifier.train(landmarks[~held_out], labels[~held_out])
+    predicted = classifier.predict(landmarks[held_out])
+    names = np.array(classifier.names + ['?'])
+    accuracy = np.mean(names[predicted] == labels[held_out])
+    start = time.perf_counter()
+    for hand in landmarks[held_out][:200]:
+        classifier.predict(hand)
+    per_hand = (time.perf_counter() - start) / min(200, np.count_nonzero(held_out))
+    print(f"Held-out accuracy: {accuracy:.1%}, {per_hand * 1e6:.0f}µs per hand")
+
+    classifier = GestureClassifier.train(landmarks, labels)
+    classifier.save(model_path)
+    for index, name in enumerate(classifier.names):
+        print(f"  {name}: {np.count_nonzero(classifier.classes == index)} samples")
+    print(f"✓ Saved model with {len(classifier.points)} samples to {model_path}")
@@ -0,0 +1,397 @@
+"""
+Gesture Engine Module
+Turns hand landmarks into cursor modes and mouse events.
+
+GestureEngine.process() takes the 21 landmarks of one hand as a (21, 3)
+array of (id, x, y) rows, which is findPosition's output as an array, or a
+(T, 21, 3) batch of consecutive frames. process_hands() takes all hands of
+one frame, (H, 21, 3), and keeps separate gesture state per hand slot.
+
+Everything that is a pure function of a frame (fingertip distances, finger
+states, ring fold, cursor and scroll modes) is computed for the whole batch
+in a few array operations. The only sequential rules, click latches with
+their cooldown and the scroll reference height, are resolved per run of
+equal conditions rather than per frame, so a recorded session is evaluated
+in one call.
+
+The result is a record array of GESTURE_DTYPE, one record per frame:
+
+    cursor_mode   CURSOR_NONE, CURSOR_MOVE (index up, middle down) or
+                  CURSOR_RIGHT_CLICK (middle up)
+    scroll_mode   SCROLL_NONE, SCROLL_PINKY (only the pinky up) or
+                  SCROLL_PALM (all fingers up)
+    cursor        frame point the cursor follows (index or middle tip)
+    index_thumb   index tip to thumb tip distance in pixels
+    middle_thumb  middle tip to thumb tip distance in pixels
+    ring_folded   ring tip below its PIP joint
+    fingers       finger states, thumb to pinky
+    events        EVENT_* bit flags fired on this frame
+    scroll        scroll amount (positive is up) when EVENT_SCROLL fired
+    scroll_delta  upward wrist movement since the previous scroll frame
+
+Frames passed to the engine must have a hand; frames without one are simply
+left out, which keeps the click latches and scroll reference as they were.
+"""
+
+import numpy as np
+
+
+# Landmark indices
+WRIST = 0
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_PIP = 14
+RING_TIP = 16
+PINKY_MCP = 17
+PINKY_TIP = 20
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+
+# Cursor modes
+CURSOR_NONE = 0
+CURSOR_MOVE = 1
+CURSOR_RIGHT_CLICK = 2
+
+# Scroll modes
+SCROLL_NONE = 0
+SCROLL_PINKY = 1
+SCROLL_PALM = 2
+
+# Event flags
+EVENT_LEFT_CLICK = 1
+EVENT_RIGHT_CLICK = 2
+EVENT_DOUBLE_CLICK = 4
+EVENT_SCROLL = 8
+
+GESTURE_DTYPE = np.dtype([
+    ('cursor_mode', 'u1'),
+    ('scroll_mode', 'u1'),
+    ('cursor', '<f4', (2,)),
+    ('index_thumb', '<f4'),
+    ('middle_thumb', '<f4'),
+    ('ring_folded', '?'),
+    ('fingers', 'u1', (5,)),
+    ('events', 'u1'),
+    ('scroll', '<i4'),
+    ('scroll_delta', '<f4'),
+])
+
+
+def fingers_up(landmarks):
+    """
+    Work out which fingers are up from landmark positions.
+
+    A finger is up when its tip is above its PIP joint. The thumb is up when
+    its tip is further from the pinky base than its IP joint, which does not
+    depend on handedness or mirroring.
+
+    This thumb rule intentionally replaces HandDetector.fingersUp's, which
+    calls the thumb up when its tip is left of its IP joint: that flips with
+    the hand (a left hand's open thumb read as folded) and with mirroring.
+    Every detector path, recorded trace and the gesture classifier's default
+    labels use this rule, so it decides what counts as "thumb out" for the
+    palm scroll and every other thumb-dependent gesture.
+
+    Args:
+        landmarks (numpy.ndarray): (..., 21, 3) landmarks; the last two columns are x, y.
+
+    Returns:
+        numpy.ndarray: (..., 5) finger states (1 = up), thumb to pinky.
+    """
+    xy = np.asarray(landmarks, dtype=np.float32)[..., -2:]
+    fingers = np.empty(xy.shape[:-2] + (5,), dtype=np.uint8)
+    fingers[..., 1:] = xy[..., FINGER_TIPS[1:], 1] < xy[..., FINGER_TIPS[1:] - 2, 1]
+
+    pinky_base = xy[..., PINKY_MCP, :]
+    tip = np.linalg.norm(xy[..., THUMB_TIP, :] - pinky_base, axis=-1)
+    joint = np.linalg.norm(xy[..., THUMB_IP, :] - pinky_base, axis=-1)
+    fingers[..., 0] = tip > joint
+    return fingers
+
+
+class GestureEngine:
+    """
+    Evaluates mouse gestures over batches of frames or over several hands.
+
+    Click latches, cooldowns and the scroll reference are kept per hand slot
+    (0 to max_hands - 1), so each tracked hand has its own gesture state.
+    """
+
+    # Click kinds, in the column order of the latch state arrays
+    CLICKS = (EVENT_LEFT_CLICK, EVENT_RIGHT_CLICK, EVENT_DOUBLE_CLICK)
+
+    def __init__(self, click_distance=30.0, scroll_threshold=15.0, scroll_sensitivity=1,
+                 click_cooldown=0.5, max_hands=1):
+        """
+        Initialize the GestureEngine.
+
+        Args:
+            click_distance (float): Fingertip to thumb tip distance in pixels below
+                which a click fires.
+            scroll_threshold (float): Minimum vertical wrist movement in pixels per
+                frame to scroll.
+            scroll_sensitivity (float): Scroll units per scroll_threshold of movement.
+            click_cooldown (float): Minimum seconds between two clicks of the same kind.
+            max_hands (int): Number of hand slots with their own gesture state.
+        """
+        self.click_distance = click_distance
+        self.scroll_threshold = scroll_threshold
+        self.scroll_sensitivity = scroll_sensitivity
+        self.click_cooldown = click_cooldown
+        self.max_hands = max_hands
+
+        # Per hand slot and click kind: clicked since the fingers last separated,
+        # and the last click time; per slot: wrist height on the last scroll frame
+        self.performed = np.zeros((max_hands, len(self.CLICKS)), dtype=bool)
+        self.last_click = np.full((max_hands, len(self.CLICKS)), -np.inf)
+        self.prev_hand_y = np.full(max_hands, np.nan)
+        self.reset()
+
+        # Statistics
+        self.frames = 0
+        self.event_counts = {'left_click': 0, 'right_click': 0, 'double_click': 0, 'scroll': 0}
+
+    def reset(self, hands=None):
+        """
+        Clear the click latches, cooldowns and scroll reference.
+
+        Args:
+            hands: Hand slots to clear (index or index array); all if None.
+        """
+        if hands is None:
+            hands = slice(None)
+        self.performed[hands] = False
+        self.last_click[hands] = -np.inf
+        self.prev_hand_y[hands] = np.nan
+
+    def left_click_performed(self, hand=0):
+        """
+        Whether the current index-thumb pinch of a hand slot has already clicked.
+        """
+        return bool(self.performed[hand, 0])
+
+    def _evaluate(self, xy, fingers):
+        """
+        Evaluate everything that depends on a single frame, for N frames or hands.
+
+        Args:
+            xy (numpy.ndarray): (N, 21, 2) pixel landmarks.
+            fingers (numpy.ndarray): (N, 5) finger states.
+
+        Returns:
+            tuple: (GESTURE_DTYPE records without events, (N, 3) click conditions,
+                (N, 3) click releases, (N,) scroll mode flags, (N,) wrist heights).
+        """
+        record = np.zeros(len(xy), dtype=GESTURE_DTYPE)
+        record['fingers'] = fingers
+
+        # Index and middle tip to thumb tip distances in one step
+        offsets = xy[:, [INDEX_TIP, MIDDLE_TIP], :] - xy[:, [THUMB_TIP], :]
+        distances = np.hypot(offsets[..., 0], offsets[..., 1])
+        record['index_thumb'] = distances[:, 0]
+        record['middle_thumb'] = distances[:, 1]
+        ring_folded = xy[:, RING_TIP, 1] > xy[:, RING_PIP, 1]
+        record['ring_folded'] = ring_folded
+
+        up = fingers.astype(bool)
+        move = up[:, 1] & ~up[:, 2]
+        right = up[:, 2]
+        record['cursor_mode'] = np.where(move, CURSOR_MOVE, np.where(right, CURSOR_RIGHT_CLICK, CURSOR_NONE))
+        record['cursor'] = np.where(right[:, None], xy[:, MIDDLE_TIP], xy[:, INDEX_TIP])
+
+        pinky_only = up[:, 4] & ~up[:, 1:4].any(axis=1)
+        palm = up.all(axis=1)
+        record['scroll_mode'] = np.where(pinky_only, SCROLL_PINKY, np.where(palm, SCROLL_PALM, SCROLL_NONE))
+
+        # Clicks: a pinch fires once, then again only after the fingers separate
+        # (in the same cursor mode) and the cooldown has passed
+        index_pinch = distances[:, 0] < self.click_distance
+        middle_pinch = distances[:, 1] < self.click_distance
+        active = np.stack([move & index_pinch, right & middle_pinch, ring_folded & up[:, 1]], axis=1)
+        release = np.stack([move & ~index_pinch, right & ~middle_pinch, ~ring_folded], axis=1)
+
+        return record, active, release, pinky_only | palm, xy[:, WRIST, 1].astype(np.float64)
+
+    def _finish(self, record, events, delta):
+        """
+        Store the events and scroll amounts in the records and count them.
+
+        Args:
+            delta (numpy.ndarray): Upward wrist movement per record, NaN where there
+                is no previous scroll frame.
+        """
+        delta = np.nan_to_num(delta)
+        scrolled = np.abs(delta) > self.scroll_threshold
+        record['scroll_delta'] = delta
+        record['scroll'] = np.where(scrolled, np.trunc(delta / self.scroll_threshold * self.scroll_sensitivity), 0)
+        events[scrolled] |= EVENT_SCROLL
+        record['events'] = events
+
+        self.frames += len(record)
+        for flag, name in ((EVENT_LEFT_CLICK, 'left_click'), (EVENT_RIGHT_CLICK, 'right_click'),
+                           (EVENT_DOUBLE_CLICK, 'double_click'), (EVENT_SCROLL, 'scroll')):
+            self.event_counts[name] += int(np.count_nonzero(events & flag))
+
+    @staticmethod
+    def _prepare(landmarks, fingers):
+        """
+        Get (N, 21, 2) pixel landmarks and (N, 5) finger states as arrays.
+        """
+        xy = np.asarray(landmarks, dtype=np.float32)[..., -2:]
+        if fingers is None:
+            fingers = fingers_up(xy)
+        return xy, np.asarray(fingers, dtype=np.uint8).reshape(len(xy), 5)
+
+    def process(self, landmarks, timestamps, fingers=None, hand=0):
+        """
+        Evaluate gestures for one frame or a batch of consecutive frames of one hand.
+
+        Args:
+            landmarks (numpy.ndarray): (21, 3) or (T, 21, 3) landmarks of one hand;
+                the last two columns are pixel x, y.
+            timestamps (float or numpy.ndarray): Capture time of the frame, or (T,)
+                non-decreasing capture times.
+            fingers (numpy.ndarray): (5,) or (T, 5) finger states, e.g. from the
+                detector's fingersUp; computed from the landmarks if None.
+            hand (int): Hand slot whose gesture state is used.
+
+        Returns:
+            numpy.ndarray: GESTURE_DTYPE record array, shaped () or (T,).
+        """
+        landmarks = np.asarray(landmarks)
+        single = landmarks.ndim == 2
+        if single:
+            landmarks = landmarks[None]
+        xy, fingers = self._prepare(landmarks, fingers)
+        timestamps = np.atleast_1d(np.asarray(timestamps, dtype=np.float64))
+        record, active, release, scrolling, hand_y = self._evaluate(xy, fingers)
+
+        events = np.zeros(len(xy), dtype=np.uint8)
+        for kind, flag in enumerate(self.CLICKS):
+            events |= self._latched(hand, kind, flag, active[:, kind], release[:, kind], timestamps)
+
+        # Scrolling: wrist movement between consecutive frames in scroll mode
+        prev_y = np.empty_like(hand_y)
+        prev_y[1:] = np.where(scrolling[:-1], hand_y[:-1], np.nan)
+        prev_y[0] = self.prev_hand_y[hand]
+        delta = np.where(scrolling, prev_y - hand_y, np.nan)
+        self.prev_hand_y[hand] = hand_y[-1] if scrolling[-1] else np.nan
+
+        self._finish(record, events, delta)
+        return record[0] if single else record
+
+    def process_hands(self, landmarks, timestamp, fingers=None, hands=None):
+        """
+        Evaluate gestures for all hands of one frame, each with its own state.
+
+        Args:
+            landmarks (numpy.ndarray): (H, 21, 2) or (H, 21, 3) landmarks; the last two
+                columns are pixel x, y.
+            timestamp (float): Capture time of the frame.
+            fingers (numpy.ndarray): (H, 5) finger states; computed if None.
+            hands (numpy.ndarray): (H,) hand slot of each hand, e.g. from HandTracks;
+                defaults to 0 to H - 1.
+
+        Returns:
+            numpy.ndarray: (H,) GESTURE_DTYPE record array.
+        """
+        xy, fingers = self._prepare(landmarks, fingers)
+        if hands is None:
+            hands = np.arange(len(xy))
+        record, active, release, scrolling, hand_y = self._evaluate(xy, fingers)
+
+        # The click latches of all hands and click kinds in one step
+        performed = self.performed[hands]
+        last_click = self.last_click[hands]
+        fired = active & ~performed & (timestamp - last_click > self.click_cooldown)
+        self.performed[hands] = np.where(release, False, performed | fired)
+        self.last_click[hands] = np.where(fired, timestamp, last_click)
+        events = (fired * np.array(self.CLICKS, dtype=np.uint8)).sum(axis=1).astype(np.uint8)
+
+        delta = np.where(scrolling, self.prev_hand_y[hands] - hand_y, np.nan)
+        self.prev_hand_y[hands] = np.where(scrolling, hand_y, np.nan)
+
+        self._finish(record, events, delta)
+        return record
+
+    def _latched(self, hand, kind, flag, active, release, timestamps):
+        """
+        Fire a click on the first active frame after a release, subject to the cooldown.
+
+        Only the boundaries between runs of active, released and neutral frames
+        are visited, so the cost follows the number of gesture changes.
+
+        Returns:
+            numpy.ndarray: (T,) uint8 with `flag` set on the frames that click.
+        """
+        fired = np.zeros(len(active), dtype=np.uint8)
+        condition = np.where(active, 1, np.where(release, 2, 0))
+        starts = np.flatnonzero(np.diff(condition, prepend=-1))
+        ends = np.append(starts[1:], len(condition))
+
+        performed = self.performed[hand, kind]
+        last_click = self.last_click[hand, kind]
+        for start, end in zip(starts, ends):
+            if condition[start] == 2:
+                performed = False
+            elif condition[start] == 1 and not performed:
+                # First frame of the run past the cooldown
+                frame = start + np.searchsorted(timestamps[start:end], last_click + self.click_cooldown,
+                                                side='right')
+                if frame < end:
+                    fired[frame] = flag
+                    performed = True
+                    last_click = timestamps[frame]
+        self.performed[hand, kind] = performed
+        self.last_click[hand, kind] = last_click
+        return fired
+
+    def get_stats(self):
+        """
+        Get gesture statistics.
+
+        Returns:
+            dict: Frames evaluated and the number of each event fired.
+        """
+        return {'frames': self.frames, **self.event_counts}
+
+
+def evaluate_trace(path, engine=None):
+    """
+    Run the gestures of a recorded landmark trace in one batch.
+
+    Args:
+        path (str): Landmark trace file (see landmark_trace.py).
+        engine (GestureEngine): Engine to use; by default one with main.py's
+            thresholds scaled to the trace's frame width.
+
+    Returns:
+        tuple: (frame indices of the records with a hand, GESTURE_DTYPE records for them).
+    """
+    from landmark_trace import load_trace
+
+    trace = load_trace(path)
+    frames = np.flatnonzero(trace['hand_present'])
+    if engine is None:
+        pixel_scale = (trace['frame_size'][frames[0], 0] if len(frames) else 640) / 640.0
+        engine = GestureEngine(click_distance=30 * pixel_scale, scroll_threshold=15 * pixel_scale)
+    hands = trace[frames]
+    return frames, engine.process(hands['landmarks'], hands['timestamp'], hands['fingers'])
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) != 2:
+        print("Usage: python gesture_engine.py TRACE")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    frames, records = evaluate_trace(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    print(f"{len(frames)} hand frames evaluated in {elapsed * 1000:.1f}ms")
+    for flag, name in ((EVENT_LEFT_CLICK, 'Left clicks'), (EVENT_RIGHT_CLICK, 'Right clicks'),
+                       (EVENT_DOUBLE_CLICK, 'Double clicks'), (EVENT_SCROLL, 'Scrolls')):
+        print(f"  {name}: {np.count_nonzero(records['events'] & flag)}")
@@ -0,0 +1,116 @@
+"""
+Hand Tracks Module
+Gives each detected hand a stable track ID across frames.
+
+MediaPipe returns hands in no particular order, so "hand 0" can be a
+different hand from one frame to the next. HandTracks matches the hands of
+each frame to the tracks of the previous ones by their landmark centroids:
+all hand-to-track distances come from one array operation and are paired
+off nearest first, which is exact for the two or so hands in view.
+
+A hand that matches no track within max_distance starts a new track. Each
+track occupies one of max_hands slots, which index per-hand state elsewhere
+(e.g. GestureEngine's click latches); a slot whose track was not seen for
+max_missing seconds is freed. A new track reports `new` so that state can
+be cleared.
+"""
+
+import numpy as np
+
+
+class HandTracks:
+    """
+    Nearest-centroid association of hands to stable track IDs.
+    """
+
+    def __init__(self, max_hands=2, max_distance=150.0, max_missing=0.3):
+        """
+        Initialize the HandTracks.
+
+        Args:
+            max_hands (int): Number of track slots (hands tracked at once).
+            max_distance (float): Largest centroid movement in pixels between two
+                frames that still continues a track.
+            max_missing (float): Seconds a track survives without its hand.
+        """
+        self.max_hands = max_hands
+        self.max_distance = max_distance
+        self.max_missing = max_missing
+
+        self.ids = np.full(max_hands, -1, dtype=np.int64)   # Track ID per slot, -1 if free
+        self.centroids = np.zeros((max_hands, 2), dtype=np.float64)
+        self.last_seen = np.full(max_hands, -np.inf)
+        self.next_id = 0
+
+        # Statistics
+        self.tracks_started = 0
+        self.frames = 0
+
+    def reset(self):
+        """
+        Drop all tracks.
+        """
+        self.ids[:] = -1
+        self.last_seen[:] = -np.inf
+
+    def update(self, landmarks, timestamp):
+        """
+        Assign the hands of a frame to tracks.
+
+        Args:
+            landmarks (numpy.ndarray): (H, 21, 2) pixel landmarks (H <= max_hands).
+            timestamp (float): Capture time of the frame.
+
+        Returns:
+            tuple: (slots, ids, new), each (H,): the slot and track ID of every hand,
+                and whether its track started on this frame.
+        """
+        self.frames += 1
+        centroids = np.asarray(landmarks, dtype=np.float64)[..., -2:].mean(axis=1)
+        count = min(len(centroids), self.max_hands)
+        centroids = centroids[:count]
+
+        expired = timestamp - self.last_seen > self.max_missing
+        self.ids[expired] = -1
+
+        slots = np.full(count, -1, dtype=np.int64)
+        live = np.flatnonzero(self.ids >= 0)
+        if count and len(live):
+            # All hand-to-track distances at once, then pair off nearest first
+            distances = np.linalg.norm(centroids[:, None, :] - self.centroids[None, live, :], axis=-1)
+            taken = np.zeros(len(live), dtype=bool)
+            for flat in np.argsort(distances, axis=None):
+                hand, track = divmod(int(flat), len(live))
+                if distances[hand, track] > self.max_distance:
+                    break
+                if slots[hand] < 0 and not taken[track]:
+                    slots[hand] = live[track]
+                    taken[track] = True
+
+        # Unmatched hands start new tracks in free slots, or replace the
+        # unmatched tracks that were seen longest ago
+        new = slots < 0
+        if new.any():
+            available = np.setdiff1d(np.arange(self.max_hands), slots[~new])
+            available = available[np.argsort(self.last_seen[available], kind='stable')]
+            slots[new] = available[:np.count_nonzero(new)]
+            self.ids[slots[new]] = np.arange(self.next_id, self.next_id + np.count_nonzero(new))
+            self.next_id += int(np.count_nonzero(new))
+            self.tracks_started += int(np.count_nonzero(new))
+
+        self.centroids[slots] = centroids
+        self.last_seen[slots] = timestamp
+        return slots, self.ids[slots].copy(), new
+
+    def get_stats(self):
+        """
+        Get tracking statistics.
+
+        Returns:
+            dict: Frames processed, tracks started and tracks currently alive.
+        """
+        return {
+            'frames': self.frames,
+            'tracks_started': self.tracks_started,
+            'active_tracks': int(np.count_nonzero(self.ids >= 0)),
+        }
@@ -0,0 +1,104 @@
+"""
+Headless Controls Module
+Non-GUI control channel used when the preview window is disabled.
+
+Without a window there is no cv2.waitKey, so commands come from:
+- stdin: type a command key ('q', 'k', 'v') and press Enter
+- signals: SIGINT/SIGTERM quit, SIGUSR1 toggles the keyboard, SIGUSR2 toggles voice
+  (SIGUSR1/SIGUSR2 are only available on POSIX systems)
+"""
+
+import signal
+import sys
+import threading
+from collections import deque
+
+
+class HeadlessControls:
+    """
+    Collects control keys from stdin and signals and hands them out like cv2.waitKey.
+    """
+
+    def __init__(self, use_stdin=True, use_signals=True):
+        """
+        Initialize the HeadlessControls.
+
+        Args:
+            use_stdin (bool): Read command keys from standard input.
+            use_signals (bool): Map process signals to commands (main thread only).
+        """
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.stdin_thread = None
+        self.previous_handlers = {}
+
+        if use_stdin and sys.stdin is not None and not sys.stdin.closed:
+            self.stdin_thread = threading.Thread(target=self._read_stdin, daemon=True)
+            self.stdin_thread.start()
+
+        if use_signals:
+            self._install_signal('SIGINT', 'q')
+            self._install_signal('SIGTERM', 'q')
+            self._install_signal('SIGUSR1', 'k')
+            self._install_signal('SIGUSR2', 'v')
+
+    def _install_signal(self, name, key):
+        """
+        Map a signal to a command key, if the platform has that signal.
+
+        Args:
+            name (str): Signal name, e.g. 'SIGUSR1'.
+            key (str): Command key to queue when the signal arrives.
+        """
+        signal_number = getattr(signal, name, None)
+        if signal_number is None:
+            return
+        try:
+            self.previous_handlers[signal_number] = signal.signal(
+                signal_number, lambda signum, frame: self.push(key))
+        except (ValueError, OSError):
+            # Not on the main thread, or the signal cannot be caught here
+            pass
+
+    def _read_stdin(self):
+        """
+        Background loop that turns stdin lines into command keys.
+        """
+        for line in sys.stdin:
+            command = line.strip().lower()
+            if command:
+                self.push(command[0])
+        # stdin closed (e.g. EOF) - nothing else will arrive from it
+
+    def push(self, key):
+        """
+        Queue a command key.
+
+        Args:
+            key (str): A single-character command.
+        """
+        with self.lock:
+            self.pending.append(key)
+
+    def poll(self):
+        """
+        Get the next pending command without blocking.
+
+        Returns:
+            int: The key code (like cv2.waitKey() & 0xFF), or 255 if nothing is pending.
+        """
+        with self.lock:
+            if self.pending:
+                return ord(self.pending.popleft()) & 0xFF
+        return 255
+
+    def close(self):
+        """
+        Restore the original signal handlers.
+        """
+        for signal_number, handler in self.previous_handlers.items():
+            try:
+                signal.signal(signal_number, handler)
+            except (ValueError, OSError, TypeError):
+                pass
+        self.previous_handlers = {}
@@ -0,0 +1,197 @@
+"""
+Keyboard Layout Module
+Declarative virtual keyboard layouts and a compiler that turns them into
+pixel geometry for a given frame size.
+
+A layout is a dict of named layers (letters, symbols, number pad, ...).
+Each layer is a list of rows and each row a list of keys. A key is either a
+label ('Q'), a (label, width) tuple with the width in key units, or a
+(label, width, layer) tuple for a key that switches to another layer.
+
+compile_layout() sizes the keys to fit the frame and rasterizes every layer
+into an integer label map covering the keyboard area, so finding the key
+under the fingertip is a single array lookup however many keys there are.
+"""
+
+import numpy as np
+
+
+# Standard QWERTY keyboard with a symbols layer and a number pad
+QWERTY_LAYOUT = {
+    'default_layer': 'letters',
+    'layers': {
+        'letters': [
+            ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0'],
+            ['Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P'],
+            ['A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L'],
+            ['Z', 'X', 'C', 'V', 'B', 'N', 'M', ('BACK', 1.6)],
+            [('?!#', 1.6, 'symbols'), ('SPACE', 5), ('ENTER', 2.4), ('123', 1.6, 'numbers')],
+        ],
+        'symbols': [
+            ['!', '@', '#', '$', '%', '^', '&', '*', '(', ')'],
+            ['-', '_', '=', '+', '[', ']', '{', '}', '\\', '|'],
+            [';', ':', "'", '"', ',', '.', '<', '>', '/', '?'],
+            ['`', '~', ('TAB', 1.6), ('ESC', 1.6), ('BACK', 1.6)],
+            [('ABC', 1.6, 'letters'), ('SPACE', 5), ('ENTER', 2.4), ('123', 1.6, 'numbers')],
+        ],
+        'numbers': [
+            ['7', '8', '9', '/', ('BACK', 1.6)],
+            ['4', '5', '6', '*', ('LEFT', 1.6)],
+            ['1', '2', '3', '-', ('RIGHT', 1.6)],
+            ['0', '.', '=', '+', ('ENTER', 1.6)],
+            [('ABC', 1.6, 'letters'), ('SPACE', 3.4), ('?!#', 1.6, 'symbols')],
+        ],
+    },
+}
+
+
+class CompiledLayer:
+    """
+    One keyboard layer laid out in frame pixels, with its hit-test label map.
+    """
+
+    def __init__(self, name, keys, rectangles, switches, key_size, border=2):
+        """
+        Initialize the CompiledLayer.
+
+        Args:
+            name (str): Layer name.
+            keys (list): Key labels; a key's label id is its index in this list.
+            rectangles (list): (x, y, width, height) frame rectangle for each key.
+            switches (dict): Key label -> layer name for layer-switch keys.
+            key_size (int): Width and height of a one-unit key in pixels.
+            border (int): Key outline thickness, included in the layer bounds.
+        """
+        self.name = name
+        self.keys = keys
+        self.key_rectangles = dict(zip(keys, rectangles))
+        self.switches = switches
+        self.key_size = key_size
+
+        # Bounding box of all keys including their outlines
+        self.bounds = (min(x for x, y, w, h in rectangles) - border,
+                       min(y for x, y, w, h in rectangles) - border,
+                       max(x + w for x, y, w, h in rectangles) + border + 1,
+                       max(y + h for x, y, w, h in rectangles) + border + 1)
+
+        # Label map over the bounding box: key index per pixel, -1 between keys
+        x0, y0, x1, y1 = self.bounds
+        self.label_map = np.full((y1 - y0, x1 - x0), -1, dtype=np.int16)
+        for label, (x, y, w, h) in enumerate(rectangles):
+            # Edges are inclusive, like the key outlines
+            self.label_map[y - y0:y + h - y0 + 1, x - x0:x + w - x0 + 1] = label
+
+    def key_at(self, x, y):
+        """
+        Find the key under a point.
+
+        Args:
+            x (int): X coordinate in the frame.
+            y (int): Y coordinate in the frame.
+
+        Returns:
+            str or None: The key label, or None if the point is not on a key.
+        """
+        x0, y0, x1, y1 = self.bounds
+        x, y = int(x), int(y)
+        if not (x0 <= x < x1 and y0 <= y < y1):
+            return None
+        label = self.label_map[y - y0, x - x0]
+        return self.keys[label] if label >= 0 else None
+
+
+class CompiledLayout:
+    """
+    All layers of a layout compiled for one frame size.
+    """
+
+    def __init__(self, layers, default_layer, frame_width, frame_height):
+        """
+        Initialize the CompiledLayout.
+
+        Args:
+            layers (dict): Layer name -> CompiledLayer.
+            default_layer (str): Name of the layer shown first.
+            frame_width (int): Frame width the layout was compiled for.
+            frame_height (int): Frame height the layout was compiled for.
+        """
+        self.layers = layers
+        self.default_layer = default_layer
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+
+
+def _parse_key(spec):
+    """
+    Normalize a key spec to (label, width, target_layer).
+    """
+    if isinstance(spec, str):
+        return spec, 1.0, None
+    if len(spec) == 2:
+        return spec[0], float(spec[1]), None
+    return spec[0], float(spec[1]), spec[2]
+
+
+def compile_layout(layout, frame_width, frame_height, key_size=50, key_margin=10, top=0.55):
+    """
+    Lay out every layer of a keyboard layout for a frame size.
+
+    Keys are scaled with the frame width (key_size pixels per unit at 640px)
+    and shrunk if needed so the widest row and all rows fit inside the frame
+    below `top`.
+
+    Args:
+        layout (dict): A layout like QWERTY_LAYOUT.
+        frame_width (int): Frame width in pixels.
+        frame_height (int): Frame height in pixels.
+        key_size (int): One-unit key size in pixels for a 640px wide frame.
+        key_margin (int): Gap between keys in pixels for a 640px wide frame.
+        top (float): Top of the keyboard as a fraction of the frame height.
+
+    Returns:
+        CompiledLayout: The compiled layers.
+    """
+    layer_specs = layout['layers']
+    default_layer = layout.get('default_layer', next(iter(layer_specs)))
+    if default_layer not in layer_specs:
+        raise ValueError(f"Unknown default keyboard layer: {default_layer}")
+
+    margin_ratio = key_margin / float(key_size)
+    top_y = int(frame_height * top)
+
+    layers = {}
+    for name, rows in layer_specs.items():
+        rows = [[_parse_key(spec) for spec in row] for row in rows]
+
+        # Largest key unit that fits the widest row and all rows in the frame
+        widest = max(sum(w for _, w, _ in row) + (len(row) - 1) * margin_ratio for row in rows)
+        tallest = len(rows) + (len(rows) - 1) * margin_ratio
+        unit = min(key_size * frame_width / 640.0,
+                   0.96 * frame_width / widest,
+                   0.98 * (frame_height - top_y) / tallest)
+        gap = unit * margin_ratio
+        unit_px = max(1, int(unit))
+
+        keys, rectangles, switches = [], [], {}
+        y_pos = float(top_y)
+        for row in rows:
+            row_width = sum(w for _, w, _ in row) * unit + (len(row) - 1) * gap
+            x_pos = (frame_width - row_width) / 2.0
+
+            for label, width, target in row:
+                if label in switches or label in keys:
+                    raise ValueError(f"Duplicate key '{label}' in keyboard layer '{name}'")
+                if target is not None:
+                    if target not in layer_specs:
+                        raise ValueError(f"Key '{label}' switches to unknown layer '{target}'")
+                    switches[label] = target
+
+                keys.append(label)
+                rectangles.append((int(x_pos), int(y_pos), int(width * unit), unit_px))
+                x_pos += width * unit + gap
+
+            y_pos += unit + gap
+
+        layers[name] = CompiledLayer(name, keys, rectangles, switches, unit_px)
+
+    return CompiledLayout(layers, default_layer, frame_width, frame_height)
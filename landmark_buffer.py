@@ -0,0 +1,280 @@
+"""
+Landmark Buffer Module
+Hand landmarks of all detected hands in preallocated NumPy arrays.
+
+HandDetector.findPosition returns a new list of 21 (id, x, y) tuples per
+call, which fingersUp and the gesture code then take apart again. A
+LandmarkBuffer instead holds every detected hand in fixed arrays that are
+overwritten in place:
+
+    pixels      (max_hands, 21, 2) int32 pixel x, y
+    normalized  (max_hands, 21, 3) float32 x, y in 0-1 and MediaPipe's relative z
+    handedness  (max_hands,) int8 HAND_LEFT, HAND_RIGHT or HAND_UNKNOWN
+    scores      (max_hands,) float32 handedness/detection score
+    count       number of hands filled in
+
+ArrayHandDetector wraps a HandDetector and fills such buffers straight from
+the MediaPipe result the detector keeps (its `results` attribute), with one
+array conversion per hand instead of a tuple per landmark. It keeps the
+HandDetector interface, so the ROI, scaling and decimation wrappers can sit
+on top of it unchanged. Finger states of every path come from
+gesture_engine.fingers_up(), whose thumb rule does not depend on
+handedness or mirroring.
+
+Buffers are handed out from a small ring, so a buffer passed to another
+thread (e.g. inside a FramePacket) stays valid until ring_size - 1 more
+frames have been detected.
+"""
+
+import numpy as np
+
+from gesture_engine import fingers_up
+
+
+NUM_LANDMARKS = 21
+
+# Handedness values
+HAND_UNKNOWN = -1
+HAND_LEFT = 0
+HAND_RIGHT = 1
+
+HANDEDNESS_LABELS = {'Left': HAND_LEFT, 'Right': HAND_RIGHT}
+
+
+class LandmarkBuffer:
+    """
+    Preallocated landmark arrays for up to max_hands hands.
+    """
+
+    def __init__(self, max_hands=2):
+        """
+        Initialize the LandmarkBuffer.
+
+        Args:
+            max_hands (int): Number of hands the buffer can hold.
+        """
+        self.max_hands = max_hands
+        self.pixels = np.zeros((max_hands, NUM_LANDMARKS, 2), dtype=np.int32)
+        self.normalized = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.handedness = np.full(max_hands, HAND_UNKNOWN, dtype=np.int8)
+        self.scores = np.zeros(max_hands, dtype=np.float32)
+        self.count = 0
+        self.frame_size = (0, 0)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """
+        Mark the buffer as holding no hands.
+        """
+        self.count = 0
+
+    def fill_from_results(self, results, frame_width, frame_height):
+        """
+        Copy the hands of a MediaPipe Hands result into the buffer.
+
+        Args:
+            results: Output of mediapipe.solutions.hands.Hands.process().
+            frame_width (int): Width of the frame the result belongs to.
+            frame_height (int): Height of the frame the result belongs to.
+
+        Returns:
+            LandmarkBuffer: self.
+        """
+        hands = results.multi_hand_landmarks or []
+        labels = results.multi_handedness or []
+        self.count = min(len(hands), self.max_hands)
+        self.frame_size = (frame_width, frame_height)
+
+        for index in range(self.count):
+            landmarks = hands[index].landmark
+            # Straight into the buffer row, without a tuple per landmark
+            self.normalized[index] = np.fromiter(
+                (value for landmark in landmarks for value in (landmark.x, landmark.y, landmark.z)),
+                dtype=np.float32, count=3 * NUM_LANDMARKS).reshape(NUM_LANDMARKS, 3)
+            if index < len(labels):
+                classification = labels[index].classification[0]
+                self.handedness[index] = HANDEDNESS_LABELS.get(classification.label, HAND_UNKNOWN)
+                self.scores[index] = classification.score
+            else:
+                self.handedness[index] = HAND_UNKNOWN
+                self.scores[index] = 0.0
+
+        self._update_pixels()
+        return self
+
+    def fill_from_lists(self, landmark_lists, frame_width, frame_height):
+        """
+        Copy findPosition-style landmark lists into the buffer (no z, handedness or score).
+
+        Args:
+            landmark_lists (list): One list of (id, x, y) tuples per hand.
+            frame_width (int): Width of the frame the landmarks belong to.
+            frame_height (int): Height of the frame the landmarks belong to.
+
+        Returns:
+            LandmarkBuffer: self.
+        """
+        landmark_lists = [hand for hand in landmark_lists if len(hand) >= NUM_LANDMARKS]
+        self.count = min(len(landmark_lists), self.max_hands)
+        self.frame_size = (frame_width, frame_height)
+
+        for index in range(self.count):
+            self.pixels[index] = [(x, y) for _, x, y in landmark_lists[index][:NUM_LANDMARKS]]
+        hands = slice(0, self.count)
+        np.divide(self.pixels[hands], (frame_width, frame_height), out=self.normalized[hands, :, :2])
+        self.normalized[hands, :, 2] = 0.0
+        self.handedness[hands] = HAND_UNKNOWN
+        self.scores[hands] = 0.0
+        return self
+
+    def _update_pixels(self):
+        """
+        Recompute pixel coordinates from the normalized ones (truncated like findPosition).
+        """
+        hands = slice(0, self.count)
+        np.copyto(self.pixels[hands], self.normalized[hands, :, :2] * self.frame_size, casting='unsafe')
+
+    def mirror(self):
+        """
+        Flip the hands horizontally in place (for a mirrored display).
+
+        MediaPipe labels handedness as if its input were already mirrored. The
+        detector sees the unmirrored camera image, so mirroring the landmarks
+        also swaps the labels, which then name the user's real hand.
+        """
+        hands = slice(0, self.count)
+        self.normalized[hands, :, 0] = 1.0 - self.normalized[hands, :, 0]
+        self.pixels[hands, :, 0] = self.frame_size[0] - 1 - self.pixels[hands, :, 0]
+        known = self.handedness[hands] != HAND_UNKNOWN
+        self.handedness[hands][known] = 1 - self.handedness[hands][known]
+
+    def hand(self, index=0):
+        """
+        Get one hand's pixel landmarks.
+
+        Args:
+            index (int): Hand index (< count).
+
+        Returns:
+            numpy.ndarray: (21, 2) view into the buffer.
+        """
+        return self.pixels[index]
+
+    def fingers(self):
+        """
+        Get the finger states of all hands in one vectorized check.
+
+        Returns:
+            numpy.ndarray: (count, 5) finger states, thumb to pinky.
+        """
+        return fingers_up(self.pixels[:self.count])
+
+    def landmark_list(self, index=0):
+        """
+        Get one hand in findPosition's format.
+
+        Args:
+            index (int): Hand index.
+
+        Returns:
+            list: (id, x, y) tuples, empty if there is no such hand.
+        """
+        if index >= self.count:
+            return []
+        return [(lm_id, x, y) for lm_id, (x, y) in enumerate(self.pixels[index].tolist())]
+
+
+class ArrayHandDetector:
+    """
+    A HandDetector wrapper that writes landmarks into reusable LandmarkBuffers.
+    """
+
+    def __init__(self, detector, max_hands=2, ring_size=5):
+        """
+        Initialize the ArrayHandDetector.
+
+        Args:
+            detector (HandDetector): The detector that does the real work.
+            max_hands (int): Number of hands kept per frame.
+            ring_size (int): Number of buffers handed out in rotation.
+        """
+        self.detector = detector
+        self.buffers = [LandmarkBuffer(max_hands) for _ in range(ring_size)]
+        self.buffer_index = -1
+        self.landmarks = self.buffers[0]
+        # Without a MediaPipe result to read, hands are copied from findPosition
+        self.has_results = hasattr(detector, 'results')
+
+    def findLandmarks(self, frame, draw=True):
+        """
+        Detect hands and write their landmarks into the next buffer of the ring.
+
+        Args:
+            frame (numpy.ndarray): The BGR frame.
+            draw (bool): Draw the detected landmarks on the frame.
+
+        Returns:
+            LandmarkBuffer: The hands found on this frame.
+        """
+        self.findHands(frame, draw=draw)
+        return self.landmarks
+
+    def findHands(self, frame, draw=True):
+        """
+        Detect hands (HandDetector interface); the landmarks go into the next buffer.
+
+        Args:
+            frame (numpy.ndarray): The BGR frame.
+            draw (bool): Draw the detected landmarks on the frame.
+
+        Returns:
+            numpy.ndarray: The frame.
+        """
+        result = self.detector.findHands(frame, draw=draw)
+        self.buffer_index = (self.buffer_index + 1) % len(self.buffers)
+        self.landmarks = self.buffers[self.buffer_index]
+
+        frame_height, frame_width = frame.shape[:2]
+        if self.has_results:
+            self.landmarks.fill_from_results(self.detector.results, frame_width, frame_height)
+        else:
+            hands = []
+            for hand_number in range(self.landmarks.max_hands):
+                landmark_list = self.detector.findPosition(frame, hand_number=hand_number)
+                if len(landmark_list) == 0:
+                    break
+                hands.append(landmark_list)
+            self.landmarks.fill_from_lists(hands, frame_width, frame_height)
+        return result
+
+    def findPosition(self, frame, hand_number=0):
+        """
+        Get landmark positions of the last detection (HandDetector interface).
+
+        Args:
+            frame (numpy.ndarray): The frame passed to findHands.
+            hand_number (int): Which detected hand to return.
+
+        Returns:
+            list: (id, x, y) tuples, empty if no hand was found.
+        """
+        return self.landmarks.landmark_list(hand_number)
+
+    def fingersUp(self, landmark_list):
+        """
+        Get finger states (HandDetector interface).
+
+        Uses fingers_up(), like LandmarkBuffer.fingers(), so the wrappers on
+        top of this detector report the same finger states as the array path.
+
+        Args:
+            landmark_list (list): (id, x, y) tuples.
+
+        Returns:
+            list: Five 0/1 finger states.
+        """
+        if len(landmark_list) < NUM_LANDMARKS:
+            return []
+        return fingers_up(landmark_list[:NUM_LANDMARKS]).tolist()
@@ -0,0 +1,313 @@
+"""
+Landmark Predictor Module
+Skips hand detection on some frames and predicts the 21 landmarks in between.
+
+MediaPipe is the most expensive step of every frame. When the hand moves
+smoothly its landmarks are easy to extrapolate, so DecimatingHandDetector
+only runs the real detector every Nth frame (or sooner when predictions
+start to drift) and fills the other frames from a per-landmark motion model.
+Cursor updates keep coming at the camera rate while detection runs at a
+fraction of it.
+
+Predictors work in frame units (velocity is pixels per frame), so they
+behave the same for a live camera and for offline replays at any speed.
+"""
+
+import cv2
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+
+
+class ConstantVelocityPredictor:
+    """
+    Extrapolates each landmark with the velocity between its last two detections.
+    """
+
+    def __init__(self, velocity_smoothing=0.5):
+        """
+        Initialize the ConstantVelocityPredictor.
+
+        Args:
+            velocity_smoothing (float): Weight of the previous velocity when a new
+                detection arrives (0 = use the latest difference only).
+        """
+        self.velocity_smoothing = velocity_smoothing
+        self.position = None
+        self.velocity = np.zeros((NUM_LANDMARKS, 2), dtype=np.float64)
+        self.last_frame = 0
+
+    def reset(self):
+        """
+        Forget the current track.
+        """
+        self.position = None
+        self.velocity.fill(0.0)
+
+    def update(self, points, frame_index):
+        """
+        Add a detection.
+
+        Args:
+            points (numpy.ndarray): (21, 2) landmark pixel positions.
+            frame_index (int): Frame number of the detection.
+        """
+        if self.position is None:
+            self.position = points.astype(np.float64)
+            self.velocity.fill(0.0)
+        else:
+            frames = max(1, frame_index - self.last_frame)
+            new_velocity = (points - self.position) / frames
+            self.velocity *= self.velocity_smoothing
+            self.velocity += (1.0 - self.velocity_smoothing) * new_velocity
+            self.position[:] = points
+        self.last_frame = frame_index
+
+    def predict(self, frame_index):
+        """
+        Predict landmark positions.
+
+        Args:
+            frame_index (int): Frame number to predict for.
+
+        Returns:
+            numpy.ndarray: (21, 2) predicted positions.
+        """
+        return self.position + self.velocity * (frame_index - self.last_frame)
+
+
+class KalmanLandmarkPredictor:
+    """
+    A constant-velocity Kalman filter for all 42 landmark coordinates at once.
+
+    Every coordinate uses the same motion model, measurement noise and frame
+    spacing, so they all share one 2x2 covariance matrix and one gain. The
+    filter is therefore a couple of small matrix products plus one vectorized
+    update over a (42, 2) state array.
+    """
+
+    def __init__(self, process_noise=4.0, measurement_noise=2.0):
+        """
+        Initialize the KalmanLandmarkPredictor.
+
+        Args:
+            process_noise (float): Acceleration noise (pixels/frame^2, standard deviation).
+            measurement_noise (float): Landmark jitter (pixels, standard deviation).
+        """
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+
+        # State per coordinate: [position, velocity]
+        self.state = np.zeros((NUM_LANDMARKS * 2, 2), dtype=np.float64)
+        self.covariance = np.eye(2)
+        self.initialized = False
+        self.last_frame = 0
+
+    def reset(self):
+        """
+        Forget the current track.
+        """
+        self.initialized = False
+
+    def _transition(self, frames):
+        """
+        Build the state transition and process noise for a gap of `frames`.
+        """
+        transition = np.array([[1.0, frames], [0.0, 1.0]])
+        q = self.process_noise ** 2
+        noise = q * np.array([[frames ** 4 / 4.0, frames ** 3 / 2.0],
+                              [frames ** 3 / 2.0, frames ** 2]])
+        return transition, noise
+
+    def update(self, points, frame_index):
+        """
+        Add a detection.
+
+        Args:
+            points (numpy.ndarray): (21, 2) landmark pixel positions.
+            frame_index (int): Frame number of the detection.
+        """
+        measurement = points.reshape(-1).astype(np.float64)
+
+        if not self.initialized:
+            self.state[:, 0] = measurement
+            self.state[:, 1] = 0.0
+            self.covariance = np.diag([self.measurement_noise ** 2, 100.0])
+            self.initialized = True
+            self.last_frame = frame_index
+            return
+
+        # Predict forward to this frame
+        frames = max(1, frame_index - self.last_frame)
+        transition, noise = self._transition(frames)
+        self.state = self.state @ transition.T
+        covariance = transition @ self.covariance @ transition.T + noise
+
+        # Update with the measured positions (shared gain for all coordinates)
+        innovation_variance = covariance[0, 0] + self.measurement_noise ** 2
+        gain = covariance[:, 0] / innovation_variance
+        residual = measurement - self.state[:, 0]
+        self.state += residual[:, None] * gain[None, :]
+        self.covariance = covariance - np.outer(gain, covariance[0, :])
+        self.last_frame = frame_index
+
+    def predict(self, frame_index):
+        """
+        Predict landmark positions.
+
+        Args:
+            frame_index (int): Frame number to predict for.
+
+        Returns:
+            numpy.ndarray: (21, 2) predicted positions.
+        """
+        frames = frame_index - self.last_frame
+        return (self.state[:, 0] + self.state[:, 1] * frames).reshape(NUM_LANDMARKS, 2)
+
+
+class DecimatingHandDetector:
+    """
+    A HandDetector wrapper that runs detection on a subset of frames and
+    predicts landmarks on the rest.
+    """
+
+    def __init__(self, detector, interval=2, max_error=12.0, predictor='kalman'):
+        """
+        Initialize the DecimatingHandDetector.
+
+        Args:
+            detector (HandDetector): The detector that does the real work.
+            interval (int): Run detection at least every N frames.
+            max_error (float): Mean landmark prediction error in pixels above
+                which detection runs on every frame until predictions recover.
+            predictor (str): 'kalman' or 'velocity'.
+        """
+        self.detector = detector
+        self.interval = max(1, interval)
+        self.max_error = max_error
+
+        if predictor == 'kalman':
+            self.predictor = KalmanLandmarkPredictor()
+        elif predictor == 'velocity':
+            self.predictor = ConstantVelocityPredictor()
+        else:
+            raise ValueError(f"Unknown landmark predictor: {predictor}")
+
+        # Adaptive detection interval (drops to 1 when predictions drift)
+        self.current_interval = self.interval
+        self.frame_index = -1
+        self.last_detection_frame = None
+        self.detect_this_frame = True
+        self.tracking = False
+        self.draw = True
+
+        # Statistics
+        self.frames = 0
+        self.detections = 0
+        self.last_error = 0.0
+        self.avg_error = 0.0
+        self.max_error_seen = 0.0
+
+    def findHands(self, frame, draw=True):
+        """
+        Run the real detector if this frame is due for detection.
+
+        Args:
+            frame (numpy.ndarray): The BGR frame.
+            draw (bool): Draw landmarks on the frame.
+
+        Returns:
+            numpy.ndarray: The frame.
+        """
+        self.frame_index += 1
+        self.frames += 1
+        self.draw = draw
+
+        self.detect_this_frame = (not self.tracking or
+                                  self.frame_index - self.last_detection_frame >= self.current_interval)
+
+        if self.detect_this_frame:
+            self.detections += 1
+            return self.detector.findHands(frame, draw=draw)
+        return frame
+
+    def findPosition(self, frame, hand_number=0):
+        """
+        Get landmark positions, detected or predicted.
+
+        Args:
+            frame (numpy.ndarray): The frame passed to findHands.
+            hand_number (int): Which detected hand to return (only hand 0 is predicted).
+
+        Returns:
+            list: (id, x, y) tuples, empty if no hand is tracked.
+        """
+        if not self.detect_this_frame:
+            if hand_number != 0:
+                return []
+            predicted = np.rint(self.predictor.predict(self.frame_index)).astype(int)
+            if self.draw:
+                for x, y in predicted:
+                    cv2.circle(frame, (int(x), int(y)), 4, (255, 200, 0), cv2.FILLED)
+            return [(lm_id, int(x), int(y)) for lm_id, (x, y) in enumerate(predicted)]
+
+        landmark_list = self.detector.findPosition(frame, hand_number=hand_number)
+        if hand_number != 0:
+            return landmark_list
+
+        if len(landmark_list) < NUM_LANDMARKS:
+            # Hand lost - stop predicting until it is detected again
+            self.tracking = False
+            self.predictor.reset()
+            self.current_interval = self.interval
+            return landmark_list
+
+        points = np.array([(x, y) for _, x, y in landmark_list[:NUM_LANDMARKS]], dtype=np.float64)
+
+        if self.tracking:
+            # How far off would the prediction have been?
+            predicted = self.predictor.predict(self.frame_index)
+            self.last_error = float(np.mean(np.linalg.norm(predicted - points, axis=1)))
+            self.avg_error = 0.9 * self.avg_error + 0.1 * self.last_error
+            self.max_error_seen = max(self.max_error_seen, self.last_error)
+
+            if self.last_error > self.max_error:
+                self.current_interval = 1
+            elif self.last_error < self.max_error / 2:
+                self.current_interval = min(self.interval, self.current_interval + 1)
+
+        self.predictor.update(points, self.frame_index)
+        self.tracking = True
+        self.last_detection_frame = self.frame_index
+        return landmark_list
+
+    def fingersUp(self, landmark_list):
+        """
+        Get finger states for detected or predicted landmarks.
+
+        Args:
+            landmark_list (list): (id, x, y) tuples.
+
+        Returns:
+            list: Five 0/1 finger states.
+        """
+        return self.detector.fingersUp(landmark_list)
+
+    def get_stats(self):
+        """
+        Get decimation statistics.
+
+        Returns:
+            dict: Frames, detections, the decimation ratio (fraction of frames
+                that ran detection) and landmark prediction error in pixels.
+        """
+        return {
+            'frames': self.frames,
+            'detections': self.detections,
+            'decimation_ratio': self.detections / self.frames if self.frames else 1.0,
+            'current_interval': self.current_interval,
+            'last_error_px': self.last_error,
+            'avg_error_px': self.avg_error,
+            'max_error_px': self.max_error_seen,
+        }
@@ -0,0 +1,258 @@
+"""
+Lexicon Module
+Word list with a prefix trie, used by swipe typing to decode gestures.
+
+Words are stored upper case to match the virtual keyboard labels. Every
+trie node remembers the highest word count below it, so decoders can rank
+or prune whole subtrees without visiting them. A lexicon can be loaded from
+a text file with one word per line, optionally followed by a count
+("hello 1200" or "hello<TAB>1200"); without a file a small built-in list of
+common English words is used. The same trie answers "most frequent words
+with this prefix" for word prediction.
+"""
+
+import heapq
+import math
+import os
+
+
+# Common English words, most frequent first (used when no word list is given)
+DEFAULT_WORDS = (
+    "the of and to a in is you that it he was for on are as with his they i at be this have "
+    "from or one had by word but not what all were we when your can said there use an each "
+    "which she do how their if will up other about out many then them these so some her would "
+    "make like him into time has look two more write go see number no way could people my than "
+    "first water been call who oil its now find long down day did get come made may part over "
+    "new sound take only little work know place year live me back give most very after thing our "
+    "just name good sentence man think say great where help through much before line right too "
+    "mean old any same tell boy follow came want show also around form three small set put end "
+    "does another well large must big even such because turn here why ask went men read need "
+    "land different home us move try kind hand picture again change off play spell air away "
+    "animal house point page letter mother answer found study still learn should world high "
+    "every near add food between own below country plant last school father keep tree never "
+    "start city earth eye light thought head under story saw left few while along might close "
+    "something seem next hard open example begin life always those both paper together got "
+    "group often run important until children side feet car mile night walk white sea began "
+    "grow took river four carry state once book hear stop without second later miss idea enough "
+    "eat face watch far really almost let above girl sometimes mountain cut young talk soon list "
+    "song being leave family hello thanks please yes okay today tomorrow email message computer "
+    "mouse keyboard screen window file click type open save delete copy paste search"
+).split()
+
+
+class TrieNode:
+    """
+    A node of the lexicon trie.
+    """
+
+    __slots__ = ('children', 'word', 'count', 'best_count')
+
+    def __init__(self):
+        """
+        Initialize the TrieNode.
+        """
+        self.children = {}    # Letter -> TrieNode
+        self.word = None      # The word ending here, if any
+        self.count = 0        # Count of that word
+        self.best_count = 0   # Highest word count in this subtree
+
+
+class Lexicon:
+    """
+    A set of words with counts, indexed by a prefix trie.
+    """
+
+    def __init__(self, words=None):
+        """
+        Initialize the Lexicon.
+
+        Args:
+            words (iterable): Optional words, or (word, count) pairs, to add.
+        """
+        self.root = TrieNode()
+        self.total_count = 0
+        self.size = 0
+
+        for entry in words or ():
+            if isinstance(entry, str):
+                self.add_word(entry)
+            else:
+                self.add_word(*entry)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, word):
+        node = self.find_prefix(word)
+        return node is not None and node.word is not None
+
+    def add_word(self, word, count=1):
+        """
+        Add a word, or add to its count if it is already known.
+
+        Args:
+            word (str): The word (case insensitive).
+            count (int): How often the word occurs.
+        """
+        word = word.strip().upper()
+        if not word:
+            return
+
+        node = self.root
+        path = [node]
+        for letter in word:
+            node = node.children.setdefault(letter, TrieNode())
+            path.append(node)
+
+        if node.word is None:
+            node.word = word
+            self.size += 1
+        node.count += count
+        self.total_count += count
+
+        for parent in path:
+            if node.count > parent.best_count:
+                parent.best_count = node.count
+
+    def remove_count(self, word, count):
+        """
+        Lower a word's count, removing the word when it reaches zero.
+
+        Args:
+            word (str): The word (case insensitive).
+            count (int): Amount to subtract.
+        """
+        word = word.strip().upper()
+        path = [self.root]
+        for letter in word:
+            node = path[-1].children.get(letter)
+            if node is None:
+                return
+            path.append(node)
+
+        node = path[-1]
+        if node.word is None:
+            return
+        removed = min(count, node.count)
+        node.count -= removed
+        self.total_count -= removed
+        if node.count <= 0:
+            node.word = None
+            node.count = 0
+            self.size -= 1
+
+        # Recompute the subtree bests bottom-up and drop branches with no words left
+        for depth in range(len(path) - 1, -1, -1):
+            current = path[depth]
+            current.best_count = max([current.count if current.word is not None else 0] +
+                                     [child.best_count for child in current.children.values()])
+            if depth > 0 and current.word is None and not current.children:
+                del path[depth - 1].children[word[depth - 1]]
+
+    def completions(self, prefix, limit=3):
+        """
+        Get the most frequent words starting with a prefix.
+
+        Args:
+            prefix (str): The prefix (case insensitive).
+            limit (int): Maximum number of words.
+
+        Returns:
+            list: Up to `limit` words, most frequent first.
+        """
+        node = self.find_prefix(prefix)
+        return self.completions_from(node, limit) if node is not None else []
+
+    def completions_from(self, node, limit=3):
+        """
+        Get the most frequent words below a trie node.
+
+        Best-first search on the subtree counts: only branches that can still
+        beat the current results are opened, so this does not depend on the
+        number of words below the node.
+
+        Args:
+            node (TrieNode): Start node (e.g. from find_prefix).
+            limit (int): Maximum number of words.
+
+        Returns:
+            list: Up to `limit` words, most frequent first.
+        """
+        results = []
+        order = 0  # Tie breaker so heap entries never compare nodes
+        heap = [(-node.best_count, order, node, False)]
+        while heap and len(results) < limit:
+            _, _, current, is_word = heapq.heappop(heap)
+            if is_word:
+                results.append(current.word)
+                continue
+            if current.word is not None:
+                order += 1
+                heapq.heappush(heap, (-current.count, order, current, True))
+            for child in current.children.values():
+                order += 1
+                heapq.heappush(heap, (-child.best_count, order, child, False))
+        return results
+
+    def find_prefix(self, prefix):
+        """
+        Find the trie node for a prefix.
+
+        Args:
+            prefix (str): The prefix (case insensitive).
+
+        Returns:
+            TrieNode or None: The node, or None if no word starts with the prefix.
+        """
+        node = self.root
+        for letter in prefix.upper():
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+    def log_probability(self, count):
+        """
+        Get the log probability of a word count (with add-one smoothing).
+
+        Args:
+            count (int): Word count.
+
+        Returns:
+            float: log((count + 1) / (total + size)).
+        """
+        return math.log((count + 1.0) / (self.total_count + self.size + 1.0))
+
+
+def load_lexicon(path=None):
+    """
+    Load a lexicon from a word list, or build the default one.
+
+    Args:
+        path (str): Text file with one word per line and an optional count.
+            Words without a count are ranked by their position in the file.
+
+    Returns:
+        Lexicon: The loaded lexicon.
+    """
+    if path is None:
+        count = len(DEFAULT_WORDS)
+        return Lexicon((word, count - rank) for rank, word in enumerate(DEFAULT_WORDS))
+
+    if not os.path.exists(path):
+        raise OSError(f"Word list not found: {path}")
+
+    with open(path, encoding='utf-8') as word_file:
+        lines = [line.split() for line in word_file if line.strip()]
+
+    lexicon = Lexicon()
+    for rank, parts in enumerate(lines):
+        word = parts[0]
+        if not word.isalpha():
+            continue
+        try:
+            count = int(parts[1]) if len(parts) > 1 else len(lines) - rank
+        except ValueError:
+            count = len(lines) - rank
+        lexicon.add_word(word, count)
+    return lexicon
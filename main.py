@@ -41,74 +41,225 @@ Gestures:
 - All fingers up (Open Palm): Alternative scroll mode
 """
 
+import argparse
 import cv2
 import time
-import math
 import numpy as np
 from hand_tracker import HandDetector
-from mouse_controller import MouseController
 from virtual_keyboard import VirtualKeyboard
 from voice_control import VoiceController
 from settings_gui import SettingsGUI
+from frame_source import open_frame_source
+from pipeline import BoundedQueue, Stage, FramePacket, LatencyStats
+from output_queue import OutputQueue, QueuedMouse
+from output_backends import BACKENDS, PyAutoGuiBackend, create_backend
+from cursor_actuator import CursorActuator
+from cursor_predictor import LatencyCompensator
+from smoothing import SMOOTHERS, create_smoother
+from landmark_trace import TraceRecorder, TraceReplayer
+from overlay import Overlay, HudLayer
+from headless_controls import HeadlessControls
+from roi_tracker import RoiHandDetector
+from landmark_predictor import DecimatingHandDetector
+from scaled_detector import ScaledHandDetector
+from frame_pool import FramePool
+from lexicon import load_lexicon
+from word_predictor import WordPredictor
+from landmark_buffer import ArrayHandDetector
+from hand_tracks import HandTracks
+from dynamic_gestures import DynamicGestureRecognizer, DYNAMIC_ACTIONS
+from gesture_classifier import GestureClassifier, SampleRecorder, default_classifier
+from gesture_engine import (GestureEngine, CURSOR_NONE, CURSOR_MOVE, CURSOR_RIGHT_CLICK, SCROLL_NONE,
+                            SCROLL_PINKY, EVENT_LEFT_CLICK, EVENT_RIGHT_CLICK, EVENT_DOUBLE_CLICK,
+                            EVENT_SCROLL, WRIST, INDEX_TIP, PINKY_TIP, fingers_up)
 
 
-def calculate_distance(point1, point2):
+def parse_args(argv=None):
     """
-    Calculate the Euclidean distance between two points.
+    Parse command-line options.
     
     Args:
-        point1 (tuple): (id, x, y) of the first point.
-        point2 (tuple): (id, x, y) of the second point.
+        argv (list): Argument list (defaults to sys.argv).
     
     Returns:
-        float: The distance between the two points.
+        argparse.Namespace: The parsed options.
     """
-    x1, y1 = point1[1], point1[2]
-    x2, y2 = point2[1], point2[2]
-    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    parser = argparse.ArgumentParser(description="AI Virtual Mouse - control your mouse with hand gestures")
+    parser.add_argument('--source', default=None,
+                        help="Camera index, video file (.mp4) or .npy frame stack to replay "
+                             "(default: camera 0, falling back to camera 1)")
+    parser.add_argument('--fast', action='store_true',
+                        help="Replay recordings as fast as possible instead of at the recorded frame rate")
+    parser.add_argument('--record-trace', metavar='PATH', default=None,
+                        help="Record hand landmarks and finger states of every frame to a trace file")
+    parser.add_argument('--replay-trace', metavar='PATH', default=None,
+                        help="Replay a landmark trace through the gesture logic without hand detection")
+    parser.add_argument('--headless', action='store_true',
+                        help="Skip all overlays and the preview window; read q/k/v commands from stdin "
+                             "or signals (SIGINT/SIGTERM quit, SIGUSR1 keyboard, SIGUSR2 voice)")
+    parser.add_argument('--camera-size', default='640x480', metavar='WxH',
+                        help="Requested webcam resolution (default: 640x480)")
+    parser.add_argument('--inference-width', type=int, default=0, metavar='W',
+                        help="Run hand detection on a copy downscaled to W pixels wide "
+                             "(capture and display keep the full resolution)")
+    parser.add_argument('--roi', action='store_true',
+                        help="Run hand detection on a crop around the last known hand position")
+    parser.add_argument('--decimate', type=int, default=1, metavar='N',
+                        help="Run hand detection at most every N frames and predict landmarks in between")
+    parser.add_argument('--max-prediction-error', type=float, default=12.0, metavar='PX',
+                        help="Detect on every frame while mean landmark prediction error exceeds PX pixels")
+    parser.add_argument('--predictor', choices=['kalman', 'velocity'], default='kalman',
+                        help="Landmark motion model used with --decimate")
+    parser.add_argument('--swipe', action='store_true',
+                        help="Enable swipe typing on the virtual keyboard (pinch and drag across the letters)")
+    parser.add_argument('--lexicon', metavar='PATH', default=None,
+                        help="Word list for swipe typing, one word per line with an optional count "
+                             "(default: built-in common English words)")
+    parser.add_argument('--no-suggestions', action='store_true',
+                        help="Hide the word suggestion bar above the virtual keyboard")
+    parser.add_argument('--hands', type=int, choices=[1, 2], default=1,
+                        help="Number of hands tracked; with 2, the first hand in a cursor gesture moves "
+                             "the cursor and the other can click or scroll at the same time")
+    parser.add_argument('--dynamic-gestures', action='store_true',
+                        help="Recognize movement gestures of a hand with no cursor or scroll gesture: "
+                             "swipe left/right for back/forward, circles to switch apps, flicks up/down "
+                             "for page up/down")
+    parser.add_argument('--gesture-model', metavar='PATH', default=None,
+                        help="Recognize hand poses with a trained classifier (gesture_classifier.py) "
+                             "instead of the built-in finger rules; 'default' trains one on the built-in gestures")
+    parser.add_argument('--record-gestures', metavar='PATH', default=None,
+                        help="Add the pose of the hand on every frame to a sample file (.npz) under "
+                             "--gesture-label, for training a gesture model")
+    parser.add_argument('--gesture-label', metavar='NAME', default=None,
+                        help="Label of the samples recorded with --record-gestures (e.g. point, palm, "
+                             "or a new gesture name)")
+    parser.add_argument('--output-backend', choices=list(BACKENDS), default='pyautogui',
+                        help="How mouse and keyboard events are injected: pyautogui, xtest (Linux/X11, "
+                             "needs python-xlib), or null/record to discard them (benchmarks, no display)")
+    parser.add_argument('--smoothing', choices=list(SMOOTHERS), default='one_euro',
+                        help="Cursor smoothing filter: one_euro (adaptive, default), kalman, or ema "
+                             "(the classic EMA + moving average); also selectable in the settings window")
+    parser.add_argument('--predict-cursor', action='store_true',
+                        help="Lead the cursor ahead of the hand by the measured pipeline latency "
+                             "(damped by speed so it does not overshoot when the hand stops)")
+    parser.add_argument('--cursor-rate', type=float, default=120, metavar='HZ',
+                        help="Move the cursor HZ times per second, interpolating between camera frames "
+                             "(default: 120; 0 moves it once per frame)")
+    args = parser.parse_args(argv)
+    
+    try:
+        args.camera_width, args.camera_height = (int(value) for value in args.camera_size.lower().split('x'))
+    except ValueError:
+        parser.error(f"--camera-size must look like 1280x720, got '{args.camera_size}'")
+    if args.record_gestures and not args.gesture_label:
+        parser.error("--record-gestures needs a --gesture-label")
+    return args
 
 
-def main():
+def main(args=None):
     """
     Main function to run the AI Virtual Mouse application.
+    
+    Args:
+        args (argparse.Namespace): Options from parse_args() (defaults are used if None).
     """
+    if args is None:
+        args = parse_args([])
+    
     print("="*50)
     print("AI Virtual Mouse - Starting...")
     print("="*50)
     
-    # Initialize hand detector and mouse controller first
-    try:
-        print("\n[1/3] Initializing hand detector...")
-        detector = HandDetector(max_hands=1, detection_confidence=0.7, tracking_confidence=0.7)
-        print("✓ Hand detector initialized")
-    except Exception as e:
-        print(f"✗ Error initializing hand detector: {e}")
-        return
+    # Initialize hand detector and mouse output first
+    # (a landmark trace replaces hand detection entirely)
+    detector = None
+    array_detector = None
+    roi_detector = None
+    if args.replay_trace:
+        print("\n[1/3] Replaying landmark trace - hand detector not needed")
+    else:
+        try:
+            print("\n[1/3] Initializing hand detector...")
+            detector = HandDetector(max_hands=args.hands, detection_confidence=0.7, tracking_confidence=0.7)
+            # Landmarks are written into reusable arrays instead of per-frame tuple lists
+            detector = ArrayHandDetector(detector, max_hands=args.hands)
+            array_detector = detector
+            print("✓ Hand detector initialized")
+            
+            # Detect on a downscaled copy, report landmarks at full resolution
+            if args.inference_width > 0:
+                detector = ScaledHandDetector(detector, inference_width=args.inference_width)
+                print(f"✓ Inference resolution decoupled (detecting at {args.inference_width}px wide)")
+            
+            # Track a region of interest around the hand instead of searching the full frame
+            if args.roi:
+                detector = RoiHandDetector(detector)
+                roi_detector = detector
+                print("✓ ROI tracking enabled (full-frame search on loss)")
+            
+            # Skip detection on some frames and predict landmarks in between
+            if args.decimate > 1:
+                detector = DecimatingHandDetector(detector, interval=args.decimate,
+                                                  max_error=args.max_prediction_error,
+                                                  predictor=args.predictor)
+                print(f"✓ Inference decimation enabled (every {args.decimate} frames, {args.predictor} predictor)")
+            
+            if args.hands > 1 and detector is not array_detector:
+                print("⚠ --inference-width, --roi and --decimate track a single hand")
+        except Exception as e:
+            print(f"✗ Error initializing hand detector: {e}")
+            return
     
+    print("\n[2/3] Initializing mouse output...")
     try:
-        print("\n[2/3] Initializing mouse controller...")
-        mouse = MouseController(smoothing_factor=7)
-        print(f"✓ Mouse controller initialized (Screen: {mouse.screen_width}x{mouse.screen_height})")
+        output_backend = create_backend(args.output_backend)
+    except (ImportError, RuntimeError, OSError) as e:
+        print(f"✗ Output backend '{args.output_backend}' not available ({e}), using pyautogui")
+        output_backend = None
+    try:
+        if output_backend is None:
+            output_backend = PyAutoGuiBackend()
+        screen_width, screen_height = output_backend.screen_size()
+        print(f"✓ Mouse output initialized ({output_backend.name} backend, Screen: {screen_width}x{screen_height})")
     except Exception as e:
-        print(f"✗ Error initializing mouse controller: {e}")
+        print(f"✗ Error initializing mouse output: {e}")
         return
     
-    # Initialize settings GUI
-    try:
-        print("\n[2.25/3] Initializing settings GUI...")
-        settings_gui = SettingsGUI()
-        settings_gui.start()
-        print("✓ Settings GUI initialized")
-        print("  Note: Settings window will appear alongside the camera view")
-    except Exception as e:
-        print(f"✗ Warning: Could not initialize settings GUI: {e}")
-        print("  Settings GUI will not be available")
-        settings_gui = None
+    # All mouse actions and keystrokes run in order on one output thread,
+    # so the vision loop never waits for OS input injection
+    output_queue = OutputQueue()
+    output_queue.start()
+    
+    # Initialize settings GUI (skipped when headless - no windows at all)
+    settings_gui = None
+    if args.headless:
+        print("\n[2.25/3] Headless mode - settings GUI disabled")
+    else:
+        try:
+            print("\n[2.25/3] Initializing settings GUI...")
+            settings_gui = SettingsGUI(smoothing_filter=args.smoothing)
+            settings_gui.start()
+            print("✓ Settings GUI initialized")
+            print("  Note: Settings window will appear alongside the camera view")
+        except Exception as e:
+            print(f"✗ Warning: Could not initialize settings GUI: {e}")
+            print("  Settings GUI will not be available")
+            settings_gui = None
     
     # Initialize virtual keyboard
     try:
         print("\n[2.5/3] Initializing virtual keyboard...")
-        keyboard = VirtualKeyboard(frame_width=640, frame_height=480)
+        lexicon = None
+        predictor = None
+        if args.swipe or not args.no_suggestions:
+            lexicon = load_lexicon(args.lexicon)
+        if args.swipe:
+            print(f"✓ Swipe typing enabled ({len(lexicon)} words)")
+        if not args.no_suggestions:
+            predictor = WordPredictor(lexicon)
+        keyboard = VirtualKeyboard(frame_width=args.camera_width, frame_height=args.camera_height,
+                                   lexicon=lexicon if args.swipe else None, predictor=predictor,
+                                   output=output_queue, backend=output_backend)
         keyboard_visible = False  # Start with keyboard hidden
         print("✓ Virtual keyboard initialized")
     except Exception as e:
@@ -134,7 +285,7 @@ def main():
     # Initialize voice controller
     try:
         print("\n[2.75/3] Initializing voice controller...")
-        voice = VoiceController(callback=voice_callback)
+        voice = VoiceController(callback=voice_callback, output=output_queue, backend=output_backend)
         voice_active = False  # Start with voice control off
         print("✓ Voice controller initialized")
         print("  Note: Voice control is OFF by default")
@@ -146,35 +297,69 @@ def main():
         voice = None
         voice_active = False
     
-    # Initialize webcam
-    print("\n[3/3] Opening webcam...")
-    capture = cv2.VideoCapture(0)
-    
-    # Try alternative camera indices if 0 fails
-    if not capture.isOpened():
-        print("⚠ Camera 0 not available, trying camera 1...")
-        capture = cv2.VideoCapture(1)
-    
-    if not capture.isOpened():
-        print("✗ Error: Could not open webcam.")
-        print("Please check:")
-        print("  - Is your webcam connected?")
-        print("  - Is another application using the webcam?")
-        print("  - Do you have webcam permissions enabled?")
-        return
+    # Initialize frame source: webcam (read on a background thread, newest frame wins),
+    # a recording replayed through the same pipeline, or a landmark trace
+    capture = None
+    trace = None
     
-    # Set webcam properties
-    capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    # Frame-sized buffers are reused across frames; the pool counts any allocation
+    frame_pool = FramePool()
     
-    # Verify we can read a frame
-    ret, test_frame = capture.read()
-    if not ret or test_frame is None:
-        print("✗ Error: Webcam opened but cannot read frames.")
-        capture.release()
-        return
+    if args.replay_trace:
+        print(f"\n[3/3] Opening landmark trace {args.replay_trace}...")
+        try:
+            trace = TraceReplayer(args.replay_trace, realtime=not args.fast)
+        except (OSError, ValueError) as e:
+            print(f"✗ Error: Could not open landmark trace: {e}")
+            return
+        
+        if len(trace) == 0:
+            print("✗ Error: Landmark trace is empty.")
+            return
+        
+        source_width, source_height = trace.frame_size
+        replay_mode = "as fast as possible" if args.fast else "at recorded timing"
+        print(f"✓ Trace opened ({len(trace)} frames, {trace.duration:.1f}s), replaying {replay_mode}")
+    else:
+        capture = open_frame_source(args.source, realtime=not args.fast,
+                                    width=args.camera_width, height=args.camera_height,
+                                    pool=frame_pool)
+        
+        if capture.is_live:
+            print("\n[3/3] Opening webcam...")
+            if not capture.open():
+                print("✗ Error: Could not open webcam.")
+                print("Please check:")
+                print("  - Is your webcam connected?")
+                print("  - Is another application using the webcam?")
+                print("  - Do you have webcam permissions enabled?")
+                return
+            
+            # Verify we can read a frame
+            test_frame, lease = capture.acquire()
+            if test_frame is None:
+                print("✗ Error: Webcam opened but cannot read frames.")
+                capture.release()
+                return
+            
+            source_height, source_width = test_frame.shape[:2]
+            capture.release_frame(lease)
+            print(f"✓ Webcam opened successfully ({source_width}x{source_height})")
+        else:
+            print(f"\n[3/3] Opening recording {args.source}...")
+            if not capture.open():
+                return
+            
+            source_width, source_height = capture.frame_size
+            replay_mode = "as fast as possible" if args.fast else f"at {capture.fps:.1f} fps"
+            print(f"✓ Recording opened ({source_width}x{source_height}), replaying {replay_mode}")
+    
+    # The camera may not honour the requested size - lay the keyboard out for the real one
+    if (keyboard.frame_width, keyboard.frame_height) != (source_width, source_height):
+        keyboard = VirtualKeyboard(frame_width=source_width, frame_height=source_height,
+                                   lexicon=lexicon if args.swipe else None, predictor=predictor,
+                                   output=output_queue, backend=output_backend)
     
-    print(f"✓ Webcam opened successfully ({test_frame.shape[1]}x{test_frame.shape[0]})")
     print("\n" + "="*50)
     print("READY! Webcam window will open now...")
     print("="*50)
@@ -182,34 +367,59 @@ def main():
     # Variables for FPS calculation
     prev_time = 0
     
-    # Variables for click detection
-    left_click_performed = False
-    right_click_performed = False
-    double_click_performed = False
-    click_cooldown_time = 0.5  # Cooldown period in seconds to prevent multiple clicks
-    last_left_click_time = 0
-    last_right_click_time = 0
-    last_double_click_time = 0
-    
     # Variables for click visual feedback
-    show_left_click_feedback = False
-    show_right_click_feedback = False
-    left_click_feedback_time = 0
-    right_click_feedback_time = 0
+    left_click_feedback_time = np.full(args.hands, -np.inf)  # Per hand slot
+    right_click_feedback_time = np.full(args.hands, -np.inf)
     click_feedback_duration = 0.5  # Duration to show click feedback in seconds
     
-    # Variables for scroll detection
-    scroll_mode_active = False
-    prev_hand_y = None  # Track previous hand position for scroll detection
-    scroll_threshold = 15  # Minimum vertical movement to trigger scroll
-    scroll_sensitivity = 1  # Scroll speed multiplier
+    # Pixel thresholds and padding were tuned on 640px wide frames - scale them
+    # so gestures feel the same at any capture resolution
+    pixel_scale = source_width / 640.0
     
     # Distance threshold for finger-thumb proximity
-    click_distance_threshold = 30
+    click_distance_threshold = 30 * pixel_scale
+    
+    # Click, double click and scroll detection (cooldowns, click latches, scroll reference)
+    gesture_engine = GestureEngine(click_distance=click_distance_threshold,
+                                   scroll_threshold=15 * pixel_scale,  # Minimum vertical movement to scroll
+                                   scroll_sensitivity=1,  # Scroll speed multiplier
+                                   click_cooldown=0.5,  # Prevents multiple clicks
+                                   max_hands=args.hands)
+    
+    # Stable IDs for the hands in view (each keeps its own gesture state);
+    # a single tracked hand always continues its track, however fast it moves
+    hand_tracks = HandTracks(max_hands=args.hands,
+                             max_distance=150 * pixel_scale if args.hands > 1 else np.inf)
+    cursor_track = None  # Track ID of the hand that moved the cursor last
+    
+    # Movement gestures (swipes, circles, flicks), one recognizer per hand slot
+    dynamic_recognizers = None
+    if args.dynamic_gestures:
+        dynamic_recognizers = [DynamicGestureRecognizer() for _ in range(args.hands)]
+        print(f"✓ Dynamic gestures enabled ({', '.join(DYNAMIC_ACTIONS)})")
+    dynamic_feedback = [None] * args.hands  # Per hand slot: (gesture name, time recognized)
+    
+    # Learned hand poses in place of the built-in finger rules
+    gesture_classifier = None
+    if args.gesture_model:
+        try:
+            if args.gesture_model == 'default':
+                gesture_classifier = default_classifier()
+            else:
+                gesture_classifier = GestureClassifier.load(args.gesture_model)
+            print(f"✓ Gesture model loaded ({len(gesture_classifier.points)} samples: "
+                  f"{', '.join(gesture_classifier.names)})")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"✗ Warning: Could not load gesture model: {e}")
+            print("  Using the built-in finger rules")
+    gesture_sample_recorder = None
+    if args.record_gestures:
+        gesture_sample_recorder = SampleRecorder(args.record_gestures, args.gesture_label)
+        print(f"✓ Recording '{args.gesture_label}' samples to {args.record_gestures}")
     
     # Frame dimensions (will be updated when first frame is captured)
-    frame_width = 640
-    frame_height = 480
+    frame_width = source_width
+    frame_height = source_height
     
     print("  - Pinky finger up (only): Scroll Mode")
     print("  - All fingers up (Open Palm): Alternative Scroll Mode")
@@ -234,118 +444,340 @@ def main():
     print("  - Changes apply in real-time!")
     print("\nPress 'q' to quit.")
     
-    while True:
-        # Capture frame from webcam
-        success, frame = capture.read()
+    # Overlays and the preview window are skipped entirely in headless mode
+    overlay = Overlay(enabled=not args.headless)
+    headless_controls = None
+    if args.headless:
+        headless_controls = HeadlessControls()
+        print("\nHeadless mode: no preview window or overlays")
+        print("  - Type q / k / v and press Enter to quit / toggle keyboard / toggle voice")
+        print("  - Or send SIGTERM (quit), SIGUSR1 (keyboard), SIGUSR2 (voice)")
+    
+    # ==================== PIPELINE SETUP ====================
+    # Capture (ThreadedCapture) -> Inference -> Render (this thread) -> Actuation
+    # Frames are dropped oldest-first when a stage falls behind; mouse actions never are.
+    
+    # Inference stage: newest camera frame -> mirrored frame + hand landmarks
+    def run_inference():
+        # Lease the frame buffer from the source; it goes back once the frame is rendered
+        frame, lease = capture.acquire()
         
         # Handle case where frame capture fails
-        if not success or frame is None:
-            print("Warning: Failed to capture frame from webcam.")
-            continue
+        if frame is None:
+            if not capture.is_live and not capture.isOpened():
+                # End of the recording
+                raise StopIteration
+            if capture.is_live:
+                print("Warning: Failed to capture frame from webcam.")
+            return None
         
-        # Update frame dimensions
-        frame_height, frame_width, _ = frame.shape
+        read_time = time.perf_counter()
         
-        # Flip frame horizontally for mirror effect (more intuitive)
-        frame = cv2.flip(frame, 1)
+        # Detect on the unmirrored camera buffer (no flip copy) and drawn landmarks
+        # are mirrored together with the frame when it is displayed
+        try:
+            if detector is array_detector:
+                hands = detector.findLandmarks(frame, draw=overlay.enabled)
+            else:
+                detector.findHands(frame, draw=overlay.enabled)
+                landmark_list = detector.findPosition(frame, hand_number=0)
+        except Exception:
+            capture.release_frame(lease)
+            raise
         
-        # Draw futuristic rectangle border for active detection area
-        # Get dynamic padding from settings GUI (if available)
+        # Mirror the landmarks instead of the frame (more intuitive, like a mirror)
+        if detector is array_detector:
+            # In place in the landmark buffer; the packet gets a view, not a copy
+            hands.mirror()
+            landmarks = hands.pixels[:len(hands)]
+            fingers = hands.fingers()
+        else:
+            frame_width = frame.shape[1]
+            landmark_list = [(lm_id, frame_width - 1 - x, y) for lm_id, x, y in landmark_list]
+            landmarks = np.array([[(x, y) for _, x, y in landmark_list]], dtype=np.int32).reshape(-1, 21, 2)
+            # Same finger rule as the array path, whichever wrapper produced the landmarks
+            fingers = fingers_up(landmarks)
+        
+        if trace_recorder:
+            # Traces hold one hand
+            trace_recorder.record(capture.frame_timestamp, capture.frame_id,
+                                  landmarks[0] if len(landmarks) > 0 else None,
+                                  fingers[0] if len(landmarks) > 0 else [],
+                                  (frame.shape[1], frame.shape[0]))
+        
+        return FramePacket(frame, capture.frame_timestamp, capture.frame_id, fingers=fingers,
+                           landmarks=landmarks, read_time=read_time, mirror=True,
+                           release=lambda: capture.release_frame(lease))
+    
+    # Trace replay stage: recorded landmarks on a blank canvas, no hand detection
+    # Canvases rotate so the render thread never draws on one being cleared
+    if trace is not None:
+        trace_width, trace_height = trace.frame_size
+        canvases = [frame_pool.acquire((trace_height, trace_width, 3)) for _ in range(5)]
+        for canvas in canvases:
+            canvas.fill(0)
+    
+    def run_trace_replay():
+        record = trace.next_record()
+        if record is None:
+            raise StopIteration
+        
+        read_time = time.perf_counter()
+        canvas = canvases[int(trace.index) % len(canvases)]
+        if overlay.enabled:
+            canvas.fill(0)
+        
+        # The packet gets views of the memory-mapped record
+        hand_present = bool(record['hand_present'])
+        return FramePacket(canvas, float(record['timestamp']), int(record['frame_id']),
+                           fingers=record['fingers'][None] if hand_present else None,
+                           landmarks=record['landmarks'][None] if hand_present else None,
+                           read_time=read_time)
+    
+    # Optional landmark trace recording (written by the inference stage)
+    trace_recorder = None
+    if args.record_trace and trace is None:
+        try:
+            trace_recorder = TraceRecorder(args.record_trace)
+            print(f"✓ Recording landmark trace to {args.record_trace}")
+        except OSError as e:
+            print(f"✗ Warning: Could not create landmark trace: {e}")
+    
+    # A live camera drops stale frames; a recording must deliver every frame
+    is_live = trace is None and capture.is_live
+    packet_policy = BoundedQueue.DROP_OLDEST if is_live else BoundedQueue.BLOCK
+    # Dropped packets hand their frame buffer straight back to the source
+    packet_queue = BoundedQueue(maxsize=2, policy=packet_policy, on_drop=lambda dropped: dropped.release())
+    
+    if trace is not None:
+        inference_stage = Stage("trace-replay", run_trace_replay, outbox=packet_queue)
+    else:
+        inference_stage = Stage("inference", run_inference, outbox=packet_queue)
+    
+    # Gesture logic talks to the output queue instead of the OS directly
+    mouse_actions = QueuedMouse(output_queue, output_backend)
+    
+    # Cursor targets are smoothed once per frame (higher factor = smoother but slower)
+    cursor_smoother = create_smoother(args.smoothing, smoothing_factor=7)
+    
+    # Fixed-rate cursor: the actuator interpolates between the smoothed targets,
+    # so the cursor moves at cursor_rate Hz, not the camera rate
+    cursor_actuator = None
+    if args.cursor_rate > 0:
+        cursor_actuator = CursorActuator(mouse_actions.moveTo, rate_hz=args.cursor_rate)
+        cursor_actuator.start()
+        print(f"✓ Cursor actuator running at {args.cursor_rate:.0f} Hz")
+    
+    # Optional latency compensation between the smoother and the cursor
+    cursor_predictor = LatencyCompensator() if args.predict_cursor else None
+    if cursor_predictor is not None:
+        print("✓ Cursor latency compensation enabled")
+    
+    def move_cursor(screen_x, screen_y, packet):
+        """
+        Move the cursor towards a screen position from the current frame.
+        """
+        nonlocal cursor_smoother
+        timestamp = packet.timestamp
+        
+        # Follow the filter and smoothing factor chosen in the settings GUI
         if settings_gui:
-            border_padding = settings_gui.get_mouse_sensitivity()
+            if settings_gui.get_smoothing_filter() != cursor_smoother.name:
+                cursor_smoother = create_smoother(settings_gui.get_smoothing_filter())
+            cursor_smoother.smoothing_factor = settings_gui.get_smoothing_factor()
+        
+        smoothed_x, smoothed_y = cursor_smoother.smooth(screen_x, screen_y, timestamp)
+        
+        if cursor_predictor is not None:
+            # Live frames: capture to now. Recordings have no real capture time, so only
+            # the time since the frame left the source counts.
+            if is_live:
+                cursor_predictor.measure_latency(timestamp, time.time())
+            else:
+                cursor_predictor.measure_latency(packet.read_time, time.perf_counter())
+            smoothed_x, smoothed_y = cursor_predictor.predict(smoothed_x, smoothed_y, timestamp)
+        if cursor_actuator is None:
+            mouse_actions.moveTo(smoothed_x, smoothed_y)
         else:
-            border_padding = 150
+            cursor_actuator.update(smoothed_x, smoothed_y, timestamp)
+    
+    # Per-frame latency and throughput, reported on exit
+    latency_stats = LatencyStats()
+    
+    inference_stage.start()
+    
+    def draw_hud(canvas, border_padding, settings_text):
+        """
+        Draw the static HUD: detection area border, help text, settings and watermark.
+        """
+        frame_height, frame_width = canvas.shape[:2]
         
+        # Draw futuristic rectangle border for active detection area
         border_color = (0, 255, 255)  # Cyan color for futuristic look
         border_thickness = 3
         corner_length = 30  # Length of corner decorations
         
         # Draw main rectangle
-        cv2.rectangle(frame, 
+        cv2.rectangle(canvas, 
                      (border_padding, border_padding), 
                      (frame_width - border_padding, frame_height - border_padding), 
                      border_color, border_thickness)
         
         # Draw futuristic corner decorations (L-shaped corners)
         # Top-left corner
-        cv2.line(frame, (border_padding - 10, border_padding), 
+        cv2.line(canvas, (border_padding - 10, border_padding), 
                 (border_padding + corner_length, border_padding), border_color, border_thickness + 2)
-        cv2.line(frame, (border_padding, border_padding - 10), 
+        cv2.line(canvas, (border_padding, border_padding - 10), 
                 (border_padding, border_padding + corner_length), border_color, border_thickness + 2)
         
         # Top-right corner
-        cv2.line(frame, (frame_width - border_padding + 10, border_padding), 
+        cv2.line(canvas, (frame_width - border_padding + 10, border_padding), 
                 (frame_width - border_padding - corner_length, border_padding), border_color, border_thickness + 2)
-        cv2.line(frame, (frame_width - border_padding, border_padding - 10), 
+        cv2.line(canvas, (frame_width - border_padding, border_padding - 10), 
                 (frame_width - border_padding, border_padding + corner_length), border_color, border_thickness + 2)
         
         # Bottom-left corner
-        cv2.line(frame, (border_padding - 10, frame_height - border_padding), 
+        cv2.line(canvas, (border_padding - 10, frame_height - border_padding), 
                 (border_padding + corner_length, frame_height - border_padding), border_color, border_thickness + 2)
-        cv2.line(frame, (border_padding, frame_height - border_padding + 10), 
+        cv2.line(canvas, (border_padding, frame_height - border_padding + 10), 
                 (border_padding, frame_height - border_padding - corner_length), border_color, border_thickness + 2)
         
         # Bottom-right corner
-        cv2.line(frame, (frame_width - border_padding + 10, frame_height - border_padding), 
+        cv2.line(canvas, (frame_width - border_padding + 10, frame_height - border_padding), 
                 (frame_width - border_padding - corner_length, frame_height - border_padding), border_color, border_thickness + 2)
-        cv2.line(frame, (frame_width - border_padding, frame_height - border_padding + 10), 
+        cv2.line(canvas, (frame_width - border_padding, frame_height - border_padding + 10), 
                 (frame_width - border_padding, frame_height - border_padding - corner_length), border_color, border_thickness + 2)
         
         # Add label for detection area
-        cv2.putText(frame, "ACTIVE DETECTION AREA", 
+        cv2.putText(canvas, "ACTIVE DETECTION AREA", 
                    (border_padding + 10, border_padding - 15), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, border_color, 1)
         
-        # Detect hands and draw landmarks
-        frame = detector.findHands(frame, draw=True)
+        # Display control instructions on the frame
+        cv2.putText(canvas, "Press 'q' to quit", (10, 60), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        
+        # Display current settings from GUI (if available)
+        if settings_text:
+            cv2.putText(canvas, settings_text, (10, 90), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 255, 255), 1)
+        
+        # Add permanent watermark - Developer credit
+        watermark_text = "Developed by [ANUBHAV YADAV(B. tech)]"
+        font = cv2.FONT_HERSHEY_COMPLEX
+        font_scale = 0.45
+        font_thickness = 1
+        color = (0, 0, 255)  # Red color in BGR format
+        
+        # Get text size to position it at bottom-right
+        text_size = cv2.getTextSize(watermark_text, font, font_scale, font_thickness)[0]
+        text_x = frame_width - text_size[0] - 10  # 10px padding from right edge
+        text_y = frame_height - 10  # 10px padding from bottom
+        
+        # Add semi-transparent background for better visibility
+        box = canvas[max(0, text_y - text_size[1] - 5):text_y + 6, 
+                     max(0, text_x - 5):text_x + text_size[0] + 6]
+        cv2.addWeighted(box, 0.7, box, 0, 0, dst=box)
+        
+        # Draw the watermark text
+        cv2.putText(canvas, watermark_text, (text_x, text_y), 
+                   font, font_scale, color, font_thickness, cv2.LINE_AA)
+    
+    # Static HUD, re-rendered only when the padding, settings or frame size change
+    hud_layer = HudLayer(draw_hud)
+    
+    # Frames rendered so far; allocations after the warm-up are reported on exit
+    frames_rendered = 0
+    warmup_frames = 30
+    
+    while True:
+        # Get the newest processed frame from the inference stage
+        packet = packet_queue.get(timeout=1.0)
+        if packet is None:
+            if packet_queue.is_finished():
+                print("✓ End of recording reached")
+                break
+            continue
+        
+        # Mirror for display straight into a pooled buffer, which frees the camera buffer
+        # right away. Headless runs never display the frame, so it is not flipped at all.
+        display_buffer = None
+        if packet.mirror and overlay.enabled:
+            display_buffer = frame_pool.acquire(packet.frame.shape, packet.frame.dtype)
+            cv2.flip(packet.frame, 1, dst=display_buffer)
+            packet.release()
+            frame = display_buffer
+        else:
+            frame = packet.frame
+        
+        # Update frame dimensions
+        frame_height, frame_width, _ = frame.shape
+        
+        # Set when a cursor gesture moves the cursor this frame
+        cursor_moving = False
+        
+        # Active detection area (drawn as part of the cached HUD layer)
+        # Get dynamic padding from settings GUI (if available)
+        if settings_gui:
+            border_padding = int(settings_gui.get_mouse_sensitivity() * pixel_scale)
+        else:
+            border_padding = int(150 * pixel_scale)
         
-        # Find hand landmarks
-        landmark_list = detector.findPosition(frame, hand_number=0)
+        # Hand landmarks found by the inference stage, (hands, 21, 2) pixels
+        hands = packet.landmarks
         
         # Check if hand is detected
-        if len(landmark_list) > 0:
-            # Get finger status (which fingers are up)
-            fingers = detector.fingersUp(landmark_list)
+        if len(hands) > 0:
+            # Use the capture time so cooldowns follow the camera, not the render thread
+            current_time = packet.timestamp
             
-            # Debug: Display finger states
-            finger_names = ['Thumb', 'Index', 'Middle', 'Ring', 'Pinky']
-            debug_text = ' | '.join([f"{name}: {fingers[i]}" for i, name in enumerate(finger_names)])
-            cv2.putText(frame, debug_text, (10, frame_height - 20), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            # Stable track per hand; a new track starts with fresh click and scroll state
+            slots, track_ids, new_tracks = hand_tracks.update(hands, current_time)
+            hands = hands[:len(slots)]
+            gesture_engine.reset(slots[new_tracks])
+            if dynamic_recognizers is not None:
+                for slot in slots[new_tracks]:
+                    dynamic_recognizers[slot].reset()
             
-            # Extract key landmark positions
-            # Landmark 4: Thumb tip
-            # Landmark 8: Index finger tip
-            # Landmark 12: Middle finger tip
-            # Landmark 20: Pinky finger tip
-            # Landmark 0: Wrist (base of palm)
-            thumb_tip = landmark_list[4]
-            index_finger_tip = landmark_list[8]
-            middle_finger_tip = landmark_list[12]
-            ring_finger_tip = landmark_list[16]
-            ring_finger_pip = landmark_list[14]  # PIP joint for ring finger
-            pinky_tip = landmark_list[20]
-            wrist = landmark_list[0]  # Wrist position for tracking hand movement
-            ring_finger_tip = landmark_list[16]
-            ring_finger_pip = landmark_list[14]  # PIP joint for ring finger
+            # Finger states from the detector, or from the learned poses (poses the
+            # model does not know keep the detector's finger states)
+            hand_fingers = packet.fingers[:len(slots)]
+            if gesture_classifier is not None:
+                pose_classes = gesture_classifier.predict(hands)
+                hand_fingers = gesture_classifier.fingers(pose_classes, hand_fingers)
             
-            # Calculate distances for gesture detection
-            dist_index_thumb = calculate_distance(index_finger_tip, thumb_tip)
-            dist_middle_thumb = calculate_distance(middle_finger_tip, thumb_tip)
+            # Evaluate the gestures of all hands at once (see gesture_engine.py)
+            gestures = gesture_engine.process_hands(hands, current_time, hand_fingers, slots)
             
-            # Check if ring finger is folded (tip below PIP joint)
-            ring_finger_folded = ring_finger_tip[2] > ring_finger_pip[2]
+            # The oldest hand in a cursor mode drives the cursor (and the keyboard);
+            # any other hand can still click and scroll
+            order = np.argsort(track_ids)
+            cursor_hands = order[gestures['cursor_mode'][order] != CURSOR_NONE]
+            primary = cursor_hands[0] if len(cursor_hands) > 0 else order[0]
+            landmarks = hands[primary]
+            fingers = gestures['fingers'][primary]
+            dist_index_thumb = float(gestures['index_thumb'][primary])
+            if gesture_sample_recorder is not None:
+                gesture_sample_recorder.record(landmarks)
             
-            current_time = time.time()
+            # Debug: Display finger states
+            if overlay.enabled:
+                finger_names = ['Thumb', 'Index', 'Middle', 'Ring', 'Pinky']
+                debug_text = ' | '.join([f"{name}: {fingers[i]}" for i, name in enumerate(finger_names)])
+                overlay.putText(frame, debug_text, (10, frame_height - 20), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                if gesture_classifier is not None:
+                    overlay.putText(frame, f"Pose: {gesture_classifier.label(pose_classes[primary])}",
+                               (10, frame_height - 45), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
             
             # Get dynamic padding from settings GUI (if available)
             # Default to 150 if settings GUI is not available
             if settings_gui:
-                padding_value = settings_gui.get_mouse_sensitivity()
+                padding_value = int(settings_gui.get_mouse_sensitivity() * pixel_scale)
             else:
-                padding_value = 150
+                padding_value = int(150 * pixel_scale)
             
-            # Define padding for coordinate mapping (used in both Mode 1 and Mode 2)
+            # Define padding for coordinate mapping (used in both cursor modes)
             # Larger padding = smaller camera area maps to full screen
             # Adjust these values: Higher = easier to reach screen edges
             padding_left = padding_value
@@ -353,239 +785,219 @@ def main():
             padding_top = padding_value
             padding_bottom = padding_value
             
-            # Mode 1: Only Index finger is up -> Move mouse
-            if fingers[1] == 1 and fingers[2] == 0:  # Index up, Middle down
-                # Get index finger tip position
-                x, y = index_finger_tip[1], index_finger_tip[2]
-                
-                # Update mouse controller smoothing factor from settings GUI
-                if settings_gui:
-                    mouse.smoothing_factor = settings_gui.get_smoothing_factor()
+            for rank, hand in enumerate(order):
+                gesture = gestures[hand]
+                slot = slots[hand]
+                events = gesture['events']
+                dist_middle_thumb = float(gesture['middle_thumb'])
+                x, y = int(gesture['cursor'][0]), int(gesture['cursor'][1])
+                # Status text of further hands goes below the first one's
+                text_offset = 90 * rank
                 
-                screen_x = np.interp(x, [padding_left, frame_width - padding_right], 
-                    [0, mouse.screen_width])
-                screen_y = np.interp(y, [padding_top, frame_height - padding_bottom], 
-                    [0, mouse.screen_height])
-                
-                # Move the cursor
-                mouse.moveCursor(screen_x, screen_y)
-                
-                # Check if we should show click feedback (red color)
-                if show_left_click_feedback and (current_time - left_click_feedback_time < click_feedback_duration):
-                    # Draw RED circle when clicked
-                    cv2.circle(frame, (x, y), 20, (0, 0, 255), cv2.FILLED)
-                    cv2.circle(frame, (x, y), 25, (0, 0, 255), 3)
+                # Mode 1 (index up, middle down) follows the index tip, Mode 2 (middle up)
+                # the middle tip
+                if hand == primary and gesture['cursor_mode'] != CURSOR_NONE:
+                    if track_ids[hand] != cursor_track:
+                        # Another hand took over - do not smooth across the jump
+                        cursor_smoother.reset()
+                        if cursor_predictor is not None:
+                            cursor_predictor.reset()
+                        cursor_track = track_ids[hand]
                     
-                    # Display "CLICKED" text in the center of screen
-                    text = "CLICKED!"
-                    text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 2, 3)[0]
-                    text_x = (frame_width - text_size[0]) // 2
-                    text_y = (frame_height + text_size[1]) // 2
-                    cv2.putText(frame, text, (text_x, text_y), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
-                else:
-                    # Draw GREEN circle for normal move mode
-                    cv2.circle(frame, (x, y), 15, (0, 255, 0), cv2.FILLED)
+                    screen_x = np.interp(x, [padding_left, frame_width - padding_right], 
+                        [0, screen_width])
+                    screen_y = np.interp(y, [padding_top, frame_height - padding_bottom], 
+                        [0, screen_height])
+                    
+                    # Move the cursor
+                    move_cursor(screen_x, screen_y, packet)
+                    cursor_moving = True
                 
-                # Display cursor mode indicator
-                cv2.putText(frame, "MOVE MODE", (10, 120), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                if events & EVENT_LEFT_CLICK:
+                    mouse_actions.click(button='left')
+                    print(f"✓ LEFT CLICK! Index-Thumb distance: {int(gesture['index_thumb'])}px")
+                    left_click_feedback_time[slot] = current_time
+                if events & EVENT_RIGHT_CLICK:
+                    mouse_actions.click(button='right')
+                    print(f"✓ RIGHT CLICK! Middle-Thumb distance: {int(dist_middle_thumb)}px")
+                    right_click_feedback_time[slot] = current_time
                 
-                # Check for LEFT CLICK gesture (Index + Thumb close)
-                if dist_index_thumb < click_distance_threshold:
-                    if not left_click_performed and (current_time - last_left_click_time > click_cooldown_time):
-                        mouse.click(button='left')
-                        print(f"✓ LEFT CLICK! Index-Thumb distance: {int(dist_index_thumb)}px")
-                        left_click_performed = True
-                        last_left_click_time = current_time
+                if gesture['cursor_mode'] == CURSOR_MOVE:
+                    # Check if we should show click feedback (red color)
+                    if current_time - left_click_feedback_time[slot] < click_feedback_duration:
+                        # Draw RED circle when clicked
+                        overlay.circle(frame, (x, y), 20, (0, 0, 255), cv2.FILLED)
+                        overlay.circle(frame, (x, y), 25, (0, 0, 255), 3)
                         
-                        # Activate click visual feedback
-                        show_left_click_feedback = True
-                        left_click_feedback_time = current_time
-                else:
-                    left_click_performed = False
-                    # Disable feedback when fingers separate
-                    if current_time - left_click_feedback_time > click_feedback_duration:
-                        show_left_click_feedback = False
-                
-                # Display distance for debugging
-                cv2.putText(frame, f"Index-Thumb: {int(dist_index_thumb)}px", (10, 180), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-            
-            # Mode 2: Middle finger is up -> Check for RIGHT CLICK
-            elif fingers[2] == 1:  # Middle finger up
-                # Get middle finger tip position for cursor tracking
-                x, y = middle_finger_tip[1], middle_finger_tip[2]
-                
-                # Update mouse controller smoothing factor from settings GUI
-                if settings_gui:
-                    mouse.smoothing_factor = settings_gui.get_smoothing_factor()
-                
-                # Map webcam coordinates to screen coordinates
-                screen_x = np.interp(x, [padding_left, frame_width - padding_right], 
-                    [0, mouse.screen_width])
-                screen_y = np.interp(y, [padding_top, frame_height - padding_bottom], 
-                    [0, mouse.screen_height])
-                
-                # Move the cursor
-                mouse.moveCursor(screen_x, screen_y)
-                
-                # Check if we should show click feedback (red color)
-                if show_right_click_feedback and (current_time - right_click_feedback_time < click_feedback_duration):
-                    # Draw RED circle when clicked
-                    cv2.circle(frame, (x, y), 20, (0, 0, 255), cv2.FILLED)
-                    cv2.circle(frame, (x, y), 25, (0, 0, 255), 3)
+                        # Display "CLICKED" text in the center of screen
+                        text = "CLICKED!"
+                        text_size = overlay.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 2, 3)[0]
+                        text_x = (frame_width - text_size[0]) // 2
+                        text_y = (frame_height + text_size[1]) // 2
+                        overlay.putText(frame, text, (text_x, text_y), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
+                    else:
+                        # Draw GREEN circle for normal move mode
+                        overlay.circle(frame, (x, y), 15, (0, 255, 0), cv2.FILLED)
                     
-                    # Display "CLICKED" text in the center of screen
-                    text = "RIGHT CLICKED!"
-                    text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 2, 3)[0]
-                    text_x = (frame_width - text_size[0]) // 2
-                    text_y = (frame_height + text_size[1]) // 2
-                    cv2.putText(frame, text, (text_x, text_y), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
-                else:
-                    # Draw ORANGE circle for right click mode
-                    cv2.circle(frame, (x, y), 15, (255, 165, 0), cv2.FILLED)
-                
-                # Display mode indicator
-                cv2.putText(frame, "RIGHT CLICK MODE", (10, 120), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
+                    # Display cursor mode indicator
+                    overlay.putText(frame, "MOVE MODE", (10, 120 + text_offset), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    
+                    # Display distance for debugging
+                    overlay.putText(frame, f"Index-Thumb: {int(gesture['index_thumb'])}px", (10, 180 + text_offset), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                 
-                # Check for RIGHT CLICK gesture (Middle + Thumb close)
-                if dist_middle_thumb < click_distance_threshold:
-                    if not right_click_performed and (current_time - last_right_click_time > click_cooldown_time):
-                        mouse.click(button='right')
-                        print(f"✓ RIGHT CLICK! Middle-Thumb distance: {int(dist_middle_thumb)}px")
-                        right_click_performed = True
-                        last_right_click_time = current_time
+                elif gesture['cursor_mode'] == CURSOR_RIGHT_CLICK:
+                    # Check if we should show click feedback (red color)
+                    if current_time - right_click_feedback_time[slot] < click_feedback_duration:
+                        # Draw RED circle when clicked
+                        overlay.circle(frame, (x, y), 20, (0, 0, 255), cv2.FILLED)
+                        overlay.circle(frame, (x, y), 25, (0, 0, 255), 3)
                         
-                        # Activate click visual feedback
-                        show_right_click_feedback = True
-                        right_click_feedback_time = current_time
-                else:
-                    right_click_performed = False
-                    # Disable feedback when fingers separate
-                    if current_time - right_click_feedback_time > click_feedback_duration:
-                        show_right_click_feedback = False
+                        # Display "CLICKED" text in the center of screen
+                        text = "RIGHT CLICKED!"
+                        text_size = overlay.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 2, 3)[0]
+                        text_x = (frame_width - text_size[0]) // 2
+                        text_y = (frame_height + text_size[1]) // 2
+                        overlay.putText(frame, text, (text_x, text_y), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
+                    else:
+                        # Draw ORANGE circle for right click mode
+                        overlay.circle(frame, (x, y), 15, (255, 165, 0), cv2.FILLED)
+                    
+                    # Display mode indicator
+                    overlay.putText(frame, "RIGHT CLICK MODE", (10, 120 + text_offset), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
+                    
+                    # Display distance for debugging
+                    overlay.putText(frame, f"Middle-Thumb: {int(dist_middle_thumb)}px", (10, 180 + text_offset), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                 
-                # Display distance for debugging
-                cv2.putText(frame, f"Middle-Thumb: {int(dist_middle_thumb)}px", (10, 180), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-            
-            # Mode 3: Check for DOUBLE CLICK gesture (Ring finger folded)
-            if ring_finger_folded and fingers[1] == 1:  # Ring folded and index up
-                if not double_click_performed and (current_time - last_double_click_time > click_cooldown_time):
-                    mouse.doubleClick()
+                # Mode 3: DOUBLE CLICK gesture (Ring finger folded while index is up)
+                if events & EVENT_DOUBLE_CLICK:
+                    mouse_actions.doubleClick()
                     print(f"✓ DOUBLE CLICK! Ring finger folded")
-                    double_click_performed = True
-                    last_double_click_time = current_time
                     
                     # Visual feedback
-                    cv2.putText(frame, "DOUBLE CLICK!", (frame_width // 2 - 100, frame_height // 2), 
+                    overlay.putText(frame, "DOUBLE CLICK!", (frame_width // 2 - 100, frame_height // 2), 
                                cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 0, 255), 3)
-            else:
-                if not ring_finger_folded:
-                    double_click_performed = False
-            
-            # Mode 4: SCROLL MODE - Pinky finger up (only) or All fingers up (Open Palm)
-            # Check for Pinky Only mode (recommended - more precise)
-            pinky_only_mode = fingers[4] == 1 and fingers[1] == 0 and fingers[2] == 0 and fingers[3] == 0
-            
-            # Check for Open Palm mode (all fingers up)
-            open_palm_mode = all(fingers)
-            
-            if pinky_only_mode or open_palm_mode:
-                scroll_mode_active = True
-                
-                # Get current hand position (using wrist as reference point)
-                current_hand_y = wrist[2]
-                
-                # Visual feedback for scroll mode
-                mode_text = "SCROLL MODE (Pinky)" if pinky_only_mode else "SCROLL MODE (Palm)"
-                cv2.putText(frame, mode_text, (10, 120), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-                
-                # Draw indicator circle on pinky or palm center
-                indicator_x = pinky_tip[1] if pinky_only_mode else wrist[1]
-                indicator_y = pinky_tip[2] if pinky_only_mode else wrist[2]
-                cv2.circle(frame, (indicator_x, indicator_y), 15, (255, 0, 255), cv2.FILLED)
                 
-                # If we have a previous position, calculate movement and scroll
-                if prev_hand_y is not None:
-                    # Calculate vertical movement (delta_y)
-                    delta_y = prev_hand_y - current_hand_y
+                # Mode 4: SCROLL MODE - Pinky finger up (only) or All fingers up (Open Palm)
+                if gesture['scroll_mode'] != SCROLL_NONE:
+                    pinky_only_mode = gesture['scroll_mode'] == SCROLL_PINKY
                     
-                    # Only scroll if movement exceeds threshold
-                    if abs(delta_y) > scroll_threshold:
-                        # Calculate scroll amount (positive = scroll up, negative = scroll down)
-                        scroll_amount = int((delta_y / scroll_threshold) * scroll_sensitivity)
-                        
-                        # Perform scroll
-                        mouse.scroll(scroll_amount)
+                    # Visual feedback for scroll mode
+                    mode_text = "SCROLL MODE (Pinky)" if pinky_only_mode else "SCROLL MODE (Palm)"
+                    overlay.putText(frame, mode_text, (10, 120 + text_offset), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
+                    
+                    # Draw indicator circle on pinky or palm center
+                    indicator = hands[hand][PINKY_TIP] if pinky_only_mode else hands[hand][WRIST]
+                    overlay.circle(frame, (int(indicator[0]), int(indicator[1])), 15, (255, 0, 255), cv2.FILLED)
+                    
+                    if events & EVENT_SCROLL:
+                        # Positive = scroll up, negative = scroll down
+                        scroll_amount = int(gesture['scroll'])
+                        delta_y = float(gesture['scroll_delta'])
+                        mouse_actions.scroll(scroll_amount)
                         
                         # Visual feedback with direction arrow
                         scroll_direction = "UP ↑" if delta_y > 0 else "DOWN ↓"
-                        cv2.putText(frame, f"SCROLLING {scroll_direction}", (10, 150), 
+                        overlay.putText(frame, f"SCROLLING {scroll_direction}", (10, 150 + text_offset), 
                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
                         
                         print(f"✓ SCROLL {scroll_direction}: {scroll_amount} units (delta: {int(delta_y)}px)")
                 
-                # Update previous hand position
-                prev_hand_y = current_hand_y
-            else:
-                # Reset scroll mode
-                scroll_mode_active = False
-                prev_hand_y = None
+                # Mode 5: DYNAMIC GESTURES - movements of a hand that is not moving the
+                # cursor or scrolling, so pointing never triggers a swipe
+                if dynamic_recognizers is not None:
+                    recognizer = dynamic_recognizers[slot]
+                    if gesture['cursor_mode'] == CURSOR_NONE and gesture['scroll_mode'] == SCROLL_NONE:
+                        dynamic_gesture = recognizer.update(hands[hand], current_time)
+                        if dynamic_gesture is not None:
+                            keys = DYNAMIC_ACTIONS.get(dynamic_gesture)
+                            if keys:
+                                mouse_actions.hotkey(*keys)
+                            print(f"✓ {dynamic_gesture.upper()}: {'+'.join(keys or ())}")
+                            dynamic_feedback[slot] = (dynamic_gesture, current_time)
+                    else:
+                        recognizer.reset()
+                    
+                    if dynamic_feedback[slot] is not None and \
+                            current_time - dynamic_feedback[slot][1] < click_feedback_duration:
+                        overlay.putText(frame, dynamic_feedback[slot][0].replace('_', ' ').upper(),
+                                   (10, 150 + text_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 255), 2)
         
         else:
             # No hand detected - display message
-            cv2.putText(frame, "No hand detected", (10, 90), 
+            overlay.putText(frame, "No hand detected", (10, 90), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
         
+        # Without a cursor gesture the actuator must not keep moving the cursor,
+        # and the next gesture starts a fresh prediction
+        if not cursor_moving:
+            if cursor_actuator is not None:
+                cursor_actuator.hold()
+            if cursor_predictor is not None:
+                cursor_predictor.reset()
+        
         # Virtual Keyboard Overlay and Interaction
         if keyboard_visible:
             # Draw keyboard on frame
-            frame = keyboard.draw_keyboard(frame)
+            if overlay.enabled:
+                frame = keyboard.draw_keyboard(frame)
             
             # Check for keyboard interaction if hand is detected
-            if len(landmark_list) > 0:
+            if len(hands) > 0 and fingers[1] == 1:  # Index finger is up
                 # Get current cursor position in frame coordinates
                 # Use index finger tip for keyboard interaction
-                if fingers[1] == 1:  # Index finger is up
-                    cursor_x = index_finger_tip[1]
-                    cursor_y = index_finger_tip[2]
-                    
-                    # Check hover on keyboard
+                cursor_x = int(landmarks[INDEX_TIP][0])
+                cursor_y = int(landmarks[INDEX_TIP][1])
+                pinched = dist_index_thumb < click_distance_threshold
+                
+                # Check hover on keyboard (not while a swipe is being drawn)
+                if not keyboard.swipe_path:
                     hovered_key, hover_progress = keyboard.check_hover(cursor_x, cursor_y)
                     
-                    if hovered_key:
+                    if hovered_key and overlay.enabled:
                         # Draw hover indicator
                         frame = keyboard.draw_hover_indicator(frame, hovered_key, hover_progress)
-                    
+                
+                if keyboard.swipe_enabled:
+                    # Pinch and drag across the letters to type a word
+                    keyboard.update_swipe(cursor_x, cursor_y, pinched)
+                elif pinched:
                     # Check for click gesture on keyboard
-                    if dist_index_thumb < click_distance_threshold:
-                        if not left_click_performed:
-                            # Perform keyboard click instead of mouse click
-                            clicked_key = keyboard.handle_click(cursor_x, cursor_y)
+                    if not gesture_engine.left_click_performed(slots[primary]):
+                        # Perform keyboard click instead of mouse click
+                        clicked_key = keyboard.handle_click(cursor_x, cursor_y)
+            elif keyboard.swipe_path:
+                # Hand lost or index finger down - finish the swipe
+                keyboard.end_swipe()
+            
+            if overlay.enabled:
+                frame = keyboard.draw_swipe_path(frame)
             
             # Show last typed key
-            frame = keyboard.get_typed_text_display(frame)
+            if overlay.enabled:
+                frame = keyboard.get_typed_text_display(frame)
             
             # Display keyboard mode indicator
-            cv2.putText(frame, "KEYBOARD MODE (Press 'k' to hide)", (10, frame_height - 40), 
+            overlay.putText(frame, "KEYBOARD MODE (Press 'k' to hide)", (10, frame_height - 40), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
         
         # Display voice control status
         if voice and voice_active:
-            cv2.putText(frame, "VOICE: ON", (frame_width - 150, 30), 
+            overlay.putText(frame, "VOICE: ON", (frame_width - 150, 30), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
             
             # Display last voice command for 3 seconds
             if voice_last_command and (time.time() - voice_command_time < 3.0):
-                cv2.putText(frame, f"Voice: {voice_last_command}", (10, frame_height - 70), 
+                overlay.putText(frame, f"Voice: {voice_last_command}", (10, frame_height - 70), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
         elif voice:
-            cv2.putText(frame, "VOICE: OFF", (frame_width - 150, 30), 
+            overlay.putText(frame, "VOICE: OFF", (frame_width - 150, 30), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 2)
         
         # Calculate and display FPS
@@ -593,48 +1005,36 @@ def main():
         fps = 1 / (current_time - prev_time) if (current_time - prev_time) > 0 else 0
         prev_time = current_time
         
-        cv2.putText(frame, f"FPS: {int(fps)}", (10, 30), 
+        overlay.putText(frame, f"FPS: {int(fps)}", (10, 30), 
                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
         
-        # Display control instructions on the frame
-        cv2.putText(frame, "Press 'q' to quit", (10, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        
-        # Display current settings from GUI (if available)
-        if settings_gui:
-            settings_text = f"Smoothing: {settings_gui.get_smoothing_factor()} | Sensitivity: {settings_gui.get_mouse_sensitivity()}px"
-            cv2.putText(frame, settings_text, (10, 90), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 255, 255), 1)
-        
-        # Add permanent watermark - Developer credit
-        watermark_text = "Developed by [ANUBHAV YADAV(B. tech)]"
-        font = cv2.FONT_HERSHEY_COMPLEX
-        font_scale = 0.45
-        font_thickness = 1
-        color = (0, 0, 255)  # Red color in BGR format
-        
-        # Get text size to position it at bottom-right
-        text_size = cv2.getTextSize(watermark_text, font, font_scale, font_thickness)[0]
-        text_x = frame_width - text_size[0] - 10  # 10px padding from right edge
-        text_y = frame_height - 10  # 10px padding from bottom
+        # Border, help text, settings and watermark only change with the settings,
+        # so they come from the cached HUD layer in one compositing step
+        if overlay.enabled:
+            settings_text = None
+            if settings_gui:
+                settings_text = f"Smoothing: {settings_gui.get_smoothing_filter()} {settings_gui.get_smoothing_factor()} | Sensitivity: {settings_gui.get_mouse_sensitivity()}px"
+            hud_layer.render(frame, border_padding, settings_text)
+            
+            # Show the frame
+            cv2.imshow("AI Virtual Mouse", frame)
         
-        # Add semi-transparent background for better visibility
-        overlay = frame.copy()
-        cv2.rectangle(overlay, 
-                     (text_x - 5, text_y - text_size[1] - 5), 
-                     (text_x + text_size[0] + 5, text_y + 5), 
-                     (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+        latency_stats.record(packet)
         
-        # Draw the watermark text
-        cv2.putText(frame, watermark_text, (text_x, text_y), 
-                   font, font_scale, color, font_thickness, cv2.LINE_AA)
+        # Hand the buffers back for the next frames
+        packet.release()
+        if display_buffer is not None:
+            frame_pool.release(display_buffer)
         
-        # Show the frame
-        cv2.imshow("AI Virtual Mouse", frame)
+        frames_rendered += 1
+        if frames_rendered == warmup_frames:
+            frame_pool.mark_steady_state()
         
-        # Check for keyboard input
-        key_press = cv2.waitKey(1) & 0xFF
+        # Check for keyboard input (stdin/signals when running headless)
+        if headless_controls:
+            key_press = headless_controls.poll()
+        else:
+            key_press = cv2.waitKey(1) & 0xFF
         
         if key_press == ord('q'):
             print("Exiting AI Virtual Mouse...")
@@ -655,6 +1055,69 @@ def main():
             else:
                 print("✗ Voice control not available (install: pip install SpeechRecognition pyaudio)")
     
+    # Stop the pipeline: no new frames, then let queued mouse actions and keystrokes finish
+    inference_stage.stop()
+    if cursor_actuator is not None:
+        cursor_actuator.stop()
+    output_queue.stop()
+    output_backend.close()
+    
+    stage_stats = inference_stage.get_stats()
+    print(f"Stage '{inference_stage.name}': {stage_stats['processed']} items, avg {stage_stats['avg_ms']:.1f}ms")
+    print(f"Frames dropped between inference and render: {packet_queue.dropped}")
+    
+    output_stats = output_queue.get_stats()
+    print(f"Output: {output_stats['executed']} actions ({output_stats['coalesced']} moves merged), "
+          f"max queue depth {output_stats['max_depth']}")
+    for kind, latency in sorted(output_stats['latency'].items()):
+        print(f"  {kind}: {latency['count']} x, latency avg {latency['avg_ms']:.1f}ms, max {latency['max_ms']:.1f}ms, "
+              f"injection avg {latency['avg_run_ms']:.2f}ms")
+    
+    gesture_stats = gesture_engine.get_stats()
+    print(f"Gestures: {gesture_stats['frames']} hand frames, {gesture_stats['left_click']} left / "
+          f"{gesture_stats['right_click']} right / {gesture_stats['double_click']} double clicks, "
+          f"{gesture_stats['scroll']} scrolls")
+    if args.hands > 1:
+        track_stats = hand_tracks.get_stats()
+        print(f"Hand tracks: {track_stats['tracks_started']} started over {track_stats['frames']} hand frames")
+    if gesture_classifier is not None:
+        classifier_stats = gesture_classifier.get_stats()
+        print(f"Gesture model: {classifier_stats['hands']} hands classified, "
+              f"{classifier_stats['avg_us']:.0f}µs per frame")
+    if dynamic_recognizers is not None:
+        dynamic_stats = [recognizer.get_stats() for recognizer in dynamic_recognizers]
+        dynamic_frames = sum(stats['frames'] for stats in dynamic_stats)
+        dynamic_cells = sum(stats['avg_cells'] * stats['frames'] for stats in dynamic_stats)
+        print(f"Dynamic gestures: {sum(stats['matches'] for stats in dynamic_stats)} recognized over "
+              f"{dynamic_frames} hand frames, {dynamic_cells / max(dynamic_frames, 1):.0f} DTW cells per frame")
+    
+    if cursor_predictor is not None:
+        prediction_stats = cursor_predictor.get_stats()
+        print(f"Cursor prediction: latency {prediction_stats['latency_ms']:.0f}ms, "
+              f"lead avg {prediction_stats['avg_lead_px']:.1f}px, max {prediction_stats['max_lead_px']:.0f}px")
+    
+    if cursor_actuator is not None:
+        actuator_stats = cursor_actuator.get_stats()
+        print(f"Cursor actuator: {actuator_stats['achieved_hz']:.0f}/{actuator_stats['rate_hz']:.0f} Hz, "
+              f"{actuator_stats['moves']} moves for {actuator_stats['updates']} targets "
+              f"({actuator_stats['extrapolated_moves']} extrapolated), {actuator_stats['late_ticks']} late ticks")
+    
+    if args.decimate > 1 and detector is not None:
+        decimation_stats = detector.get_stats()
+        print(f"Decimation: detection on {decimation_stats['detections']}/{decimation_stats['frames']} frames "
+              f"({decimation_stats['decimation_ratio'] * 100:.0f}%), prediction error "
+              f"avg {decimation_stats['avg_error_px']:.1f}px, max {decimation_stats['max_error_px']:.1f}px")
+    
+    if roi_detector is not None:
+        roi_stats = roi_detector.get_stats()
+        print(f"ROI tracking: {roi_stats['roi_frames']} cropped / {roi_stats['full_searches']} full-frame searches, "
+              f"{roi_stats['losses']} losses, avg {roi_stats['avg_area_fraction'] * 100:.0f}% of frame processed")
+    
+    summary = latency_stats.summary()
+    print(f"Throughput: {summary['frames']} frames at {summary['fps']:.1f} fps | "
+          f"Latency: mean {summary['mean_ms']:.1f}ms, p50 {summary['p50_ms']:.1f}ms, "
+          f"p95 {summary['p95_ms']:.1f}ms, max {summary['max_ms']:.1f}ms")
+    
     # Release resources
     if voice and voice_active:
         print("Stopping voice control...")
@@ -664,9 +1127,37 @@ def main():
         print("Closing settings GUI...")
         settings_gui.stop()
     
-    capture.release()
-    cv2.destroyAllWindows()
+    if predictor:
+        predictor.save()
+    
+    if trace_recorder:
+        trace_recorder.close()
+        print(f"✓ Saved {trace_recorder.records_written} frames to landmark trace {args.record_trace}")
+    
+    if gesture_sample_recorder is not None:
+        recorded = len(gesture_sample_recorder.samples)
+        try:
+            total = gesture_sample_recorder.save()
+            print(f"✓ Saved {recorded} '{args.gesture_label}' samples to {args.record_gestures} ({total} in total)")
+        except OSError as e:
+            print(f"✗ Could not save gesture samples: {e}")
+    
+    pool_stats = frame_pool.get_stats()
+    steady_allocations = pool_stats['steady_state_allocations']
+    print(f"Frame buffers: {pool_stats['allocations']} allocated ({pool_stats['allocated_mb']:.1f}MB), "
+          f"{steady_allocations if steady_allocations is not None else 'n/a'} after warm-up")
+    
+    if capture:
+        stats = capture.get_stats()
+        print(f"Capture: {stats['captured']} frames captured, {stats['read']} processed, "
+              f"{stats['dropped']} dropped (avg frame age: {stats['avg_age_ms']:.1f}ms)")
+        capture.release()
+    
+    if headless_controls:
+        headless_controls.close()
+    else:
+        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
@@ -0,0 +1,349 @@
+"""
+Output Backends Module
+Interchangeable ways of injecting mouse and keyboard events into the OS.
+
+Every mouse action and keystroke goes through an OutputBackend (usually on
+the output queue's worker thread):
+
+- PyAutoGuiBackend: the portable default. Calls pyautogui with _pause=False,
+  so the 0.1s pyautogui.PAUSE sleep is not paid after every event.
+- XTestBackend: Linux/X11 only. Sends events straight to the X server with
+  the XTEST extension (requires python-xlib), skipping pyautogui's
+  per-call argument handling and failsafe checks.
+- NullBackend: does nothing. Lets the whole pipeline run and be benchmarked
+  without a display or any real input.
+- RecordingBackend: a NullBackend that keeps a timestamped log of the events,
+  for checking what the gesture logic would have done.
+
+Key names follow pyautogui ('space', 'enter', 'backspace', 'tab', 'esc',
+'left', 'right', or a single character).
+"""
+
+import time
+from collections import deque
+
+
+class OutputBackend:
+    """
+    Interface of an input-injection backend.
+    """
+
+    name = 'base'
+
+    def screen_size(self):
+        """
+        Get the screen size.
+
+        Returns:
+            tuple: (width, height) in pixels.
+        """
+        raise NotImplementedError
+
+    def move_to(self, x, y):
+        """Move the cursor to screen coordinates (x, y)."""
+        raise NotImplementedError
+
+    def click(self, button='left'):
+        """Click a mouse button ('left', 'right' or 'middle')."""
+        raise NotImplementedError
+
+    def double_click(self):
+        """Double click the left mouse button."""
+        raise NotImplementedError
+
+    def scroll(self, amount):
+        """Scroll by the given number of units (positive is up)."""
+        raise NotImplementedError
+
+    def press(self, key):
+        """Press and release a key."""
+        raise NotImplementedError
+
+    def hotkey(self, *keys):
+        """Press keys together (in order) and release them in reverse order."""
+        raise NotImplementedError
+
+    def type_text(self, text):
+        """Type a string."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the backend's resources."""
+
+
+class PyAutoGuiBackend(OutputBackend):
+    """
+    Events through pyautogui, without its pause after every call.
+    """
+
+    name = 'pyautogui'
+
+    def __init__(self):
+        """
+        Initialize the PyAutoGuiBackend.
+        """
+        import pyautogui
+        self.pyautogui = pyautogui
+
+    def screen_size(self):
+        width, height = self.pyautogui.size()
+        return int(width), int(height)
+
+    def move_to(self, x, y):
+        self.pyautogui.moveTo(int(round(x)), int(round(y)), _pause=False)
+
+    def click(self, button='left'):
+        self.pyautogui.click(button=button, _pause=False)
+
+    def double_click(self):
+        self.pyautogui.doubleClick(_pause=False)
+
+    def scroll(self, amount):
+        self.pyautogui.scroll(int(amount), _pause=False)
+
+    def press(self, key):
+        self.pyautogui.press(key, _pause=False)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys, _pause=False)
+
+    def type_text(self, text):
+        self.pyautogui.typewrite(text, _pause=False)
+
+
+class XTestBackend(OutputBackend):
+    """
+    Events sent directly to the X server with the XTEST extension.
+    """
+
+    name = 'xtest'
+
+    # X buttons: 4/5 are one scroll step up/down
+    BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+    SCROLL_UP = 4
+    SCROLL_DOWN = 5
+
+    # pyautogui key names -> X keysym names
+    KEY_NAMES = {
+        'space': 'space', 'enter': 'Return', 'return': 'Return', '\n': 'Return',
+        'backspace': 'BackSpace', 'tab': 'Tab', '\t': 'Tab', 'esc': 'Escape',
+        'escape': 'Escape', 'left': 'Left', 'right': 'Right', 'up': 'Up',
+        'down': 'Down', 'delete': 'Delete', 'home': 'Home', 'end': 'End',
+        'pageup': 'Prior', 'pagedown': 'Next', 'alt': 'Alt_L', 'shift': 'Shift_L',
+        'ctrl': 'Control_L', 'win': 'Super_L',
+    }
+
+    def __init__(self, display_name=None):
+        """
+        Initialize the XTestBackend.
+
+        Args:
+            display_name (str): X display to connect to; None uses $DISPLAY.
+
+        Raises:
+            ImportError: If python-xlib is not installed.
+            RuntimeError: If no X server can be reached (e.g. $DISPLAY is unset)
+                or it has no XTEST extension.
+        """
+        from Xlib import X, XK, display
+        from Xlib.error import DisplayError
+        from Xlib.ext import xtest
+
+        self.X = X
+        self.XK = XK
+        self.xtest = xtest
+        try:
+            self.display = display.Display(display_name)
+        except DisplayError as e:
+            raise RuntimeError(f"Cannot connect to the X server: {e}") from e
+        if not self.display.has_extension('XTEST'):
+            self.display.close()
+            raise RuntimeError("X server has no XTEST extension")
+
+        self.shift_keycode = self.display.keysym_to_keycode(XK.string_to_keysym('Shift_L'))
+        self.keycodes = {}  # Keysym -> (keycode, needs shift)
+
+    def screen_size(self):
+        screen = self.display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+    def move_to(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=int(round(x)), y=int(round(y)))
+        self.display.sync()
+
+    def _button(self, button, sync=True):
+        self.xtest.fake_input(self.display, self.X.ButtonPress, button)
+        self.xtest.fake_input(self.display, self.X.ButtonRelease, button)
+        if sync:
+            self.display.sync()
+
+    def click(self, button='left'):
+        self._button(self.BUTTONS[button])
+
+    def double_click(self):
+        self._button(self.BUTTONS['left'])
+        self._button(self.BUTTONS['left'])
+
+    def scroll(self, amount):
+        button = self.SCROLL_UP if amount > 0 else self.SCROLL_DOWN
+        for _ in range(abs(int(amount))):
+            self._button(button, sync=False)
+        self.display.sync()
+
+    def _keysym(self, key):
+        """
+        Get the X keysym for a pyautogui key name or character.
+        """
+        name = self.KEY_NAMES.get(key)
+        if name is None and len(key) > 1:
+            name = key
+        if name is not None:
+            keysym = self.XK.string_to_keysym(name)
+        else:
+            # Latin-1 characters have keysyms equal to their code points
+            keysym = ord(key)
+        if not keysym:
+            raise ValueError(f"Unknown key: {key}")
+        return keysym
+
+    def _keycode(self, keysym):
+        """
+        Get the keycode for a keysym and whether it needs shift (cached).
+        """
+        cached = self.keycodes.get(keysym)
+        if cached is None:
+            keycode = self.display.keysym_to_keycode(keysym)
+            if not keycode:
+                raise ValueError(f"No key on this keyboard mapping produces keysym {keysym:#x}")
+            # Keysyms in the second column of the keyboard mapping need shift
+            needs_shift = self.display.keycode_to_keysym(keycode, 0) != keysym
+            cached = self.keycodes[keysym] = (keycode, needs_shift)
+        return cached
+
+    def _tap(self, keysym):
+        keycode, needs_shift = self._keycode(keysym)
+        if needs_shift:
+            self.xtest.fake_input(self.display, self.X.KeyPress, self.shift_keycode)
+        self.xtest.fake_input(self.display, self.X.KeyPress, keycode)
+        self.xtest.fake_input(self.display, self.X.KeyRelease, keycode)
+        if needs_shift:
+            self.xtest.fake_input(self.display, self.X.KeyRelease, self.shift_keycode)
+
+    def press(self, key):
+        self._tap(self._keysym(key))
+        self.display.sync()
+
+    def hotkey(self, *keys):
+        keycodes = [self._keycode(self._keysym(key))[0] for key in keys]
+        for keycode in keycodes:
+            self.xtest.fake_input(self.display, self.X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            self.xtest.fake_input(self.display, self.X.KeyRelease, keycode)
+        self.display.sync()
+
+    def type_text(self, text):
+        # All key events of the text go out in one round trip
+        for character in text:
+            self._tap(self._keysym(character))
+        self.display.sync()
+
+    def close(self):
+        self.display.close()
+
+
+class NullBackend(OutputBackend):
+    """
+    Discards every event (for benchmarks and runs without a display).
+    """
+
+    name = 'null'
+
+    def __init__(self, screen_width=1920, screen_height=1080):
+        """
+        Initialize the NullBackend.
+
+        Args:
+            screen_width (int): Screen width to report.
+            screen_height (int): Screen height to report.
+        """
+        self.width = screen_width
+        self.height = screen_height
+        self.events = 0
+
+    def screen_size(self):
+        return self.width, self.height
+
+    def _event(self, name, *args):
+        self.events += 1
+
+    def move_to(self, x, y):
+        self._event('move_to', x, y)
+
+    def click(self, button='left'):
+        self._event('click', button)
+
+    def double_click(self):
+        self._event('double_click')
+
+    def scroll(self, amount):
+        self._event('scroll', amount)
+
+    def press(self, key):
+        self._event('press', key)
+
+    def hotkey(self, *keys):
+        self._event('hotkey', *keys)
+
+    def type_text(self, text):
+        self._event('type_text', text)
+
+
+class RecordingBackend(NullBackend):
+    """
+    Discards every event but keeps a log of them.
+    """
+
+    name = 'record'
+
+    def __init__(self, screen_width=1920, screen_height=1080, max_events=100000):
+        """
+        Initialize the RecordingBackend.
+
+        Args:
+            screen_width (int): Screen width to report.
+            screen_height (int): Screen height to report.
+            max_events (int): Maximum number of events kept (the oldest are dropped).
+        """
+        super().__init__(screen_width, screen_height)
+        self.log = deque(maxlen=max_events)  # (perf_counter time, event name, args)
+
+    def _event(self, name, *args):
+        self.events += 1
+        self.log.append((time.perf_counter(), name, args))
+
+
+BACKENDS = {
+    'pyautogui': PyAutoGuiBackend,
+    'xtest': XTestBackend,
+    'null': NullBackend,
+    'record': RecordingBackend,
+}
+
+
+def create_backend(name='pyautogui'):
+    """
+    Create an output backend by name.
+
+    Args:
+        name (str): One of BACKENDS.
+
+    Returns:
+        OutputBackend: The backend.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError, RuntimeError: If the backend cannot run here (see XTestBackend).
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown output backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -0,0 +1,193 @@
+"""
+Output Queue Module
+One ordered worker thread for every mouse action and keystroke.
+
+Injecting input into the OS (pyautogui and friends) can take milliseconds
+per call, and typing text takes much longer. Producers - the gesture loop,
+the virtual keyboard and voice control - only submit requests to the
+OutputQueue and return immediately; a single worker thread performs them in
+submission order, so a click never overtakes the move before it.
+
+Cursor moves are coalesced: a move submitted while the previous request is
+still a queued move replaces its target, since only the newest position
+matters. The queue reports its depth, the latency of every action kind
+(from submission to completion) and how long the action itself ran, which
+is the injection cost of the output backend (see output_backends.py).
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class OutputQueue:
+    """
+    An ordered queue of output actions executed on a dedicated worker thread.
+    """
+
+    def __init__(self, name="output"):
+        """
+        Initialize the OutputQueue.
+
+        Args:
+            name (str): Name of the worker thread (for logs and stats).
+        """
+        self.name = name
+        self.items = deque()  # [kind, function, args, kwargs, submit_time, coalesce]
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = None
+
+        # Statistics
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency = {}  # kind -> [count, total seconds, max seconds, total run seconds]
+
+    def start(self):
+        """
+        Start the worker thread.
+        """
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def submit(self, kind, function, *args, coalesce=False, **kwargs):
+        """
+        Queue an action. Never blocks.
+
+        Args:
+            kind (str): Action kind for statistics, e.g. 'move', 'click', 'type'.
+            function (function): Called as function(*args, **kwargs) on the worker thread.
+            coalesce (bool): Replace the last queued action instead of adding a new one
+                if it is of the same kind and also coalescable (used for cursor moves).
+
+        Returns:
+            bool: True if the action was queued, False if the queue is closed.
+        """
+        now = time.perf_counter()
+        with self.condition:
+            if self.closed:
+                return False
+            self.submitted += 1
+
+            if coalesce and self.items:
+                last = self.items[-1]
+                if last[0] == kind and last[5]:
+                    # Keep the original submit time so latency covers the whole wait
+                    last[1], last[2], last[3] = function, args, kwargs
+                    self.coalesced += 1
+                    return True
+
+            self.items.append([kind, function, args, kwargs, now, coalesce])
+            self.max_depth = max(self.max_depth, len(self.items))
+            self.condition.notify()
+        return True
+
+    def __len__(self):
+        with self.condition:
+            return len(self.items)
+
+    def _run(self):
+        """
+        Worker loop: perform queued actions in order until closed and drained.
+        """
+        while True:
+            with self.condition:
+                while not self.items and not self.closed:
+                    self.condition.wait()
+                if not self.items:
+                    break
+                kind, function, args, kwargs, submit_time, _ = self.items.popleft()
+
+            run_start = time.perf_counter()
+            try:
+                function(*args, **kwargs)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠ Output action '{kind}' failed: {e}")
+
+            done = time.perf_counter()
+            elapsed = done - submit_time
+            with self.condition:
+                self.executed += 1
+                stats = self.latency.setdefault(kind, [0, 0.0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+                stats[3] += done - run_start
+
+    def stop(self, timeout=2):
+        """
+        Stop accepting actions, let the queued ones finish and stop the worker.
+
+        Args:
+            timeout (float): Maximum time to wait for the queue to drain.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+
+    def get_stats(self):
+        """
+        Get queue statistics.
+
+        Returns:
+            dict: Current and maximum depth, counts, and per-kind latency
+                ({kind: {'count', 'avg_ms', 'max_ms', 'avg_run_ms'}}).
+        """
+        with self.condition:
+            return {
+                'depth': len(self.items),
+                'max_depth': self.max_depth,
+                'submitted': self.submitted,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'latency': {kind: {'count': count,
+                                   'avg_ms': total / count * 1000.0 if count else 0.0,
+                                   'max_ms': worst * 1000.0,
+                                   'avg_run_ms': run / count * 1000.0 if count else 0.0}
+                            for kind, (count, total, worst, run) in self.latency.items()},
+            }
+
+
+class QueuedMouse:
+    """
+    Mouse actions submitted to an OutputQueue and performed by an output
+    backend, so no input injection runs on the vision thread.
+    """
+
+    def __init__(self, output, backend):
+        """
+        Initialize the QueuedMouse.
+
+        Args:
+            output (OutputQueue): The queue that performs the actions.
+            backend (OutputBackend): The backend that injects the events.
+        """
+        self.output = output
+        self.backend = backend
+
+    def moveTo(self, x, y):
+        """Queue a cursor move to screen coordinates (x, y); pending moves are merged."""
+        self.output.submit('move', self.backend.move_to, x, y, coalesce=True)
+
+    def click(self, button='left'):
+        """Queue a mouse click."""
+        self.output.submit('click', self.backend.click, button=button)
+
+    def doubleClick(self):
+        """Queue a double click."""
+        self.output.submit('double_click', self.backend.double_click)
+
+    def scroll(self, amount):
+        """Queue a scroll by the given number of units."""
+        self.output.submit('scroll', self.backend.scroll, amount)
+
+    def hotkey(self, *keys):
+        """Queue a key combination (e.g. 'alt', 'left')."""
+        self.output.submit('hotkey', self.backend.hotkey, *keys)
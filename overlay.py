@@ -0,0 +1,148 @@
+"""
+Overlay Module
+Drawing helpers for the on-screen preview overlays.
+
+Overlay mirrors the OpenCV drawing calls used by the main loop. In headless
+mode it is created disabled and every call becomes a no-op, so the loop
+skips all drawing work without sprinkling checks around each call.
+
+HudLayer caches the parts of the overlay that only change with the settings
+(detection area border, help text, watermark). They are rendered once into a
+sparse colour/alpha layer and composited with vectorized numpy operations per
+frame (one write of the opaque pixels plus a blend of the few semi-transparent
+boxes) instead of a few dozen OpenCV calls.
+"""
+
+import cv2
+import numpy as np
+
+
+class Overlay:
+    """
+    A switchable wrapper around the OpenCV drawing functions.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Initialize the Overlay.
+
+        Args:
+            enabled (bool): Draw overlays if True, skip all drawing if False.
+        """
+        self.enabled = enabled
+
+    def putText(self, frame, *args, **kwargs):
+        """Draw text (see cv2.putText)."""
+        if self.enabled:
+            cv2.putText(frame, *args, **kwargs)
+
+    def circle(self, frame, *args, **kwargs):
+        """Draw a circle (see cv2.circle)."""
+        if self.enabled:
+            cv2.circle(frame, *args, **kwargs)
+
+    def rectangle(self, frame, *args, **kwargs):
+        """Draw a rectangle (see cv2.rectangle)."""
+        if self.enabled:
+            cv2.rectangle(frame, *args, **kwargs)
+
+    def line(self, frame, *args, **kwargs):
+        """Draw a line (see cv2.line)."""
+        if self.enabled:
+            cv2.line(frame, *args, **kwargs)
+
+    def getTextSize(self, text, font_face, font_scale, thickness):
+        """
+        Measure text (see cv2.getTextSize).
+
+        Returns:
+            tuple: ((width, height), baseline), all zero when disabled.
+        """
+        if self.enabled:
+            return cv2.getTextSize(text, font_face, font_scale, thickness)
+        return (0, 0), 0
+
+
+class HudLayer:
+    """
+    A pre-rendered overlay layer that is rebuilt only when its parameters change.
+    """
+
+    def __init__(self, draw_function):
+        """
+        Initialize the HudLayer.
+
+        Args:
+            draw_function (function): Called as draw_function(canvas, *params) to draw
+                the layer with ordinary OpenCV calls. It must only depend on params
+                and the canvas size, and may blend with the canvas (e.g. to darken a box).
+        """
+        self.draw_function = draw_function
+        self.key = None
+
+        # Opaque elements of the flattened frame (just written) and the boxes
+        # around semi-transparent parts, as (x0, y0, x1, y1, keep, added)
+        self.opaque_indices = None
+        self.opaque_values = None
+        self.blend_regions = []
+
+        # Statistics
+        self.builds = 0
+
+    def _build(self, shape, dtype, params):
+        """
+        Render the layer over a black and a white canvas and derive its colour and alpha.
+
+        Any drawing that is linear in the background (opaque shapes, anti-aliased
+        text, addWeighted) gives out = background * keep / 255 + added, so the two
+        renders determine keep and added.
+        """
+        black = np.zeros(shape, dtype=dtype)
+        white = np.full(shape, 255, dtype=dtype)
+        self.draw_function(black, *params)
+        self.draw_function(white, *params)
+
+        keep = np.clip(white.astype(np.int16) - black.astype(np.int16), 0, 255).astype(np.uint8)
+
+        # Opaque elements are written straight into the frame
+        opaque = keep.reshape(-1) == 0
+        self.opaque_indices = np.flatnonzero(opaque)
+        self.opaque_values = black.reshape(-1)[opaque]
+
+        # Semi-transparent parts (darkened boxes, anti-aliased edges) are blended
+        # densely over the bounding box of each blob, a handful per layer
+        blended = np.any((keep > 0) & (keep < 255), axis=2).astype(np.uint8)
+        blended = cv2.dilate(blended, np.ones((15, 15), dtype=np.uint8))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(blended)
+
+        self.blend_regions = []
+        for label in range(1, count):
+            x0, y0, width, height = stats[label, :4]
+            x1, y1 = x0 + width, y0 + height
+            self.blend_regions.append((x0, y0, x1, y1,
+                                       keep[y0:y1, x0:x1].copy(), black[y0:y1, x0:x1].copy()))
+        self.builds += 1
+
+    def render(self, frame, *params):
+        """
+        Composite the layer onto the frame in place, rebuilding it if needed.
+
+        Args:
+            frame (numpy.ndarray): A contiguous BGR frame.
+            *params: Everything the drawing depends on (e.g. padding, settings text).
+
+        Returns:
+            numpy.ndarray: The frame.
+        """
+        key = (frame.shape, params)
+        if key != self.key:
+            self._build(frame.shape, frame.dtype, params)
+            self.key = key
+
+        for x0, y0, x1, y1, keep, added in self.blend_regions:
+            region = frame[y0:y1, x0:x1]
+            cv2.multiply(region, keep, dst=region, scale=1.0 / 255)
+            cv2.add(region, added, dst=region)
+
+        frame.reshape(-1)[self.opaque_indices] = self.opaque_values
+        return frame
@@ -0,0 +1,356 @@
+"""
+Pipeline Module
+Bounded queues and worker stages used to run capture, inference and
+rendering concurrently instead of back to back on one thread (mouse and
+keyboard output has its own worker, see output_queue.py).
+
+Each stage owns a worker thread and talks to its neighbours through a
+BoundedQueue. The queue's policy decides what happens when a stage falls
+behind: a live camera uses DROP_OLDEST (a newer frame always beats an old
+one), recordings use BLOCK (every frame must be processed).
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class BoundedQueue:
+    """
+    A thread-safe FIFO queue with a fixed capacity and an overflow policy.
+    """
+
+    DROP_OLDEST = 'drop_oldest'  # Discard the oldest item to make room
+    BLOCK = 'block'              # Make the producer wait for room
+
+    def __init__(self, maxsize=2, policy=DROP_OLDEST, on_drop=None):
+        """
+        Initialize the BoundedQueue.
+
+        Args:
+            maxsize (int): Maximum number of queued items.
+            policy (str): BoundedQueue.DROP_OLDEST or BoundedQueue.BLOCK.
+            on_drop (function): Optional callback invoked with each dropped item.
+        """
+        if policy not in (self.DROP_OLDEST, self.BLOCK):
+            raise ValueError(f"Unknown queue policy: {policy}")
+
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.on_drop = on_drop
+        self.items = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Statistics
+        self.put_count = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item, timeout=None):
+        """
+        Add an item, applying the overflow policy if the queue is full.
+
+        Args:
+            item: The item to enqueue.
+            timeout (float): For BLOCK queues, maximum time to wait for room.
+
+        Returns:
+            bool: True if the item was queued, False if the queue is closed
+                or a BLOCK put timed out.
+        """
+        with self.condition:
+            if self.closed:
+                return False
+
+            if len(self.items) >= self.maxsize:
+                if self.policy == self.DROP_OLDEST:
+                    old_item = self.items.popleft()
+                    self.dropped += 1
+                    if self.on_drop:
+                        self.on_drop(old_item)
+                elif not self.condition.wait_for(
+                        lambda: len(self.items) < self.maxsize or self.closed, timeout=timeout):
+                    return False
+                elif self.closed:
+                    return False
+
+            self.items.append(item)
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self.items))
+            self.condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Remove and return the oldest item, waiting for one if needed.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds (None waits forever).
+
+        Returns:
+            The oldest item, or None on timeout or if the queue is closed and empty.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items or self.closed, timeout=timeout):
+                return None
+            if not self.items:
+                return None
+
+            item = self.items.popleft()
+            self.condition.notify_all()
+            return item
+
+    def close(self):
+        """
+        Close the queue. Pending items can still be read, new puts are refused.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def is_finished(self):
+        """
+        Check if the queue is closed and fully drained.
+
+        Returns:
+            bool: True if no more items will ever be returned.
+        """
+        with self.condition:
+            return self.closed and not self.items
+
+    def __len__(self):
+        with self.condition:
+            return len(self.items)
+
+
+class Stage:
+    """
+    A pipeline stage that runs a work function on its own worker thread.
+
+    A stage with an inbox calls work(item) for every item it receives. A stage
+    without an inbox is a source and calls work() in a loop. Whatever work
+    returns (other than None) is put into the outbox, waiting as long as a
+    BLOCK outbox is full; results the closed outbox refuses are released. A
+    source signals the end of its stream by raising StopIteration.
+    """
+
+    def __init__(self, name, work, inbox=None, outbox=None):
+        """
+        Initialize the Stage.
+
+        Args:
+            name (str): Stage name used in logs and statistics.
+            work (function): The function to run for each item.
+            inbox (BoundedQueue): Optional input queue.
+            outbox (BoundedQueue): Optional output queue.
+        """
+        self.name = name
+        self.work = work
+        self.inbox = inbox
+        self.outbox = outbox
+
+        self.thread = None
+        self.stop_flag = threading.Event()
+
+        # Statistics
+        self.processed = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+
+    def start(self):
+        """
+        Start the stage worker thread.
+        """
+        if self.thread is None:
+            self.stop_flag.clear()
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        """
+        Worker loop: take an item, process it and pass the result downstream.
+        """
+        while not self.stop_flag.is_set():
+            if self.inbox is not None:
+                item = self.inbox.get(timeout=0.1)
+                if item is None:
+                    if self.inbox.is_finished():
+                        break
+                    continue
+
+            start_time = time.perf_counter()
+            try:
+                result = self.work(item) if self.inbox is not None else self.work()
+            except StopIteration:
+                break
+            except Exception as e:
+                print(f"⚠ Pipeline stage '{self.name}' error: {e}")
+                continue
+
+            self.last_time = time.perf_counter() - start_time
+            self.total_time += self.last_time
+            self.processed += 1
+
+            # No timeout: a full BLOCK outbox holds the stage back until there is
+            # room or stop() closes it. A result that could not be queued is
+            # dropped here, so give its frame buffer back
+            if result is not None and self.outbox is not None:
+                if not self.outbox.put(result) and hasattr(result, 'release'):
+                    result.release()
+
+        # Let downstream stages know nothing more is coming
+        if self.outbox is not None:
+            self.outbox.close()
+
+    def stop(self, timeout=2):
+        """
+        Stop the worker thread.
+
+        Args:
+            timeout (float): Maximum time to wait for the worker to finish.
+        """
+        self.stop_flag.set()
+        # Unblock a worker waiting for room in a BLOCK outbox
+        if self.outbox is not None:
+            self.outbox.close()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+
+    def join(self, timeout=None):
+        """
+        Wait for the worker to finish on its own (e.g. after its inbox is closed).
+
+        Args:
+            timeout (float): Maximum time to wait.
+        """
+        if self.thread:
+            self.thread.join(timeout=timeout)
+
+    def get_stats(self):
+        """
+        Get stage timing statistics.
+
+        Returns:
+            dict: Items processed and average/last processing time in milliseconds.
+        """
+        avg_time = self.total_time / self.processed if self.processed else 0.0
+        return {
+            'processed': self.processed,
+            'avg_ms': avg_time * 1000.0,
+            'last_ms': self.last_time * 1000.0,
+        }
+
+
+class FramePacket:
+    """
+    The result of the inference stage for one camera frame.
+    """
+
+    def __init__(self, frame, timestamp, frame_id=-1, fingers=None, read_time=None,
+                 mirror=False, release=None, landmarks=None):
+        """
+        Initialize the FramePacket.
+
+        Args:
+            frame (numpy.ndarray): The frame, with landmarks drawn if enabled.
+            timestamp (float): Capture time of the frame.
+            frame_id (int): Sequence number of the frame.
+            fingers (numpy.ndarray): (hands, 5) finger states, one row per hand.
+            read_time (float): time.perf_counter() when the frame left the source.
+            mirror (bool): True if the frame is still the unmirrored camera image and
+                has to be flipped for display.
+            release (function): Called once when the frame buffer is no longer needed,
+                e.g. to hand it back to the frame source.
+            landmarks (numpy.ndarray): (hands, 21, 2) pixel landmarks of all hands (in
+                mirrored display coordinates), e.g. a view into a LandmarkBuffer; None if
+                no hand.
+        """
+        self.frame = frame
+        self.timestamp = timestamp
+        self.frame_id = frame_id
+        if landmarks is None:
+            landmarks = np.zeros((0, 21, 2), dtype=np.int32)
+        self.landmarks = landmarks
+        if fingers is None or len(fingers) == 0:
+            fingers = np.zeros((0, 5), dtype=np.uint8)
+        self.fingers = np.asarray(fingers, dtype=np.uint8).reshape(-1, 5)
+        self.read_time = read_time if read_time is not None else time.perf_counter()
+        self.mirror = mirror
+        self.release_callback = release
+
+    def release(self):
+        """
+        Give the frame buffer back. Safe to call more than once.
+        """
+        callback, self.release_callback = self.release_callback, None
+        if callback is not None:
+            callback()
+
+
+class LatencyStats:
+    """
+    Collects per-frame latency (source read to end of render) and throughput.
+
+    Frame count, mean and maximum cover the whole run; the percentiles come
+    from the most recent `window` frames, so a session of any length keeps
+    a fixed amount of memory.
+    """
+
+    def __init__(self, window=10000):
+        """
+        Initialize the LatencyStats.
+
+        Args:
+            window (int): Number of recent latencies kept for the percentiles.
+        """
+        self.latencies = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max_latency = 0.0
+        self.first_time = None
+        self.last_time = None
+
+    def record(self, packet):
+        """
+        Record that a packet has been fully rendered.
+
+        Args:
+            packet (FramePacket): The packet that was just finished.
+        """
+        now = time.perf_counter()
+        if self.first_time is None:
+            self.first_time = packet.read_time
+        self.last_time = now
+        latency = now - packet.read_time
+        self.latencies.append(latency)
+        self.count += 1
+        self.total += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def summary(self):
+        """
+        Summarize the recorded frames.
+
+        Returns:
+            dict: Frame count, frames per second, mean and maximum latency, and
+                latency percentiles over the recent window, in milliseconds.
+        """
+        count = self.count
+        if count == 0:
+            return {'frames': 0, 'fps': 0.0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+
+        ordered = sorted(self.latencies)
+        recent = len(ordered)
+        elapsed = self.last_time - self.first_time
+        return {
+            'frames': count,
+            'fps': count / elapsed if elapsed > 0 else 0.0,
+            'mean_ms': 1000.0 * self.total / count,
+            'p50_ms': 1000.0 * ordered[recent // 2],
+            'p95_ms': 1000.0 * ordered[min(recent - 1, int(recent * 0.95))],
+            'max_ms': 1000.0 * self.max_latency,
+        }
@@ -0,0 +1,197 @@
+"""
+ROI Tracker Module
+Runs hand detection on a crop around the last known hand instead of the full frame.
+
+RoiHandDetector wraps a HandDetector and keeps its interface (findHands,
+findPosition, fingersUp). After a hand has been found, the next frames are
+cropped to a padded box around the previous landmarks, so MediaPipe converts
+and processes far fewer pixels. Landmarks are shifted back to full-frame
+coordinates before they are returned, so callers never see the crop.
+
+The detector falls back to a full-frame search when the hand is lost inside
+the crop (retrying on the same frame) and every full_search_interval frames,
+so a second hand or a fast re-entry is never missed for long.
+"""
+
+import numpy as np
+
+
+class RoiHandDetector:
+    """
+    A HandDetector wrapper that tracks a region of interest around the hand.
+    """
+
+    def __init__(self, detector, padding=0.6, min_size=160, full_search_interval=30):
+        """
+        Initialize the RoiHandDetector.
+
+        Args:
+            detector (HandDetector): The detector that does the real work.
+            padding (float): Padding around the landmark bounding box, as a
+                fraction of the box's longer side.
+            min_size (int): Minimum crop side length in pixels.
+            full_search_interval (int): Force a full-frame search every N frames.
+        """
+        self.detector = detector
+        self.padding = padding
+        self.min_size = min_size
+        self.full_search_interval = full_search_interval
+
+        # Current region of interest as (x0, y0, x1, y1), or None for full frame
+        self.roi = None
+        self.frames_since_full_search = 0
+
+        # State for the frame currently being processed
+        self.frame = None
+        self.crop = None
+        self.crop_origin = (0, 0)
+        self.draw = True
+
+        # Statistics
+        self.frames = 0
+        self.roi_frames = 0
+        self.full_searches = 0
+        self.losses = 0
+        self.area_fraction_total = 0.0
+
+    def findHands(self, frame, draw=True):
+        """
+        Detect hands in the current region of interest (or the full frame).
+
+        Args:
+            frame (numpy.ndarray): The full BGR frame.
+            draw (bool): Draw landmarks on the frame.
+
+        Returns:
+            numpy.ndarray: The frame (landmarks are drawn in place through the crop view).
+        """
+        self.frame = frame
+        self.draw = draw
+        self.frames += 1
+
+        frame_height, frame_width = frame.shape[:2]
+
+        if self.roi is None or self.frames_since_full_search >= self.full_search_interval:
+            self._search_full_frame()
+        else:
+            x0, y0, x1, y1 = self.roi
+            self.crop = frame[y0:y1, x0:x1]
+            self.crop_origin = (x0, y0)
+            self.roi_frames += 1
+            self.frames_since_full_search += 1
+            self.area_fraction_total += ((x1 - x0) * (y1 - y0)) / float(frame_width * frame_height)
+            self.detector.findHands(self.crop, draw=draw)
+
+        return frame
+
+    def _search_full_frame(self):
+        """
+        Run detection on the whole current frame.
+        """
+        self.crop = self.frame
+        self.crop_origin = (0, 0)
+        self.frames_since_full_search = 0
+        self.full_searches += 1
+        self.area_fraction_total += 1.0
+        self.detector.findHands(self.frame, draw=self.draw)
+
+    def findPosition(self, frame, hand_number=0):
+        """
+        Get landmark positions in full-frame pixel coordinates.
+
+        Args:
+            frame (numpy.ndarray): The frame passed to findHands.
+            hand_number (int): Which detected hand to return.
+
+        Returns:
+            list: (id, x, y) tuples, empty if no hand was found.
+        """
+        landmark_list = self.detector.findPosition(self.crop, hand_number=hand_number)
+
+        if len(landmark_list) == 0 and self.crop is not self.frame:
+            # Lost the hand inside the crop - retry on the full frame right away
+            self.losses += 1
+            self._search_full_frame()
+            landmark_list = self.detector.findPosition(self.crop, hand_number=hand_number)
+
+        if len(landmark_list) == 0:
+            self.roi = None
+            return landmark_list
+
+        offset_x, offset_y = self.crop_origin
+        if offset_x or offset_y:
+            landmark_list = [(lm_id, x + offset_x, y + offset_y) for lm_id, x, y in landmark_list]
+
+        self._update_roi(landmark_list)
+        return landmark_list
+
+    def _update_roi(self, landmark_list):
+        """
+        Move the region of interest to follow the hand.
+
+        The crop only moves when the padded hand box leaves it, which keeps the
+        input to MediaPipe stable between frames and helps its own tracking.
+
+        Args:
+            landmark_list (list): (id, x, y) tuples in full-frame coordinates.
+        """
+        frame_height, frame_width = self.frame.shape[:2]
+        points = np.array([(x, y) for _, x, y in landmark_list], dtype=np.int32)
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
+
+        box_size = max(max_x - min_x, max_y - min_y)
+        margin = int(box_size * self.padding)
+
+        # Keep the current crop while the hand (plus a small margin) is inside it
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            keep_margin = margin // 2
+            if (min_x - keep_margin >= x0 and min_y - keep_margin >= y0 and
+                    max_x + keep_margin <= x1 and max_y + keep_margin <= y1):
+                return
+
+        # Square crop centred on the hand
+        side = max(self.min_size, box_size + 2 * margin)
+        center_x = (min_x + max_x) // 2
+        center_y = (min_y + max_y) // 2
+
+        x0 = int(np.clip(center_x - side // 2, 0, max(0, frame_width - side)))
+        y0 = int(np.clip(center_y - side // 2, 0, max(0, frame_height - side)))
+        x1 = min(frame_width, x0 + side)
+        y1 = min(frame_height, y0 + side)
+
+        # A crop covering most of the frame saves nothing - use the full frame
+        if (x1 - x0) * (y1 - y0) >= 0.8 * frame_width * frame_height:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+
+    def fingersUp(self, landmark_list):
+        """
+        Get finger states (the check is translation invariant, so full-frame
+        landmarks can be passed straight through).
+
+        Args:
+            landmark_list (list): (id, x, y) tuples.
+
+        Returns:
+            list: Five 0/1 finger states.
+        """
+        return self.detector.fingersUp(landmark_list)
+
+    def get_stats(self):
+        """
+        Get ROI tracking statistics.
+
+        Returns:
+            dict: Frames processed, ROI vs full-frame searches, losses and the
+                average fraction of the frame that was fed to the detector.
+        """
+        return {
+            'frames': self.frames,
+            'roi_frames': self.roi_frames,
+            'full_searches': self.full_searches,
+            'losses': self.losses,
+            'avg_area_fraction': self.area_fraction_total / self.frames if self.frames else 1.0,
+        }
@@ -0,0 +1,146 @@
+"""
+Scaled Detector Module
+Runs hand detection on a downscaled copy of the frame while capture and
+display stay at full resolution.
+
+Pointing precision benefits from a high-resolution camera, but MediaPipe's
+cost grows with the number of input pixels and its landmark accuracy does
+not. ScaledHandDetector resizes each frame once into a preallocated buffer,
+runs the wrapped HandDetector on that buffer and scales the landmarks back up,
+so every caller keeps working in full-frame pixel coordinates.
+"""
+
+import cv2
+import numpy as np
+
+
+# MediaPipe hand skeleton (pairs of landmark ids), used to draw landmarks on
+# the full-resolution frame since the detector only ever sees the small copy
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),          # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),          # Index finger
+    (5, 9), (9, 10), (10, 11), (11, 12),     # Middle finger
+    (9, 13), (13, 14), (14, 15), (15, 16),   # Ring finger
+    (13, 17), (17, 18), (18, 19), (19, 20),  # Pinky
+    (0, 17),                                 # Palm base
+)
+
+
+class ScaledHandDetector:
+    """
+    A HandDetector wrapper that detects on a downscaled frame and rescales the landmarks.
+    """
+
+    def __init__(self, detector, inference_width=640):
+        """
+        Initialize the ScaledHandDetector.
+
+        Args:
+            detector (HandDetector): The detector that does the real work.
+            inference_width (int): Width of the frame given to the detector.
+                The height follows the frame's aspect ratio. Frames that are
+                already this narrow are passed through unchanged.
+        """
+        self.detector = detector
+        self.inference_width = inference_width
+
+        self.small_frame = None   # Preallocated inference buffer
+        self.inference_frame = None
+        self.scale_x = 1.0
+        self.scale_y = 1.0
+
+    def _inference_size(self, frame_width, frame_height):
+        """
+        Work out the inference resolution for a frame.
+
+        Returns:
+            tuple: (width, height) for the detector.
+        """
+        if frame_width <= self.inference_width:
+            return frame_width, frame_height
+        height = int(round(frame_height * self.inference_width / float(frame_width)))
+        return self.inference_width, max(1, height)
+
+    def findHands(self, frame, draw=True):
+        """
+        Detect hands on a downscaled copy of the frame.
+
+        Args:
+            frame (numpy.ndarray): The full-resolution BGR frame.
+            draw (bool): Draw the detected landmarks on the full-resolution frame.
+
+        Returns:
+            numpy.ndarray: The full-resolution frame.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        small_width, small_height = self._inference_size(frame_width, frame_height)
+
+        if (small_width, small_height) == (frame_width, frame_height):
+            # Nothing to scale - behave exactly like the wrapped detector
+            self.inference_frame = frame
+            self.scale_x = self.scale_y = 1.0
+            return self.detector.findHands(frame, draw=draw)
+
+        if self.small_frame is None or self.small_frame.shape[:2] != (small_height, small_width):
+            self.small_frame = np.empty((small_height, small_width, 3), dtype=frame.dtype)
+
+        # One resize into the reused buffer - no per-frame allocation
+        cv2.resize(frame, (small_width, small_height), dst=self.small_frame,
+                   interpolation=cv2.INTER_AREA)
+        self.inference_frame = self.small_frame
+        self.scale_x = frame_width / float(small_width)
+        self.scale_y = frame_height / float(small_height)
+
+        self.detector.findHands(self.small_frame, draw=False)
+
+        if draw:
+            self._draw_landmarks(frame)
+        return frame
+
+    def _draw_landmarks(self, frame):
+        """
+        Draw the landmarks of the first detected hand on the full-resolution frame.
+
+        Args:
+            frame (numpy.ndarray): The full-resolution frame.
+        """
+        landmark_list = self.findPosition(frame, hand_number=0)
+        if len(landmark_list) == 0:
+            return
+
+        points = [(x, y) for _, x, y in landmark_list]
+        for start, end in HAND_CONNECTIONS:
+            cv2.line(frame, points[start], points[end], (255, 255, 255), 2)
+        for point in points:
+            cv2.circle(frame, point, 4, (0, 0, 255), cv2.FILLED)
+
+    def findPosition(self, frame, hand_number=0):
+        """
+        Get landmark positions in full-resolution pixel coordinates.
+
+        Args:
+            frame (numpy.ndarray): The full-resolution frame passed to findHands.
+            hand_number (int): Which detected hand to return.
+
+        Returns:
+            list: (id, x, y) tuples, empty if no hand was found.
+        """
+        landmark_list = self.detector.findPosition(self.inference_frame, hand_number=hand_number)
+        if self.scale_x == 1.0 and self.scale_y == 1.0:
+            return landmark_list
+
+        scale_x, scale_y = self.scale_x, self.scale_y
+        return [(lm_id, int(x * scale_x), int(y * scale_y)) for lm_id, x, y in landmark_list]
+
+    def fingersUp(self, landmark_list):
+        """
+        Get finger states (the check only compares landmarks with each other,
+        so full-resolution landmarks can be passed straight through).
+
+        Args:
+            landmark_list (list): (id, x, y) tuples.
+
+        Returns:
+            list: Five 0/1 finger states.
+        """
+        return self.detector.fingersUp(landmark_list)
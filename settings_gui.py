@@ -6,6 +6,7 @@ A tkinter-based settings window for adjusting virtual mouse parameters in real-t
 import tkinter as tk
 from tkinter import ttk
 import threading
+from smoothing import SMOOTHERS
 
 
 class SettingsGUI:
@@ -14,11 +15,23 @@ class SettingsGUI:
     This runs in a separate thread alongside the OpenCV loop.
     """
 
-    def __init__(self):
+    # Names shown in the smoothing filter selector
+    FILTER_LABELS = {
+        'one_euro': "One Euro (adaptive)",
+        'kalman': "Kalman (velocity tracking)",
+        'ema': "EMA + moving average (classic)",
+    }
+
+    def __init__(self, smoothing_filter='one_euro'):
         """
         Initialize the Settings GUI with default values.
+        
+        Args:
+            smoothing_filter (str): Initially selected smoothing filter (see smoothing.py).
         """
         # Shared variables that will be updated by sliders
+        self.smoothing_filter = smoothing_filter
+        self.default_filter = smoothing_filter
         self.smoothing_factor = 7  # Default smoothing factor
         self.mouse_sensitivity = 150  # Default padding (frame reduction margin)
         
@@ -38,7 +51,7 @@ class SettingsGUI:
         """
         self.root = tk.Tk()
         self.root.title("Virtual Mouse Settings")
-        self.root.geometry("400x300")
+        self.root.geometry("400x390")
         self.root.resizable(False, False)
         
         # Set window to stay on top
@@ -53,17 +66,28 @@ class SettingsGUI:
                                font=('Arial', 14, 'bold'))
         title_label.grid(row=0, column=0, columnspan=2, pady=(0, 20))
         
+        # ==================== SMOOTHING FILTER SELECTOR ====================
+        filter_label = ttk.Label(main_frame, text="Smoothing Filter", 
+                                 font=('Arial', 10, 'bold'))
+        filter_label.grid(row=1, column=0, sticky=tk.W, pady=(0, 10))
+        
+        self.filter_choice = ttk.Combobox(main_frame, state='readonly', width=28,
+                                          values=[self.FILTER_LABELS.get(name, name) for name in SMOOTHERS])
+        self.filter_choice.set(self.FILTER_LABELS.get(self.smoothing_filter, self.smoothing_filter))
+        self.filter_choice.bind('<<ComboboxSelected>>', self.update_filter)
+        self.filter_choice.grid(row=1, column=1, sticky=tk.E, pady=(0, 10))
+        
         # ==================== SMOOTHING FACTOR SLIDER ====================
         # Label for smoothing factor
         smoothing_label = ttk.Label(main_frame, text="Smoothing Factor (Jitter Control)", 
                                     font=('Arial', 10, 'bold'))
-        smoothing_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        smoothing_label.grid(row=11, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
         
         # Description
         smoothing_desc = ttk.Label(main_frame, 
                                    text="Higher = Smoother but slower cursor movement",
                                    font=('Arial', 8), foreground='gray')
-        smoothing_desc.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        smoothing_desc.grid(row=12, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
         
         # Smoothing factor slider (1-20)
         self.smoothing_scale = tk.Scale(
@@ -77,25 +101,25 @@ class SettingsGUI:
             resolution=1
         )
         self.smoothing_scale.set(self.smoothing_factor)
-        self.smoothing_scale.grid(row=3, column=0, columnspan=2, pady=(0, 10))
+        self.smoothing_scale.grid(row=13, column=0, columnspan=2, pady=(0, 10))
         
         # Current value label for smoothing
         self.smoothing_value_label = ttk.Label(main_frame, 
                                                text=f"Current: {self.smoothing_factor}",
                                                font=('Arial', 9))
-        self.smoothing_value_label.grid(row=4, column=0, columnspan=2, pady=(0, 20))
+        self.smoothing_value_label.grid(row=14, column=0, columnspan=2, pady=(0, 20))
         
         # ==================== MOUSE SENSITIVITY SLIDER ====================
         # Label for sensitivity
         sensitivity_label = ttk.Label(main_frame, text="Mouse Sensitivity (Frame Margin)", 
                                       font=('Arial', 10, 'bold'))
-        sensitivity_label.grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        sensitivity_label.grid(row=15, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
         
         # Description
         sensitivity_desc = ttk.Label(main_frame, 
                                      text="Lower = Easier to reach screen edges, Higher = More precise control",
                                      font=('Arial', 8), foreground='gray')
-        sensitivity_desc.grid(row=6, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        sensitivity_desc.grid(row=16, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
         
         # Sensitivity slider (50-300)
         self.sensitivity_scale = tk.Scale(
@@ -109,18 +133,18 @@ class SettingsGUI:
             resolution=10
         )
         self.sensitivity_scale.set(self.mouse_sensitivity)
-        self.sensitivity_scale.grid(row=7, column=0, columnspan=2, pady=(0, 10))
+        self.sensitivity_scale.grid(row=17, column=0, columnspan=2, pady=(0, 10))
         
         # Current value label for sensitivity
         self.sensitivity_value_label = ttk.Label(main_frame, 
                                                  text=f"Current: {self.mouse_sensitivity}px",
                                                  font=('Arial', 9))
-        self.sensitivity_value_label.grid(row=8, column=0, columnspan=2, pady=(0, 10))
+        self.sensitivity_value_label.grid(row=18, column=0, columnspan=2, pady=(0, 10))
         
         # ==================== RESET BUTTON ====================
         reset_button = ttk.Button(main_frame, text="Reset to Defaults", 
                                   command=self.reset_defaults)
-        reset_button.grid(row=9, column=0, columnspan=2, pady=(10, 0))
+        reset_button.grid(row=19, column=0, columnspan=2, pady=(10, 0))
         
         # Handle window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -128,6 +152,22 @@ class SettingsGUI:
         self.is_running = True
         self.root.mainloop()
 
+    def update_filter(self, event=None):
+        """
+        Callback function when a smoothing filter is selected.
+        
+        Args:
+            event (tk.Event): The selection event.
+        """
+        label = self.filter_choice.get()
+        for name, filter_label in self.FILTER_LABELS.items():
+            if filter_label == label:
+                self.smoothing_filter = name
+                break
+        else:
+            self.smoothing_filter = label
+        print(f"[Settings] Smoothing filter changed to: {self.smoothing_filter}")
+
     def update_smoothing(self, value):
         """
         Callback function when smoothing slider is moved.
@@ -154,6 +194,10 @@ class SettingsGUI:
         """
         Reset all settings to their default values.
         """
+        # Reset smoothing filter
+        self.smoothing_filter = self.default_filter
+        self.filter_choice.set(self.FILTER_LABELS.get(self.default_filter, self.default_filter))
+        
         # Reset smoothing factor
         self.smoothing_factor = 7
         self.smoothing_scale.set(7)
@@ -203,6 +247,15 @@ class SettingsGUI:
         """
         return self.smoothing_factor
 
+    def get_smoothing_filter(self):
+        """
+        Get the currently selected smoothing filter.
+        
+        Returns:
+            str: The filter name (a key of smoothing.SMOOTHERS).
+        """
+        return self.smoothing_filter
+
     def get_mouse_sensitivity(self):
         """
         Get the current mouse sensitivity (padding) value.
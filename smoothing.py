@@ -0,0 +1,344 @@
+"""
+Smoothing Module
+Cursor smoothing filters applied to the mapped screen position of the hand.
+
+Three filters share one interface (smooth(x, y, timestamp), reset() and a
+smoothing_factor driven by the settings GUI slider) and keep their state in
+small NumPy arrays holding both axes:
+
+- OneEuroFilter (default): a low-pass filter whose cutoff rises with speed.
+  At rest the cutoff is low and jitter is removed; during fast movement it
+  opens up, so flicks are not dragged behind the hand.
+- KalmanSmoother: a Kalman filter that tracks position and a velocity that
+  decays quickly, so movement is followed with little lag while measurement
+  noise is averaged out, and the cursor does not coast past a sudden stop.
+- DualSmoother: the original dual-filter approach (SMOOTHING_GUIDE.md), an
+  exponential moving average followed by a moving average. Kept as the
+  baseline; its lag grows with the smoothing factor.
+
+smooth_points() is the array form of smooth(): it filters a batch of
+positions shaped (..., 2) that share one timestamp, with smoothing_factor a
+scalar or an array of the batch shape. This lets the smoothing benchmark
+(smoothing_demo.py) run many configurations over a trace in one pass.
+
+The filters run once per vision frame, so the cursor actuator can
+interpolate between their outputs at a higher rate without changing how
+strong the smoothing feels.
+"""
+
+import time
+
+import numpy as np
+
+
+def _factor(smoothing_factor):
+    """
+    Get the smoothing factor as a float array, at least 1.
+    """
+    return np.maximum(1.0, np.asarray(smoothing_factor, dtype=np.float64))
+
+
+class DualSmoother:
+    """
+    Exponential moving average followed by a moving average filter.
+    """
+
+    name = 'ema'
+
+    def __init__(self, smoothing_factor=7, buffer_size=5):
+        """
+        Initialize the DualSmoother.
+
+        Args:
+            smoothing_factor (float): EMA divisor; higher is smoother but slower.
+            buffer_size (int): Number of positions averaged by the moving average.
+        """
+        self.smoothing_factor = smoothing_factor
+        self.buffer_size = buffer_size
+        self.buffer = None  # (buffer_size, ..., 2) recent EMA outputs
+        self.buffer_index = 0
+        self.position = None
+
+    def reset(self):
+        """
+        Forget the filter state; the next position is passed through unchanged.
+        """
+        self.position = None
+
+    def smooth(self, x, y, timestamp=None):
+        """
+        Filter one position.
+
+        Args:
+            x (float): Target x coordinate.
+            y (float): Target y coordinate.
+            timestamp (float): Unused; the EMA works per sample.
+
+        Returns:
+            tuple: Smoothed (x, y).
+        """
+        position = self.smooth_points(np.array((x, y), dtype=np.float64), timestamp)
+        return float(position[0]), float(position[1])
+
+    def smooth_points(self, points, timestamp=None):
+        """
+        Filter a batch of positions.
+
+        Args:
+            points (numpy.ndarray): (..., 2) target positions.
+            timestamp (float): Unused; the EMA works per sample.
+
+        Returns:
+            numpy.ndarray: (..., 2) smoothed positions (owned by the filter).
+        """
+        target = np.asarray(points, dtype=np.float64)
+        if self.position is None or self.position.shape != target.shape:
+            # Fill the buffer so the first positions are not pulled towards zero
+            self.buffer = np.repeat(target[None], self.buffer_size, axis=0)
+            self.buffer_index = 0
+            self.position = target.copy()
+            return self.position
+
+        # Exponential moving average
+        factor = _factor(self.smoothing_factor)[..., None]
+        ema = self.position + (target - self.position) / factor
+
+        # Moving average filter
+        self.buffer[self.buffer_index] = ema
+        self.buffer_index = (self.buffer_index + 1) % self.buffer_size
+        self.position = self.buffer.mean(axis=0)
+        return self.position
+
+
+class OneEuroFilter:
+    """
+    The 1 Euro filter (Casiez et al., 2012): a speed-adaptive low-pass filter.
+    """
+
+    name = 'one_euro'
+
+    def __init__(self, smoothing_factor=7, beta=0.02, derivative_cutoff=1.0, max_gap=0.5):
+        """
+        Initialize the OneEuroFilter.
+
+        Args:
+            smoothing_factor (float): Sets the cutoff at rest, 7 / smoothing_factor Hz
+                (1 Hz at the default); higher is steadier at rest.
+            beta (float): Cutoff increase per pixel/second of speed; higher reacts
+                faster to quick movements.
+            derivative_cutoff (float): Cutoff in Hz for the speed estimate.
+            max_gap (float): Seconds without a sample after which the filter restarts.
+        """
+        self.smoothing_factor = smoothing_factor
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        self.max_gap = max_gap
+
+        self.position = None
+        self.velocity = None
+        self.last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        """
+        Smoothing weight of a first-order low-pass filter at `cutoff` Hz.
+        """
+        tau = 1.0 / (2.0 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        """
+        Forget the filter state; the next position is passed through unchanged.
+        """
+        self.position = None
+        self.last_time = None
+
+    def smooth(self, x, y, timestamp=None):
+        """
+        Filter one position.
+
+        Args:
+            x (float): Target x coordinate.
+            y (float): Target y coordinate.
+            timestamp (float): Sample time in seconds; defaults to now.
+
+        Returns:
+            tuple: Smoothed (x, y).
+        """
+        position = self.smooth_points(np.array((x, y), dtype=np.float64), timestamp)
+        return float(position[0]), float(position[1])
+
+    def smooth_points(self, points, timestamp=None):
+        """
+        Filter a batch of positions taken at the same time.
+
+        Args:
+            points (numpy.ndarray): (..., 2) target positions.
+            timestamp (float): Sample time in seconds; defaults to now.
+
+        Returns:
+            numpy.ndarray: (..., 2) smoothed positions (owned by the filter).
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        target = np.asarray(points, dtype=np.float64)
+
+        if (self.position is None or self.position.shape != target.shape or
+                timestamp - self.last_time > self.max_gap):
+            self.position = target.copy()
+            self.velocity = np.zeros_like(target)
+            self.last_time = timestamp
+            return self.position
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            # Same or older timestamp: nothing to integrate over
+            return self.position
+
+        # Low-passed speed decides how much the position is smoothed
+        velocity = (target - self.position) / dt
+        self.velocity += self._alpha(self.derivative_cutoff, dt) * (velocity - self.velocity)
+        speed = np.hypot(self.velocity[..., 0], self.velocity[..., 1])
+
+        min_cutoff = 7.0 / _factor(self.smoothing_factor)
+        cutoff = min_cutoff + self.beta * speed
+        self.position += self._alpha(cutoff, dt)[..., None] * (target - self.position)
+        self.last_time = timestamp
+        return self.position
+
+
+class KalmanSmoother:
+    """
+    A Kalman filter for the cursor position with a decaying velocity.
+
+    Both axes use the same motion model and noise, so they share one 2x2
+    covariance matrix and gain; the state is an array of [position,
+    velocity] per axis.
+
+    A constant-velocity model carries the hand's speed past a sudden stop:
+    on the smoothing benchmark's flick it overshot by 90-190 px. Letting the
+    velocity decay with a time constant of velocity_time, with a higher
+    process noise to keep the lag down, brings the overshoot to about 5 px
+    (process_noise and velocity_time were tuned with smoothing_demo.py).
+    """
+
+    name = 'kalman'
+
+    def __init__(self, smoothing_factor=7, process_noise=4000.0, max_gap=0.5, velocity_time=0.04):
+        """
+        Initialize the KalmanSmoother.
+
+        Args:
+            smoothing_factor (float): Measurement noise in pixels (standard deviation);
+                higher trusts the hand position less and is steadier.
+            process_noise (float): Acceleration noise in pixels/second^2 (standard
+                deviation); higher follows changes in speed faster.
+            max_gap (float): Seconds without a sample after which the filter restarts.
+            velocity_time (float): Seconds in which the estimated velocity decays to
+                1/e without new evidence; None keeps it constant (overshoots on stops).
+        """
+        self.smoothing_factor = smoothing_factor
+        self.process_noise = process_noise
+        self.max_gap = max_gap
+        self.velocity_time = velocity_time
+
+        self.state = None       # (..., 2 axes, [position, velocity])
+        self.covariance = None  # (..., 2, 2), shared by both axes
+        self.last_time = None
+
+    def reset(self):
+        """
+        Forget the filter state; the next position is passed through unchanged.
+        """
+        self.state = None
+        self.last_time = None
+
+    def smooth(self, x, y, timestamp=None):
+        """
+        Filter one position.
+
+        Args:
+            x (float): Target x coordinate.
+            y (float): Target y coordinate.
+            timestamp (float): Sample time in seconds; defaults to now.
+
+        Returns:
+            tuple: Smoothed (x, y).
+        """
+        position = self.smooth_points(np.array((x, y), dtype=np.float64), timestamp)
+        return float(position[0]), float(position[1])
+
+    def smooth_points(self, points, timestamp=None):
+        """
+        Filter a batch of positions taken at the same time.
+
+        Args:
+            points (numpy.ndarray): (..., 2) target positions.
+            timestamp (float): Sample time in seconds; defaults to now.
+
+        Returns:
+            numpy.ndarray: (..., 2) smoothed positions.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        measurement = np.asarray(points, dtype=np.float64)
+        measurement_variance = _factor(self.smoothing_factor) ** 2
+        batch_shape = measurement.shape[:-1]
+
+        if (self.state is None or self.state.shape[:-2] != batch_shape or
+                timestamp - self.last_time > self.max_gap):
+            self.state = np.zeros(batch_shape + (2, 2), dtype=np.float64)
+            self.state[..., 0] = measurement
+            self.covariance = np.zeros(batch_shape + (2, 2), dtype=np.float64)
+            self.covariance[..., 0, 0] = measurement_variance
+            self.covariance[..., 1, 1] = 1000.0 ** 2
+            self.last_time = timestamp
+            return self.state[..., 0]
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            return self.state[..., 0]
+
+        # Predict forward to this sample
+        if self.velocity_time:
+            decay = np.exp(-dt / self.velocity_time)
+            transition = np.array([[1.0, self.velocity_time * (1.0 - decay)], [0.0, decay]])
+        else:
+            transition = np.array([[1.0, dt], [0.0, 1.0]])
+        q = self.process_noise ** 2
+        noise = q * np.array([[dt ** 4 / 4.0, dt ** 3 / 2.0],
+                              [dt ** 3 / 2.0, dt ** 2]])
+        self.state = self.state @ transition.T
+        covariance = transition @ self.covariance @ transition.T + noise
+
+        # Update with the measured position (shared gain for both axes)
+        gain = covariance[..., :, 0] / (covariance[..., 0, 0] + measurement_variance)[..., None]
+        residual = measurement - self.state[..., 0]
+        self.state += residual[..., :, None] * gain[..., None, :]
+        self.covariance = covariance - gain[..., :, None] * covariance[..., None, 0, :]
+        self.last_time = timestamp
+        return self.state[..., 0]
+
+
+SMOOTHERS = {
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanSmoother,
+    'ema': DualSmoother,
+}
+
+
+def create_smoother(name='one_euro', smoothing_factor=7):
+    """
+    Create a cursor smoothing filter by name.
+
+    Args:
+        name (str): One of SMOOTHERS.
+        smoothing_factor (float): Initial smoothing strength (settings GUI slider, 1-20),
+            or an array of strengths for smooth_points() batches.
+
+    Returns:
+        The filter.
+    """
+    if name not in SMOOTHERS:
+        raise ValueError(f"Unknown smoothing filter '{name}' (choose from {', '.join(SMOOTHERS)})")
+    return SMOOTHERS[name](smoothing_factor=smoothing_factor)
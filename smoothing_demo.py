@@ -1,86 +1,416 @@
 """
-Smoothing Demo - Standalone Example
-Demonstrates how the dual smoothing approach reduces cursor jitter.
+Smoothing Benchmark
+Measures every cursor smoothing filter on recorded or synthetic fingertip traces.
+
+Each filter in smoothing.py is run over each trace for a range of smoothing
+factors at once (the factors form one smooth_points() batch), and scored on:
+
+- jitter: RMS shake of the cursor while the hand is at rest, from second
+  differences of the output so a slow drift towards the target does not
+  count (scaled so that white noise of N px scores N px per axis)
+- lag: the time shift that best aligns the output with the true path during
+  motion, in milliseconds
+- overshoot: how far the cursor runs past the point where a movement stopped
+- cost: compute time per sample of the single-position smooth() call used
+  by the app, timed separately for each filter and smoothing factor
+
+--latency adds a fixed pipeline latency (capture to cursor) to the lag, and
+--predict runs the latency compensator (cursor_predictor.py) after each
+filter to lead the cursor by that latency, as main.py --predict-cursor does.
+
+Synthetic traces (a flick, a slow drag, a circle and a hold, with tracking
+noise) have an exact true path. Recorded landmark traces (--trace, written
+by main.py --record-trace) use the index fingertip mapped to the screen as in
+main.py; their true path is approximated by a zero-phase Gaussian smoothing
+of the recording.
+
+Usage:
+    python smoothing_demo.py
+    python smoothing_demo.py --trace session.trace --factors 3,5,7,10,15
+    python smoothing_demo.py --json results.json
+    python smoothing_demo.py --latency 60 --predict
 """
 
+import argparse
+import json
+import sys
+import time
+
 import numpy as np
-from collections import deque
-
-
-def smooth_movement_demo():
-    """
-    Demonstrate the smoothing effect with sample data.
-    """
-    # Simulated jittery hand positions (x, y) over time
-    # These represent noisy input from hand tracking
-    raw_positions = [
-        (500, 300), (505, 302), (498, 305), (510, 298), (502, 303),
-        (508, 301), (495, 307), (512, 299), (501, 304), (509, 300)
-    ]
-    
-    print("="*60)
-    print("Cursor Smoothing Demonstration")
-    print("="*60)
-    print("\nRaw (Jittery) Positions vs Smoothed Positions:\n")
-    
-    # Smoothing parameters
-    smoothing_factor = 7
-    buffer_size = 5
-    
-    # Initialize smoothing state
-    prev_x, prev_y = raw_positions[0]
-    x_buffer = deque(maxlen=buffer_size)
-    y_buffer = deque(maxlen=buffer_size)
-    
-    # Initialize buffer
-    for _ in range(buffer_size):
-        x_buffer.append(prev_x)
-        y_buffer.append(prev_y)
-    
-    print(f"{'Frame':<8} {'Raw Position':<20} {'Smoothed Position':<20} {'Difference'}")
+
+from smoothing import SMOOTHERS, create_smoother
+from cursor_predictor import LatencyCompensator
+
+
+REST_SPEED = 30.0       # Below this true speed (px/s) the hand counts as at rest
+MOTION_SPEED = 100.0    # Above this true speed (px/s) the hand counts as moving
+SETTLE_TIME = 0.5       # Rest samples this soon after motion are not used for jitter
+MAX_LAG = 0.4           # Largest lag (s) searched for
+LAG_STEP = 0.002        # Lag resolution (s)
+STOP_WINDOW = 0.5       # A movement has stopped if the hand then stays still this long (s)
+
+
+def _minimum_jerk(start, end, progress):
+    """
+    Position along a minimum-jerk movement (the smooth profile of reaching moves).
+    """
+    progress = np.clip(progress, 0.0, 1.0)
+    blend = 10 * progress ** 3 - 15 * progress ** 4 + 6 * progress ** 5
+    return start + (end - start) * blend[:, None]
+
+
+def synthetic_traces(fps=30.0, noise=4.0, seed=0):
+    """
+    Build synthetic cursor traces in screen pixels.
+
+    Args:
+        fps (float): Sample rate (camera frame rate).
+        noise (float): Tracking noise standard deviation in screen pixels.
+        seed (int): Random seed for the noise.
+
+    Returns:
+        list: (name, timestamps, noisy points, true points) tuples.
+    """
+    rng = np.random.default_rng(seed)
+    traces = []
+
+    def add(name, timestamps, truth):
+        noisy = truth + rng.normal(0.0, noise, truth.shape)
+        traces.append((name, timestamps, noisy, truth))
+
+    # Flick: hold, fast 1200px move in 0.3s, hold
+    t = np.arange(0.0, 3.5, 1.0 / fps)
+    truth = _minimum_jerk(np.array([400.0, 500.0]), np.array([1600.0, 600.0]), (t - 1.5) / 0.3)
+    add('flick', t, truth)
+
+    # Slow drag: hold, 2s at about 150px/s, hold
+    t = np.arange(0.0, 4.0, 1.0 / fps)
+    truth = _minimum_jerk(np.array([800.0, 400.0]), np.array([1100.0, 480.0]), (t - 1.0) / 2.0)
+    add('slow_drag', t, truth)
+
+    # Circle: radius 200px, one turn every 2s
+    t = np.arange(0.0, 4.0, 1.0 / fps)
+    angle = np.pi * t
+    truth = np.stack([960.0 + 200.0 * np.cos(angle), 540.0 + 200.0 * np.sin(angle)], axis=1)
+    add('circle', t, truth)
+
+    # Hold: a still hand with a slight 8Hz tremor
+    t = np.arange(0.0, 3.0, 1.0 / fps)
+    truth = np.stack([700.0 + 0.5 * np.sin(2 * np.pi * 8.0 * t), np.full_like(t, 300.0)], axis=1)
+    add('hold', t, truth)
+
+    return traces
+
+
+def _gaussian_smooth(points, sigma):
+    """
+    Zero-phase Gaussian smoothing along the first axis (edges padded).
+    """
+    radius = max(1, int(3 * sigma))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    padded = np.pad(points, ((radius, radius), (0, 0)), mode='edge')
+    return np.stack([np.convolve(padded[:, axis], kernel, mode='valid')
+                     for axis in range(points.shape[1])], axis=1)
+
+
+def recorded_traces(path, screen_size=(1920, 1080), padding=150, reference_sigma=2.0):
+    """
+    Load the index fingertip path of a landmark trace, mapped to the screen.
+
+    Args:
+        path (str): Landmark trace file (see landmark_trace.py).
+        screen_size (tuple): (width, height) of the screen to map to.
+        padding (int): Detection-area margin at 640px frame width, as in main.py.
+        reference_sigma (float): Samples of Gaussian smoothing used as the true path.
+
+    Returns:
+        list: (name, timestamps, points, reference points) tuples, one per
+            continuous stretch of frames with a hand.
+    """
+    from landmark_trace import load_trace
+
+    records = load_trace(path)
+    present = records['hand_present'].astype(bool)
+    timestamps = records['timestamp'].astype(np.float64)
+    frame_width = records['frame_size'][:, 0].astype(np.float64)
+    frame_height = records['frame_size'][:, 1].astype(np.float64)
+    fingertip = records['landmarks'][:, 8, :].astype(np.float64)
+
+    # Same mapping as main.py: the padded detection area covers the whole screen
+    margin = padding * frame_width / 640.0
+    points = np.stack([(fingertip[:, 0] - margin) / (frame_width - 2 * margin) * screen_size[0],
+                       (fingertip[:, 1] - margin) / (frame_height - 2 * margin) * screen_size[1]], axis=1)
+    points = np.clip(points, 0, [screen_size[0], screen_size[1]])
+
+    # Split into stretches with a hand and no long gaps
+    traces = []
+    breaks = np.flatnonzero(~present | np.r_[False, np.diff(timestamps) > 0.25])
+    bounds = np.r_[-1, breaks, len(records)]
+    for start, end in zip(bounds[:-1] + 1, bounds[1:]):
+        if end - start < 30:
+            continue
+        segment = slice(start, end)
+        reference = _gaussian_smooth(points[segment], reference_sigma)
+        traces.append((f"{path}[{start}:{end}]", timestamps[segment] - timestamps[start],
+                       points[segment], reference))
+    return traces
+
+
+def run_batch(name, factors, timestamps, points, predict_latency=None):
+    """
+    Run one filter over a trace for several smoothing factors at once.
+
+    Args:
+        name (str): Filter name.
+        factors (list): Smoothing factors.
+        timestamps (numpy.ndarray): (N,) sample times.
+        points (numpy.ndarray): (N, 2) input positions.
+        predict_latency (float): If given, lead the filtered positions by this many
+            seconds with a LatencyCompensator.
+
+    Returns:
+        numpy.ndarray: (samples, len(factors), 2) filtered positions.
+    """
+    smoother = create_smoother(name, smoothing_factor=np.asarray(factors, dtype=np.float64))
+    compensator = LatencyCompensator() if predict_latency is not None else None
+    batch = np.repeat(points[:, None, :], len(factors), axis=1)
+    output = np.empty_like(batch)
+    for index, timestamp in enumerate(timestamps):
+        output[index] = smoother.smooth_points(batch[index], timestamp)
+        if compensator is not None:
+            output[index] = compensator.predict_points(output[index], timestamp, latency=predict_latency)
+    return output
+
+
+def score(timestamps, output, truth, latency=0.0):
+    """
+    Compute jitter, lag and overshoot of filtered positions against the true path.
+
+    Args:
+        timestamps (numpy.ndarray): (N,) sample times.
+        output (numpy.ndarray): (N, C, 2) filtered positions for C configurations.
+        truth (numpy.ndarray): (N, 2) true positions.
+        latency (float): Pipeline latency in seconds before an output reaches the screen.
+
+    Returns:
+        dict: 'jitter_px', 'lag_ms' and 'overshoot_px' arrays of length C
+            (NaN where the trace has no rest or no motion).
+    """
+    num_configs = output.shape[1]
+    speed = np.linalg.norm(np.gradient(truth, timestamps, axis=0), axis=1)
+    moving = speed > MOTION_SPEED
+
+    # Rest samples far enough from any motion for the filter to have settled
+    last_motion = np.maximum.accumulate(np.where(speed > REST_SPEED, timestamps, -np.inf))
+    rest = (speed <= REST_SPEED) & (timestamps - last_motion > SETTLE_TIME)
+
+    # Second differences cancel drift; white noise of variance s^2 gives 6 s^2 per axis
+    shake = np.diff(output, n=2, axis=0)                                       # (N-2, C, 2)
+    rest_shake = rest[2:] & rest[1:-1] & rest[:-2]
+    if rest_shake.any():
+        jitter = np.sqrt(np.mean(shake[rest_shake] ** 2, axis=(0, 2)) / 6.0)
+    else:
+        jitter = np.full(num_configs, np.nan)
+
+    # Lag: the shift of the true path that matches the output best during motion
+    if moving.sum() >= 3:
+        # Negative lags: a predicting cursor can run ahead of the input
+        lags = np.arange(-MAX_LAG, MAX_LAG + LAG_STEP / 2, LAG_STEP)
+        shifted_times = timestamps[moving][None, :] - lags[:, None]          # (L, M)
+        shifted = np.stack([np.interp(shifted_times, timestamps, truth[:, axis])
+                            for axis in range(2)], axis=-1)                   # (L, M, 2)
+        mismatch = np.linalg.norm(output[moving][None, :, :, :] - shifted[:, :, None, :], axis=3)
+        lag = (lags[np.argmin(mismatch.mean(axis=1), axis=0)] + latency) * 1000.0
+    else:
+        lag = np.full(num_configs, np.nan)
+
+    # Overshoot: past the stopping point, along the direction of the movement that ended
+    overshoot = np.zeros(num_configs)
+    stops = np.flatnonzero(moving[:-1] & ~moving[1:]) + 1
+    for stop in stops:
+        starts = np.flatnonzero(~moving[:stop])
+        start = starts[-1] if len(starts) else 0
+        direction = truth[stop] - truth[start]
+        length = np.linalg.norm(direction)
+        if length < 1.0:
+            continue
+        window = (timestamps >= timestamps[stop]) & (timestamps <= timestamps[stop] + STOP_WINDOW)
+        if moving[window].any() or timestamps[-1] < timestamps[stop] + STOP_WINDOW:
+            # Only a turn or the end of the trace, not a stop
+            continue
+        # Measured from where the hand comes to rest
+        settled = truth[np.flatnonzero(window)[-1]]
+        beyond = (output[window] - settled) @ (direction / length)             # (W, C)
+        overshoot = np.maximum(overshoot, beyond.max(axis=0))
+
+    return {'jitter_px': jitter, 'lag_ms': lag, 'overshoot_px': overshoot}
+
+
+def sample_cost(name, factor, timestamps, points, repeats=3):
+    """
+    Time the single-position smooth() call the app makes once per frame.
+
+    Returns:
+        float: Microseconds per sample (best of `repeats` runs).
+    """
+    best = float('inf')
+    coordinates = points.tolist()
+    times = timestamps.tolist()
+    for _ in range(repeats):
+        smoother = create_smoother(name, smoothing_factor=factor)
+        start = time.perf_counter()
+        for (x, y), timestamp in zip(coordinates, times):
+            smoother.smooth(x, y, timestamp)
+        best = min(best, time.perf_counter() - start)
+    return best / len(times) * 1e6
+
+
+def benchmark(traces, factors, filters=None, latency=0.0, predict=False):
+    """
+    Score every filter and smoothing factor on every trace.
+
+    Args:
+        traces (list): (name, timestamps, points, truth) tuples.
+        factors (list): Smoothing factors to try.
+        filters (list): Filter names (default: all of SMOOTHERS).
+        latency (float): Pipeline latency in seconds added to the lag.
+        predict (bool): Lead the cursor by the latency with a LatencyCompensator.
+
+    Returns:
+        list: One result dict per (filter, factor) with averaged metrics and
+            per-trace details.
+    """
+    results = []
+    for name in filters or list(SMOOTHERS):
+        per_trace = []
+        for trace_name, timestamps, points, truth in traces:
+            output = run_batch(name, factors, timestamps, points, latency if predict else None)
+            per_trace.append((trace_name, score(timestamps, output, truth, latency)))
+
+        for index, factor in enumerate(factors):
+            # Timed for each configuration, not shared across a filter's rows
+            cost = sample_cost(name, factor, traces[0][1], traces[0][2])
+            details = {trace_name: {metric: _number(values[index]) for metric, values in metrics.items()}
+                       for trace_name, metrics in per_trace}
+            results.append({
+                'filter': name,
+                'smoothing_factor': factor,
+                'jitter_px': _nanmean([metrics['jitter_px'][index] for _, metrics in per_trace]),
+                'lag_ms': _nanmean([metrics['lag_ms'][index] for _, metrics in per_trace]),
+                'overshoot_px': _number(max(metrics['overshoot_px'][index] for _, metrics in per_trace)),
+                'cost_us': cost,
+                'traces': details,
+            })
+    return results
+
+
+def _nanmean(values):
+    """
+    Mean of the values that are not NaN, or None if there are none.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+def _number(value):
+    """
+    Convert a metric to a JSON-friendly float (None for NaN).
+    """
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def print_table(results):
+    """
+    Print benchmark results as a table.
+    """
+    def cell(value, digits=1):
+        return 'n/a' if value is None else f"{value:.{digits}f}"
+
+    print(f"{'Filter':<10} {'Factor':>6} {'Jitter px':>10} {'Lag ms':>8} {'Overshoot px':>13} {'Cost us':>8}")
     print("-" * 60)
-    
-    for i, (raw_x, raw_y) in enumerate(raw_positions):
-        # Apply exponential moving average (EMA)
-        ema_x = prev_x + (raw_x - prev_x) / smoothing_factor
-        ema_y = prev_y + (raw_y - prev_y) / smoothing_factor
-        
-        # Add to buffer
-        x_buffer.append(ema_x)
-        y_buffer.append(ema_y)
-        
-        # Apply moving average filter
-        smoothed_x = np.mean(x_buffer)
-        smoothed_y = np.mean(y_buffer)
-        
-        # Calculate difference
-        diff = np.sqrt((smoothed_x - raw_x)**2 + (smoothed_y - raw_y)**2)
-        
-        print(f"{i+1:<8} ({raw_x}, {raw_y}){'':<8} ({smoothed_x:.1f}, {smoothed_y:.1f}){'':<8} {diff:.2f}px")
-        
-        # Update previous position
-        prev_x = smoothed_x
-        prev_y = smoothed_y
-    
-    print("\n" + "="*60)
-    print("Benefits of Dual Smoothing:")
-    print("="*60)
-    print("1. Exponential Moving Average (EMA):")
-    print("   - Reduces sudden jumps in cursor position")
-    print("   - Formula: new_pos = prev_pos + (target - prev_pos) / factor")
-    print(f"   - Current factor: {smoothing_factor} (higher = smoother, slower)")
-    print()
-    print("2. Moving Average Filter:")
-    print("   - Averages last N positions for additional stability")
-    print(f"   - Current buffer size: {buffer_size} positions")
-    print("   - Eliminates high-frequency jitter")
-    print()
-    print("3. Combined Effect:")
-    print("   - Much smoother cursor movement")
-    print("   - Reduced sensitivity to hand tremors")
-    print("   - More natural and controllable experience")
-    print("="*60)
+    for result in results:
+        print(f"{result['filter']:<10} {result['smoothing_factor']:>6g} {cell(result['jitter_px'], 2):>10} "
+              f"{cell(result['lag_ms'], 0):>8} {cell(result['overshoot_px']):>13} {cell(result['cost_us']):>8}")
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line options.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark cursor smoothing filters on fingertip traces")
+    parser.add_argument('--trace', action='append', default=[], metavar='PATH',
+                        help="Landmark trace recorded with main.py --record-trace (repeatable; "
+                             "default: synthetic traces)")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="Also include the synthetic traces when --trace is given")
+    parser.add_argument('--factors', default='3,5,7,10,15',
+                        help="Comma-separated smoothing factors to try (default: 3,5,7,10,15)")
+    parser.add_argument('--filters', default=','.join(SMOOTHERS),
+                        help=f"Comma-separated filters to try (default: {','.join(SMOOTHERS)})")
+    parser.add_argument('--fps', type=float, default=30.0,
+                        help="Sample rate of the synthetic traces (default: 30)")
+    parser.add_argument('--noise', type=float, default=4.0,
+                        help="Tracking noise of the synthetic traces in screen pixels (default: 4)")
+    parser.add_argument('--screen-size', default='1920x1080', metavar='WxH',
+                        help="Screen the recorded fingertip is mapped to (default: 1920x1080)")
+    parser.add_argument('--latency', type=float, default=0.0, metavar='MS',
+                        help="Pipeline latency from capture to cursor in ms, added to the lag (default: 0)")
+    parser.add_argument('--predict', action='store_true',
+                        help="Lead the cursor by --latency with the latency compensator")
+    parser.add_argument('--json', metavar='PATH', default=None,
+                        help="Write the results as JSON to PATH ('-' for stdout) instead of a table")
+    args = parser.parse_args(argv)
+
+    try:
+        args.factors = [float(value) for value in args.factors.split(',')]
+        args.screen_size = tuple(int(value) for value in args.screen_size.lower().split('x'))
+    except ValueError:
+        parser.error("--factors must be numbers and --screen-size must look like 1920x1080")
+    args.filters = [name.strip() for name in args.filters.split(',')]
+    unknown = [name for name in args.filters if name not in SMOOTHERS]
+    if unknown:
+        parser.error(f"Unknown filters: {', '.join(unknown)} (choose from {', '.join(SMOOTHERS)})")
+    return args
+
+
+def main(argv=None):
+    """
+    Run the smoothing benchmark.
+    """
+    args = parse_args(argv)
+
+    traces = []
+    for path in args.trace:
+        traces.extend(recorded_traces(path, screen_size=args.screen_size))
+    if not args.trace or args.synthetic:
+        traces.extend(synthetic_traces(fps=args.fps, noise=args.noise))
+    if not traces:
+        print("✗ No usable trace segments (need at least 30 frames with a hand)")
+        return 1
+
+    results = benchmark(traces, args.factors, args.filters, args.latency / 1000.0, args.predict)
+
+    if args.json:
+        document = {'traces': [name for name, _, _, _ in traces], 'results': results}
+        if args.json == '-':
+            json.dump(document, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, 'w', encoding='utf-8') as output_file:
+                json.dump(document, output_file, indent=2)
+            print(f"✓ Wrote {len(results)} results to {args.json}")
+    else:
+        print(f"Traces: {', '.join(name for name, _, _, _ in traces)}\n")
+        print_table(results)
+    return 0
 
 
 if __name__ == "__main__":
-    smooth_movement_demo()
+    sys.exit(main())
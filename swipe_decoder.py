@@ -0,0 +1,146 @@
+"""
+Swipe Decoder Module
+Turns a fingertip path across the virtual keyboard into the most likely words.
+
+The path is resampled to a fixed number of points and compared with the key
+centres of every letter once, giving a letter x point distance table. A
+backward pass then finds, for every letter and path position, the cheapest
+later point to match that letter. Decoding walks the lexicon trie with a
+pruned beam search: each step extends the best partial words by one letter
+with a table lookup, so the cost depends on the beam width and word length,
+not on the size of the dictionary.
+"""
+
+import heapq
+import numpy as np
+
+
+class SwipeDecoder:
+    """
+    Decodes swipe gestures against a Lexicon for one keyboard layer.
+    """
+
+    def __init__(self, lexicon, key_rectangles, num_points=32, beam_width=48,
+                 skip_penalty=0.05, length_weight=0.5, frequency_weight=0.3):
+        """
+        Initialize the SwipeDecoder.
+
+        Args:
+            lexicon (Lexicon): Words to decode against.
+            key_rectangles (dict): Key label -> (x, y, width, height); single-letter keys are used.
+            num_points (int): Number of points the path is resampled to.
+            beam_width (int): Partial words kept per step.
+            skip_penalty (float): Cost per path point skipped between matched letters.
+            length_weight (float): Weight of the difference between the path length and the
+                word's ideal length (in key widths).
+            frequency_weight (float): Weight of the word's negative log probability.
+        """
+        self.lexicon = lexicon
+        self.num_points = num_points
+        self.beam_width = beam_width
+        self.skip_penalty = skip_penalty
+        self.length_weight = length_weight
+        self.frequency_weight = frequency_weight
+
+        letter_keys = [key for key in key_rectangles if len(key) == 1 and key.isalpha()]
+        self.letter_index = {key: index for index, key in enumerate(letter_keys)}
+        self.centers = np.array([(x + w / 2.0, y + h / 2.0)
+                                 for x, y, w, h in (key_rectangles[key] for key in letter_keys)],
+                                dtype=np.float64).reshape(-1, 2)
+        self.key_size = float(np.median([key_rectangles[key][3] for key in letter_keys])) \
+            if letter_keys else 1.0
+
+    def _resample(self, path):
+        """
+        Resample a path to num_points points evenly spaced along its length.
+
+        Returns:
+            tuple: ((num_points, 2) points, total path length in pixels).
+        """
+        points = np.asarray(path, dtype=np.float64).reshape(-1, 2)
+        steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        distance = np.concatenate(([0.0], np.cumsum(steps)))
+        length = distance[-1]
+        if length <= 0:
+            return np.repeat(points[:1], self.num_points, axis=0), 0.0
+
+        targets = np.linspace(0.0, length, self.num_points)
+        resampled = np.empty((self.num_points, 2))
+        resampled[:, 0] = np.interp(targets, distance, points[:, 0])
+        resampled[:, 1] = np.interp(targets, distance, points[:, 1])
+        return resampled, length
+
+    def decode(self, path, max_results=3):
+        """
+        Find the words that best match a swipe path.
+
+        Args:
+            path (list): (x, y) fingertip positions in frame pixels, in order.
+            max_results (int): Number of candidates to return.
+
+        Returns:
+            list: (word, score) tuples, best (lowest score) first.
+        """
+        if len(path) < 2 or len(self.letter_index) == 0:
+            return []
+
+        points, path_length = self._resample(path)
+        last = self.num_points - 1
+
+        # Distance of every letter key to every path point, in key widths
+        distances = np.linalg.norm(self.centers[:, None, :] - points[None, :, :], axis=2) / self.key_size
+
+        # best_cost[l, i]: cheapest match of letter l at a point j >= i (paying for skipped
+        # points), best_point[l, i]: that point
+        best_cost = distances.copy()
+        best_point = np.tile(np.arange(self.num_points), (len(self.centers), 1))
+        for i in range(last - 1, -1, -1):
+            later = best_cost[:, i + 1] + self.skip_penalty
+            use_later = later < best_cost[:, i]
+            best_cost[use_later, i] = later[use_later]
+            best_point[use_later, i] = best_point[use_later, i + 1]
+        best_cost = best_cost.tolist()
+        best_point = best_point.tolist()
+        end_cost = distances[:, last].tolist()
+        centers = self.centers.tolist()
+
+        # Beam entries: (cost, ideal length, trie node, path position, last letter index)
+        beam = []
+        for letter, child in self.lexicon.root.children.items():
+            index = self.letter_index.get(letter)
+            if index is not None:
+                # The first letter is anchored to the start of the path
+                beam.append((float(distances[index, 0]), 0.0, child, 0, index))
+        beam = heapq.nsmallest(self.beam_width, beam, key=lambda entry: entry[0])
+
+        results = {}
+        while beam:
+            expanded = []
+            for cost, ideal_length, node, position, previous in beam:
+                if node.word is not None:
+                    self._add_result(results, node, cost + end_cost[previous], ideal_length, path_length)
+
+                px, py = centers[previous]
+                for letter, child in node.children.items():
+                    index = self.letter_index.get(letter)
+                    if index is None:
+                        continue
+                    cx, cy = centers[index]
+                    expanded.append((cost + best_cost[index][position],
+                                     ideal_length + ((cx - px) ** 2 + (cy - py) ** 2) ** 0.5,
+                                     child, best_point[index][position], index))
+
+            beam = heapq.nsmallest(self.beam_width, expanded, key=lambda entry: entry[0])
+
+        ranked = sorted(results.items(), key=lambda item: item[1])
+        return ranked[:max_results]
+
+    def _add_result(self, results, node, match_cost, ideal_length, path_length):
+        """
+        Score a complete word and keep it if it is the best score for that word.
+        """
+        length_cost = abs(path_length - ideal_length) / self.key_size
+        score = (match_cost + self.length_weight * length_cost
+                 - self.frequency_weight * self.lexicon.log_probability(node.count))
+        if score < results.get(node.word, float('inf')):
+            results[node.word] = score
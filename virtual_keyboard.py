@@ -1,13 +1,26 @@
 """
 Virtual Keyboard Module
 Displays a semi-transparent QWERTY keyboard overlay on the video feed.
-Supports hover detection and key typing using pyautogui.
+Supports hover detection and key typing through an output backend
+(pyautogui by default, see output_backends.py).
+
+The keys come from a compiled layout (see keyboard_layout.py), so hover
+and click lookups are a single label map index and layers (symbols, number
+pad) switch instantly. With a lexicon, pinching and dragging across the
+letters types whole words (swipe typing, see swipe_decoder.py). With a word
+predictor, a suggestion bar above the keys completes the current word.
+Each layer is rendered once into a sprite (plus a
+mask of the key pixels) with normal, hover and pressed variants. Each frame
+only patches the keys whose state changed and blends the keyboard's
+bounding region.
 """
 
 import cv2
 import numpy as np
-import pyautogui
 import time
+from keyboard_layout import QWERTY_LAYOUT, compile_layout
+from swipe_decoder import SwipeDecoder
+from output_backends import PyAutoGuiBackend
 
 
 class VirtualKeyboard:
@@ -15,30 +28,28 @@ class VirtualKeyboard:
     A class to create and manage a virtual on-screen keyboard overlay.
     """
 
-    def __init__(self, frame_width=640, frame_height=480):
+    def __init__(self, frame_width=640, frame_height=480, layout=QWERTY_LAYOUT, lexicon=None,
+                 predictor=None, output=None, backend=None):
         """
         Initialize the VirtualKeyboard.
         
         Args:
             frame_width (int): Width of the video frame.
             frame_height (int): Height of the video frame.
+            layout (dict): Declarative keyboard layout (see keyboard_layout.py).
+            lexicon (Lexicon): Word list for swipe typing; None disables swipe typing.
+            predictor (WordPredictor): Word completion for the suggestion bar; None hides the bar.
+            output (OutputQueue): Queue that performs the keystrokes; None types directly.
+            backend (OutputBackend): Backend that injects the keystrokes; None uses pyautogui.
         """
         self.frame_width = frame_width
         self.frame_height = frame_height
+        self.output = output
+        self.backend = backend if backend is not None else PyAutoGuiBackend()
         
-        # Define keyboard layout (QWERTY)
-        self.keys = [
-            ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0'],
-            ['Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P'],
-            ['A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L'],
-            ['Z', 'X', 'C', 'V', 'B', 'N', 'M', 'BACK'],
-            ['SPACE', 'ENTER']
-        ]
-        
-        # Keyboard positioning and sizing
+        # Keyboard positioning and sizing (key sizes are for a 640px wide frame)
         self.keyboard_y_offset = int(frame_height * 0.55)  # Start at 55% of frame height
         self.key_width = 50
-        self.key_height = 50
         self.key_margin = 10
         
         # Colors (BGR format)
@@ -57,85 +68,222 @@ class VirtualKeyboard:
         self.last_typed_key = None
         self.last_typed_time = 0
         self.typing_cooldown = 0.5  # Cooldown between key presses
+        self.press_flash_duration = 0.2  # Seconds a typed key shows the pressed colour
+        
+        # Compile the layout for this frame size
+        self.layout = compile_layout(layout, frame_width, frame_height,
+                                     key_size=self.key_width, key_margin=self.key_margin)
+        self.blend_buffer = None  # Reused blend output for the keyboard region
+        
+        # Pre-rendered sprites per layer: layer name -> (state -> sprite, key mask)
+        self.layer_sprites = {}
+        self.sprite = None         # Working sprite with the current key states patched in
+        self.sprite_variants = {}  # Key state -> sprite with every key in that state
+        self.key_mask = None       # Pixels covered by keys (everything else is left untouched)
+        self.key_states = {}       # Keys currently patched to a non-normal state
+        
+        # Swipe typing
+        self.lexicon = lexicon
+        self.swipe_enabled = lexicon is not None
+        self.swipe_decoders = {}   # Layer name -> SwipeDecoder (built on first swipe)
+        self.swipe_path = []       # Fingertip positions of the current swipe
+        self.max_swipe_points = 512
+        
+        # Suggestion bar (laid out per layer above the keys)
+        self.predictor = predictor
+        self.suggestion_rectangles = []
+        self.suggestion_color = (90, 60, 30)
+        
+        self.set_layer(self.layout.default_layer)
+    
+    def set_layer(self, name):
+        """
+        Switch to another layer of the layout (e.g. symbols or the number pad).
         
-        # Build key rectangles
-        self.key_rectangles = self._build_key_rectangles()
+        Args:
+            name (str): Layer name.
+        """
+        self.layer = self.layout.layers[name]
+        self.key_rectangles = self.layer.key_rectangles
+        self.keyboard_bounds = self.layer.bounds
+        
+        # Hover and swipe state belong to the old layer's keys
+        self.current_hover_key = None
+        self.hover_start_time = None
+        self.sprite = None
+        self.swipe_path = []
+        self.suggestion_rectangles = self._build_suggestion_rectangles()
     
-    def _build_key_rectangles(self):
+    def _build_suggestion_rectangles(self):
         """
-        Build rectangles for each key based on layout.
+        Lay out the suggestion slots in a row just above the current layer's keys.
         
         Returns:
-            dict: Dictionary mapping key names to their (x, y, width, height) rectangles.
+            list: (x, y, width, height) for each slot, empty without a predictor.
         """
-        key_rects = {}
-        y_pos = self.keyboard_y_offset
-        
-        for row_idx, row in enumerate(self.keys):
-            # Calculate total width of this row to center it
-            row_width = len(row) * self.key_width + (len(row) - 1) * self.key_margin
-            
-            # Special width for SPACE and BACK keys
-            if 'SPACE' in row:
-                row_width = 400  # SPACE takes most of the width
-            
-            x_pos = (self.frame_width - row_width) // 2
-            
-            for key in row:
-                if key == 'SPACE':
-                    # SPACE key is extra wide
-                    width = 250
-                elif key == 'BACK':
-                    # BACK key is wider
-                    width = 80
-                elif key == 'ENTER':
-                    # ENTER key is wider
-                    width = 120
-                else:
-                    width = self.key_width
-                
-                key_rects[key] = (x_pos, y_pos, width, self.key_height)
-                x_pos += width + self.key_margin
-            
-            y_pos += self.key_height + self.key_margin
+        if self.predictor is None:
+            return []
+        
+        x0, y0, x1, y1 = self.keyboard_bounds
+        slots = self.predictor.max_suggestions
+        gap = max(2, self.layer.key_size // 5)
+        height = max(12, int(self.layer.key_size * 0.7))
+        width = (x1 - x0 - (slots - 1) * gap) // slots
+        y = max(0, y0 - gap - height)
+        return [(x0 + slot * (width + gap), y, width, height) for slot in range(slots)]
+    
+    def _suggestion_at(self, cursor_x, cursor_y):
+        """
+        Find the suggestion slot under a point.
         
-        return key_rects
+        Returns:
+            int or None: Index of a slot that currently holds a suggestion, or None.
+        """
+        if self.predictor is None:
+            return None
+        for slot, (x, y, w, h) in enumerate(self.suggestion_rectangles[:len(self.predictor.suggestions)]):
+            if x <= cursor_x <= x + w and y <= cursor_y <= y + h:
+                return slot
+        return None
     
-    def draw_keyboard(self, frame):
+    def _render_sprite(self, color, mask=None):
         """
-        Draw the virtual keyboard overlay on the frame.
+        Render every key of the keyboard region with one key colour.
         
         Args:
-            frame (numpy.ndarray): The video frame to draw on.
+            color (tuple): BGR key colour.
+            mask (numpy.ndarray): Optional single-channel mask to mark key pixels in.
         
         Returns:
-            numpy.ndarray: Frame with keyboard overlay.
+            numpy.ndarray: The rendered keyboard region.
         """
-        # Create a copy to draw the overlay
-        overlay = frame.copy()
+        x0, y0, x1, y1 = self.keyboard_bounds
+        sprite = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        font_scale = 0.6 * self.layer.key_size / self.key_width
         
-        # Draw each key
+        # Draw each key (shifted into region coordinates)
         for key, (x, y, w, h) in self.key_rectangles.items():
-            # Determine key color based on state
-            if key == self.current_hover_key:
-                color = self.key_hover_color
-            else:
-                color = self.key_color
+            x -= x0
+            y -= y0
             
             # Draw key rectangle with rounded corners effect
-            cv2.rectangle(overlay, (x, y), (x + w, y + h), color, -1)
-            cv2.rectangle(overlay, (x, y), (x + w, y + h), (255, 255, 255), 2)
+            cv2.rectangle(sprite, (x, y), (x + w, y + h), color, -1)
+            cv2.rectangle(sprite, (x, y), (x + w, y + h), (255, 255, 255), 2)
+            if mask is not None:
+                cv2.rectangle(mask, (x, y), (x + w, y + h), 255, -1)
+                cv2.rectangle(mask, (x, y), (x + w, y + h), 255, 2)
             
             # Draw key text
-            text_size = cv2.getTextSize(key, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+            text_size = cv2.getTextSize(key, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 2)[0]
             text_x = x + (w - text_size[0]) // 2
             text_y = y + (h + text_size[1]) // 2
-            cv2.putText(overlay, key, (text_x, text_y), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, self.text_color, 2)
+            cv2.putText(sprite, key, (text_x, text_y), 
+                       cv2.FONT_HERSHEY_SIMPLEX, font_scale, self.text_color, 2)
+        
+        return sprite
+    
+    def _build_sprites(self):
+        """
+        Pre-render the current layer in every key state, plus the key mask.
+        Layers are rendered once and reused whenever they are shown again.
+        """
+        if self.layer.name not in self.layer_sprites:
+            x0, y0, x1, y1 = self.keyboard_bounds
+            mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+            variants = {
+                'normal': self._render_sprite(self.key_color, mask),
+                'hover': self._render_sprite(self.key_hover_color),
+                'pressed': self._render_sprite(self.key_pressed_color),
+            }
+            self.layer_sprites[self.layer.name] = (variants, mask)
+        
+        self.sprite_variants, self.key_mask = self.layer_sprites[self.layer.name]
+        self.sprite = self.sprite_variants['normal'].copy()
+        self.key_states = {}
+    
+    def _key_tile(self, key):
+        """
+        Get the sprite slice covered by a key, including its outline.
+        
+        Returns:
+            tuple: (row slice, column slice) in sprite coordinates.
+        """
+        x0, y0, x1, y1 = self.keyboard_bounds
+        x, y, w, h = self.key_rectangles[key]
+        border = 2  # Key outline thickness
+        return (slice(max(0, y - border - y0), max(0, y + h + border + 1 - y0)),
+                slice(max(0, x - border - x0), max(0, x + w + border + 1 - x0)))
+    
+    def _patch_key_states(self):
+        """
+        Copy the hover and pressed variants of the affected keys into the working sprite.
+        """
+        states = {}
+        if self.last_typed_key in self.key_rectangles and self.last_typed_key not in self.layer.switches and \
+                time.time() - self.last_typed_time < self.press_flash_duration:
+            states[self.last_typed_key] = 'pressed'
+        if self.current_hover_key in self.key_rectangles and self.current_hover_key not in states:
+            states[self.current_hover_key] = 'hover'
+        
+        if states == self.key_states:
+            return
+        
+        for key in set(self.key_states) | set(states):
+            state = states.get(key, 'normal')
+            if self.key_states.get(key, 'normal') != state:
+                tile = self._key_tile(key)
+                self.sprite[tile] = self.sprite_variants[state][tile]
+        self.key_states = states
+    
+    def draw_keyboard(self, frame):
+        """
+        Draw the virtual keyboard overlay on the frame.
+        
+        Args:
+            frame (numpy.ndarray): The video frame to draw on.
+        
+        Returns:
+            numpy.ndarray: Frame with keyboard overlay.
+        """
+        x0, y0, x1, y1 = self.keyboard_bounds
+        if x1 <= x0 or y1 <= y0:
+            return frame
+        
+        if self.sprite is None:
+            self._build_sprites()
+        self._patch_key_states()
         
-        # Blend overlay with original frame for transparency
-        cv2.addWeighted(overlay, self.keyboard_alpha, frame, 1 - self.keyboard_alpha, 0, frame)
+        # Blend the sprite with the keyboard region only, then keep the result on key pixels
+        region = frame[y0:y1, x0:x1]
+        if self.blend_buffer is None or self.blend_buffer.shape != region.shape:
+            self.blend_buffer = np.empty_like(region)
+        cv2.addWeighted(self.sprite, self.keyboard_alpha, region, 1 - self.keyboard_alpha, 0,
+                        dst=self.blend_buffer)
+        cv2.copyTo(self.blend_buffer, self.key_mask, dst=region)
         
+        self.draw_suggestions(frame)
+        return frame
+    
+    def draw_suggestions(self, frame):
+        """
+        Draw the suggestion bar for the word being typed.
+        
+        Args:
+            frame (numpy.ndarray): The video frame to draw on.
+        
+        Returns:
+            numpy.ndarray: Frame with the suggestion bar.
+        """
+        if self.predictor is None:
+            return frame
+        
+        font_scale = 0.55 * self.layer.key_size / self.key_width
+        for word, (x, y, w, h) in zip(self.predictor.suggestions, self.suggestion_rectangles):
+            cv2.rectangle(frame, (x, y), (x + w, y + h), self.suggestion_color, -1)
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 255, 255), 1)
+            text_size = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)[0]
+            cv2.putText(frame, word, (x + (w - text_size[0]) // 2, y + (h + text_size[1]) // 2), 
+                       cv2.FONT_HERSHEY_SIMPLEX, font_scale, self.text_color, 1)
         return frame
     
     def check_hover(self, cursor_x, cursor_y):
@@ -150,13 +298,9 @@ class VirtualKeyboard:
             tuple: (hovered_key, hover_progress) or (None, 0) if not hovering.
         """
         current_time = time.time()
-        hovered_key = None
         
         # Check which key the cursor is over
-        for key, (x, y, w, h) in self.key_rectangles.items():
-            if x <= cursor_x <= x + w and y <= cursor_y <= y + h:
-                hovered_key = key
-                break
+        hovered_key = self.layer.key_at(cursor_x, cursor_y)
         
         # Update hover state
         if hovered_key:
@@ -205,39 +349,193 @@ class VirtualKeyboard:
         if current_time - self.last_typed_time < self.typing_cooldown:
             return None
         
+        # Suggestions above the keys complete the current word
+        slot = self._suggestion_at(cursor_x, cursor_y)
+        if slot is not None:
+            word = self.pick_suggestion(slot)
+            self.last_typed_time = current_time
+            return word
+        
         # Check which key was clicked
-        for key, (x, y, w, h) in self.key_rectangles.items():
-            if x <= cursor_x <= x + w and y <= cursor_y <= y + h:
-                self.type_key(key)
-                self.last_typed_key = key
-                self.last_typed_time = current_time
-                return key
+        key = self.layer.key_at(cursor_x, cursor_y)
+        if key is None:
+            return None
         
-        return None
+        self.type_key(key)
+        self.last_typed_key = key
+        self.last_typed_time = current_time
+        return key
+    
+    def _send(self, kind, function, *args):
+        """
+        Perform a keystroke, on the output queue if there is one.
+        
+        Args:
+            kind (str): Action kind for the output statistics.
+            function (function): The output backend method to call.
+        """
+        if self.output is not None:
+            self.output.submit(kind, function, *args)
+        else:
+            function(*args)
     
     def type_key(self, key):
         """
-        Type the specified key using pyautogui.
+        Type the specified key through the output backend.
         
         Args:
             key (str): The key to type.
         """
+        if key in self.layer.switches:
+            # Layer switch keys change the keyboard instead of typing
+            self.set_layer(self.layer.switches[key])
+            print(f"✓ Keyboard layer: {self.layer.name}")
+            return
+        
         try:
             if key == 'SPACE':
-                pyautogui.press('space')
+                self._send('key', self.backend.press, 'space')
                 print(f"✓ Typed: [SPACE]")
             elif key == 'ENTER':
-                pyautogui.press('enter')
+                self._send('key', self.backend.press, 'enter')
                 print(f"✓ Typed: [ENTER]")
             elif key == 'BACK':
-                pyautogui.press('backspace')
+                self._send('key', self.backend.press, 'backspace')
                 print(f"✓ Typed: [BACKSPACE]")
             else:
                 # Regular character
-                pyautogui.press(key.lower())
+                self._send('key', self.backend.press, key.lower())
                 print(f"✓ Typed: {key}")
         except Exception as e:
             print(f"✗ Error typing key '{key}': {e}")
+            return
+        
+        # Follow the word being typed for the suggestion bar
+        if self.predictor is not None:
+            if len(key) == 1 and key.isalpha():
+                self.predictor.add_letter(key)
+            elif key == 'BACK':
+                self.predictor.backspace()
+            else:
+                self.predictor.end_word()
+    
+    def pick_suggestion(self, slot):
+        """
+        Type the rest of a suggested word (and a space) with one output call.
+        
+        Args:
+            slot (int): Index of the suggestion.
+        
+        Returns:
+            str or None: The completed word, or None if the slot is empty.
+        """
+        if self.predictor is None or slot >= len(self.predictor.suggestions):
+            return None
+        
+        word = self.predictor.suggestions[slot]
+        try:
+            self._send('type', self.backend.type_text, self.predictor.completion_text(word).lower() + ' ')
+        except Exception as e:
+            print(f"✗ Error typing word '{word}': {e}")
+            return None
+        
+        print(f"✓ Completed word: {word}")
+        self.last_typed_key = word
+        self.predictor.learn(word)
+        self.predictor.reset()
+        return word
+    
+    def update_swipe(self, cursor_x, cursor_y, pinched):
+        """
+        Track a swipe: the path is recorded while pinched and decoded on release.
+        
+        A swipe has to start on a key. If it never leaves that key it counts as
+        a normal click on it.
+        
+        Args:
+            cursor_x (int): X coordinate of cursor in frame.
+            cursor_y (int): Y coordinate of cursor in frame.
+            pinched (bool): Whether the thumb and index finger are pinched.
+        
+        Returns:
+            str or None: The word or key typed when the swipe ended, otherwise None.
+        """
+        if not pinched:
+            return self.end_swipe()
+        
+        if not self.swipe_path and self.layer.key_at(cursor_x, cursor_y) is None:
+            # Not a swipe - but a pinch on the suggestion bar picks a suggestion
+            if self._suggestion_at(cursor_x, cursor_y) is not None:
+                return self.handle_click(cursor_x, cursor_y)
+            return None
+        if len(self.swipe_path) < self.max_swipe_points:
+            self.swipe_path.append((int(cursor_x), int(cursor_y)))
+        return None
+    
+    def end_swipe(self):
+        """
+        Finish the current swipe (if any) and type the decoded word.
+        
+        Returns:
+            str or None: The word or key typed, or None if nothing was typed.
+        """
+        path, self.swipe_path = self.swipe_path, []
+        if not path:
+            return None
+        
+        keys = {self.layer.key_at(x, y) for x, y in path} - {None}
+        if len(keys) <= 1:
+            # Never left the first key - a plain click
+            return self.handle_click(*path[0])
+        
+        decoder = self.swipe_decoders.get(self.layer.name)
+        if decoder is None:
+            decoder = SwipeDecoder(self.lexicon, self.key_rectangles)
+            self.swipe_decoders[self.layer.name] = decoder
+        
+        candidates = decoder.decode(path)
+        if not candidates:
+            print("✗ Swipe not recognized")
+            return None
+        
+        word = candidates[0][0]
+        self.type_word(word)
+        return word
+    
+    def type_word(self, word):
+        """
+        Type a whole word followed by a space with one output call.
+        
+        Args:
+            word (str): The word to type.
+        """
+        try:
+            self._send('type', self.backend.type_text, word.lower() + ' ')
+            self.last_typed_key = word
+            self.last_typed_time = time.time()
+            print(f"✓ Typed word: {word}")
+        except Exception as e:
+            print(f"✗ Error typing word '{word}': {e}")
+            return
+        
+        if self.predictor is not None:
+            self.predictor.learn(word)
+            self.predictor.reset()
+    
+    def draw_swipe_path(self, frame):
+        """
+        Draw the trail of the swipe in progress.
+        
+        Args:
+            frame (numpy.ndarray): The video frame to draw on.
+        
+        Returns:
+            numpy.ndarray: Frame with the swipe trail.
+        """
+        if len(self.swipe_path) > 1:
+            points = np.array(self.swipe_path, dtype=np.int32).reshape(-1, 1, 2)
+            cv2.polylines(frame, [points], False, self.key_pressed_color, 3)
+        return frame
     
     def draw_hover_indicator(self, frame, key, progress):
         """
@@ -294,7 +592,11 @@ class VirtualKeyboard:
         if self.last_typed_key and (time.time() - self.last_typed_time < 2.0):
             # Show last typed key for 2 seconds
             text = f"Typed: {self.last_typed_key}"
-            cv2.putText(frame, text, (10, self.keyboard_y_offset - 20), 
+            text_y = self.keyboard_y_offset - 20
+            if self.suggestion_rectangles:
+                # Keep clear of the suggestion bar
+                text_y = self.suggestion_rectangles[0][1] - 10
+            cv2.putText(frame, text, (10, text_y), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         return frame
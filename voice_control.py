@@ -5,11 +5,11 @@ Supports commands for opening applications, typing text, and keyboard actions.
 """
 
 import speech_recognition as sr
-import pyautogui
 import subprocess
 import threading
 import time
 import os
+from output_backends import PyAutoGuiBackend
 
 
 class VoiceController:
@@ -18,18 +18,23 @@ class VoiceController:
     Runs in a separate thread to avoid blocking the main application.
     """
 
-    def __init__(self, callback=None):
+    def __init__(self, callback=None, output=None, backend=None):
         """
         Initialize the VoiceController.
         
         Args:
             callback (function): Optional callback function to report status/commands.
+            output (OutputQueue): Optional queue that performs the keystrokes in order
+                with the mouse actions; None types on the listening thread.
+            backend (OutputBackend): Backend that injects the keystrokes; None uses pyautogui.
         """
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         self.is_listening = False
         self.thread = None
         self.callback = callback
+        self.output = output
+        self.backend = backend if backend is not None else PyAutoGuiBackend()
         self.stop_flag = threading.Event()
         
         # Configure recognizer for better performance
@@ -221,15 +226,21 @@ class VoiceController:
 
     def _type_text(self, text):
         """
-        Type text using pyautogui.
+        Type text through the output backend.
         
         Args:
             text (str): The text to type.
         """
         try:
             # Small delay to allow user to focus on target window
+            # (on this listening thread, so it never holds up other output)
             time.sleep(0.2)
-            pyautogui.typewrite(text, interval=0.05)
+            if self.output is not None:
+                # One queued call for the whole text - a per-character interval
+                # would stall every mouse action queued behind it
+                self.output.submit('type', self.backend.type_text, text)
+            else:
+                self.backend.type_text(text)
             print(f"✓ Voice: Typed '{text}'")
             if self.callback:
                 self.callback(f"Typed: {text}")
@@ -244,7 +255,10 @@ class VoiceController:
             key (str): The key name to press.
         """
         try:
-            pyautogui.press(key)
+            if self.output is not None:
+                self.output.submit('key', self.backend.press, key)
+            else:
+                self.backend.press(key)
             print(f"✓ Voice: Pressed '{key}'")
             if self.callback:
                 self.callback(f"Pressed: {key}")
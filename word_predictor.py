@@ -0,0 +1,172 @@
+"""
+Word Predictor Module
+Word completion for the virtual keyboard's suggestion bar.
+
+WordPredictor follows the word being typed one key at a time: each letter
+steps one node down the lexicon trie (a backspace steps back up), so the
+list is never rescanned. Suggestions are the most frequent words below the
+current node and are only recomputed when the prefix changes.
+
+Finished words are learned: their counts go up so they rank higher next
+time, and new words are added. Learned counts are capped in number, and
+saved to a small JSON cache so they survive restarts.
+"""
+
+import json
+import os
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.gesture_control', 'learned_words.json')
+
+
+class WordPredictor:
+    """
+    Incremental prefix tracking and frequency-ranked word suggestions.
+    """
+
+    def __init__(self, lexicon, cache_path=DEFAULT_CACHE_PATH, max_suggestions=3,
+                 max_learned_words=2000, learn_boost=50):
+        """
+        Initialize the WordPredictor.
+
+        Args:
+            lexicon (Lexicon): Words to suggest from (learned words are added to it).
+            cache_path (str): JSON file with learned word counts, or None to keep them in memory only.
+            max_suggestions (int): Number of suggestions offered at once.
+            max_learned_words (int): Maximum number of learned words kept.
+            learn_boost (int): Count added each time a word is used.
+        """
+        self.lexicon = lexicon
+        self.cache_path = cache_path
+        self.max_suggestions = max_suggestions
+        self.max_learned_words = max_learned_words
+        self.learn_boost = learn_boost
+
+        # Word currently being typed and the trie nodes along it (None once it
+        # leaves the lexicon)
+        self.prefix = ''
+        self.nodes = [lexicon.root]
+
+        self.suggestions = []
+        self.learned = {}  # Word -> count added by learning
+        self.dirty = False
+
+        self._load()
+
+    def _load(self):
+        """
+        Load learned words from the cache file, if there is one.
+        """
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                learned = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            print(f"✗ Warning: Could not read learned words from {self.cache_path}: {e}")
+            return
+
+        for word, count in learned.items():
+            if isinstance(word, str) and word.isalpha() and isinstance(count, int) and count > 0:
+                self.learned[word.upper()] = count
+                self.lexicon.add_word(word, count)
+        self._trim()
+
+    def save(self):
+        """
+        Write learned words to the cache file if they changed.
+        """
+        if not self.cache_path or not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(self.learned, cache_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"✗ Warning: Could not save learned words to {self.cache_path}: {e}")
+
+    def _update_suggestions(self):
+        """
+        Recompute suggestions for the current prefix.
+        """
+        node = self.nodes[-1]
+        if not self.prefix or node is None:
+            self.suggestions = []
+        else:
+            self.suggestions = self.lexicon.completions_from(node, self.max_suggestions)
+
+    def add_letter(self, letter):
+        """
+        Extend the current word by one typed letter.
+
+        Args:
+            letter (str): The typed letter.
+        """
+        node = self.nodes[-1]
+        self.prefix += letter.upper()
+        self.nodes.append(node.children.get(letter.upper()) if node is not None else None)
+        self._update_suggestions()
+
+    def backspace(self):
+        """
+        Remove the last letter of the current word.
+        """
+        if self.prefix:
+            self.prefix = self.prefix[:-1]
+            self.nodes.pop()
+            self._update_suggestions()
+
+    def end_word(self):
+        """
+        Finish the current word (space, enter, punctuation) and learn it.
+        """
+        if self.prefix:
+            self.learn(self.prefix)
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the current word without learning it.
+        """
+        self.prefix = ''
+        self.nodes = [self.lexicon.root]
+        self.suggestions = []
+
+    def completion_text(self, word):
+        """
+        Get the part of a suggestion that still has to be typed.
+
+        Args:
+            word (str): A suggested word.
+
+        Returns:
+            str: The rest of the word after the current prefix.
+        """
+        return word[len(self.prefix):] if word.startswith(self.prefix) else word
+
+    def learn(self, word):
+        """
+        Count a finished word so it is suggested more readily.
+
+        Args:
+            word (str): The word that was typed.
+        """
+        word = word.upper()
+        if not word.isalpha():
+            return
+        self.learned[word] = self.learned.get(word, 0) + self.learn_boost
+        self.lexicon.add_word(word, self.learn_boost)
+        self.dirty = True
+        self._trim()
+
+    def _trim(self):
+        """
+        Keep at most max_learned_words learned words, forgetting the least used.
+        """
+        if len(self.learned) <= self.max_learned_words:
+            return
+        excess = len(self.learned) - self.max_learned_words
+        for word in sorted(self.learned, key=self.learned.get)[:excess]:
+            self.lexicon.remove_count(word, self.learned.pop(word))
+        self.dirty = True